@@ -1,11 +1,24 @@
 import json
-import datetime
+import itertools
 import os
+import threading
+import time
+import weakref
 from dotenv import load_dotenv
-from groq import Groq # Import Groq library
-from tools import AVAILABLE_TOOLS, TOOL_DESCRIPTIONS
 
+# Load .env before importing the tools, so booking settings (e.g. FOODIESPOT_BOOKINGS_DB) apply.
 load_dotenv()
+
+from conversation import ConversationHistory
+from instrumentation import TRACER, debug
+from intent_parser import parse_intent
+from llm_cache import ResponseCache, dialog_state
+from prompt_builder import PromptBuilder
+from resilience import CircuitOpenError, ResilientCaller
+from streaming import StreamingReplyDetector
+from tool_call_parser import ToolCallParser
+from tools import AVAILABLE_TOOLS, TOOL_PARAMETERS
+
 groq_api_key = os.environ.get("GROQ_API_KEY")
 
 if not groq_api_key:
@@ -13,39 +26,107 @@ if not groq_api_key:
     print("Please create a .env file with GROQ_API_KEY=your_key")
     
 
-client = Groq(api_key=groq_api_key) if groq_api_key else None
+# The Groq SDK is imported and the client built on the first LLM call (see get_llm_client),
+# which keeps both out of the import. Assign a client here to use it instead.
+client = None
+_client_lock = threading.Lock()
 LLM_MODEL = "llama3-8b-8192"
 
+# Deadline, jittered retries, hedging and a circuit breaker around every LLM call; see resilience_metrics().
+LLM_CALLER = ResilientCaller()
+# Streams share the breaker but are never hedged, and time-to-headers must not skew the hedge percentile.
+LLM_STREAM_CALLER = ResilientCaller(hedge_percentile=None, breaker=LLM_CALLER.breaker)
+LLM_UNAVAILABLE_RESPONSE = ("Sorry, the AI service is having trouble right now. Direct requests still work, "
+                            "e.g. 'book FS03 2026-10-20 19:00 for 4 as Priya' or 'cancel BK105'.")
+
+# The async pipeline posts to Groq's OpenAI-compatible endpoint through pooled keep-alive httpx
+# clients shared per event loop (see get_async_client).
+GROQ_BASE_URL = os.environ.get("GROQ_BASE_URL") or "https://api.groq.com"
+GROQ_CHAT_COMPLETIONS_PATH = "/openai/v1/chat/completions"
+# httpx's pool re-scans (queued requests x connections) on every event, so a single large pool
+# turns quadratic under load. Instead, requests are spread round-robin over several small pools
+# and wait on a per-pool semaphore, never inside httpx.
+ASYNC_POOL_SHARDS = 4
+ASYNC_CONNECTIONS_PER_SHARD = 16
+ASYNC_KEEPALIVE_SECONDS = 30.0
+ASYNC_TIMEOUT_SECONDS = 30.0
+ASYNC_CONNECT_TIMEOUT_SECONDS = 5.0
+_async_pools = weakref.WeakKeyDictionary()
+
+# Tool name parse_llm_response reports for a {"tool_calls": [...]} reply; arguments is then the list of calls.
+MULTI_TOOL_CALL = "tool_calls"
+MAX_TOOL_CALLS_PER_TURN = 8
+
+# Renders the system prompt once per day and tool set; see prompt_metrics().
+PROMPT_BUILDER = PromptBuilder(AVAILABLE_TOOLS, TOOL_PARAMETERS)
+
+# Reuses the LLM's tool-call decisions for repeated requests; see cache_metrics().
+RESPONSE_CACHE = ResponseCache()
+# Tools whose cached calls may be replayed for another session.
+CACHEABLE_TOOLS = frozenset({"search_restaurants", "check_availability", "find_available_slots"})
+
+# Finds, repairs and schema-checks the JSON object in LLM replies; see parser_metrics().
+TOOL_CALL_PARSER = ToolCallParser(AVAILABLE_TOOLS, TOOL_PARAMETERS)
+
+def get_llm_client():
+    """
+    Returns the Groq client, importing the SDK and building the client on first use, or
+    None when no API key is configured.
+    """
+    global client
+    if client is None and groq_api_key:
+        with _client_lock:
+            if client is None:
+                from groq import Groq
+                # Retries are left to LLM_CALLER, which also bounds them with a deadline.
+                client = Groq(api_key=groq_api_key, max_retries=0)
+    return client
+
+def count_llm_tokens(prompt_tokens, completion_tokens):
+    """Adds a completion's token usage to the llm_tokens_total counters."""
+    if prompt_tokens is not None:
+        TRACER.count("llm_tokens_total", prompt_tokens, kind="prompt")
+    if completion_tokens is not None:
+        TRACER.count("llm_tokens_total", completion_tokens, kind="completion")
+
+
 # --- LLM Interaction using Groq API ---
+@TRACER.traced("llm_call")
 def call_groq_llm(prompt_messages):
     """
     Calls the Groq API with the provided messages structured for chat completion.
     Returns the string content of the assistant's reply.
     """
+    client = get_llm_client()
     if not client:
         print("ERROR: Groq client not initialized due to missing API key.")
         # Fallback to a simple message instead of crashing
         return json.dumps({"tool_name": "none", "response": "Sorry, the AI service is not configured correctly (API key missing). Please contact support."})
 
     try:
-        print("\n--- Sending Prompt to Groq LLM ---")
-        print("--- End Prompt ---")
+        debug("\n--- Sending Prompt to Groq LLM ---")
 
-        chat_completion = client.chat.completions.create(
+        chat_completion = LLM_CALLER.call(lambda timeout: client.chat.completions.create(
             messages=prompt_messages,
             model=LLM_MODEL,
             temperature=0.1, 
             max_tokens=500,  # Adjust as needed
+            timeout=timeout,
             # We are NOT using Groq's native tool_choice/tools here
             # We instruct the LLM via the system prompt to return JSON
-        )
+        ))
 
         response_content = chat_completion.choices[0].message.content
-        print(f"\n--- Raw LLM Response ---")
-        print(response_content)
-        print(f"--- End Raw LLM Response ---")
+        usage = getattr(chat_completion, "usage", None)
+        if usage is not None:
+            count_llm_tokens(usage.prompt_tokens, usage.completion_tokens)
+        debug(lambda: f"\n--- Raw LLM Response ---\n{response_content}\n--- End Raw LLM Response ---")
         return response_content
 
+    except CircuitOpenError:
+        print("WARNING: LLM circuit breaker is open; not calling Groq.")
+        return json.dumps({"tool_name": "none", "response": LLM_UNAVAILABLE_RESPONSE})
+
     except Exception as e:
         print(f"ERROR: Groq API call failed: {e}")
         error_response = {
@@ -55,173 +136,664 @@ def call_groq_llm(prompt_messages):
         return json.dumps(error_response)
 
 
-def process_user_message(user_message, conversation_history):
+def call_groq_llm_stream(prompt_messages):
     """
-    Main function to handle user input, interact with LLM, and execute tools.
-    Now uses the real Groq API call and robust JSON parsing.
+    Streaming variant of call_groq_llm: yields the assistant's reply as text deltas as they arrive.
+    Closing the generator early closes the underlying HTTP stream.
     """
-    # 1. Construct Prompt Messages for LLM (Chat Format)
-    system_prompt = f"""
-You are FoodieBot, a helpful assistant for booking tables at FoodieSpot restaurants.
-Be concise and helpful. Use the available tools to answer user requests about finding restaurants and making reservations.
-If you need to ask clarifying questions, do so. Today's date is {datetime.date.today().isoformat()}.
+    client = get_llm_client()
+    if not client:
+        print("ERROR: Groq client not initialized due to missing API key.")
+        yield json.dumps({"tool_name": "none", "response": "Sorry, the AI service is not configured correctly (API key missing). Please contact support."})
+        return
+
+    stream = None
+    received_any = False
+    try:
+        stream = LLM_STREAM_CALLER.call(lambda timeout: client.chat.completions.create(
+            messages=prompt_messages,
+            model=LLM_MODEL,
+            temperature=0.1,
+            max_tokens=500,
+            stream=True,
+            timeout=timeout,
+        ))
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                received_any = True
+                yield delta
+
+    except CircuitOpenError:
+        print("WARNING: LLM circuit breaker is open; not calling Groq.")
+        yield json.dumps({"tool_name": "none", "response": LLM_UNAVAILABLE_RESPONSE})
+
+    except Exception as e:
+        print(f"ERROR: Groq API streaming call failed: {e}")
+        if not received_any:
+            yield json.dumps({
+                "tool_name": "none",
+                "response": f"Sorry, I encountered an error trying to reach the AI service ({type(e).__name__}). Please try again later."
+            })
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            close()
+
 
-Available Tools Description:
-{TOOL_DESCRIPTIONS}
+def prompt_metrics():
+    """Hash and size of the cached system-prompt prefix plus build/reuse counters."""
+    return PROMPT_BUILDER.metrics()
 
-Instructions:
-Analyze the user's request based on the conversation history.
-Determine the user's intent. If a tool can fulfill the request, respond ONLY with a single JSON object containing the 'tool_name' and 'arguments'. Use the exact tool names and parameter names described above.
-If no tool is needed, or you need to ask a clarifying question, respond ONLY with a single JSON object like: {{"tool_name": "none", "response": "Your natural language response here."}}
-Ensure all required parameters for a tool call are extracted from the conversation or the user message. Ask for clarification if essential parameters are missing for a required tool. Do not make up information.
-Respond only with the JSON object, nothing else.
-"""
+
+def cache_metrics():
+    """Hit rate and LLM latency saved by the response cache."""
+    return RESPONSE_CACHE.stats()
+
+
+def parser_metrics():
+    """How LLM replies were parsed, and how many turns extraction, repair and call fixes saved."""
+    return TOOL_CALL_PARSER.stats()
+
+
+def resilience_metrics():
+    """Retry, hedge, deadline and circuit-breaker counters of the LLM calls."""
+    return LLM_CALLER.stats()
+
+
+def cached_llm_output(cache_key):
+    """The cached LLM output for a request; while the LLM circuit is open, an expired entry will do."""
+    llm_response_raw = RESPONSE_CACHE.get(cache_key)
+    if llm_response_raw is None and LLM_CALLER.breaker.is_open():
+        llm_response_raw = RESPONSE_CACHE.get_stale(cache_key)
+    return llm_response_raw
+
+
+def response_cache_key(user_message, conversation_history):
+    """Cache key for a user message in its dialog context (pinned facts and last assistant turn)."""
+    if isinstance(conversation_history, ConversationHistory):
+        state = dialog_state(conversation_history.pinned, conversation_history.last_assistant_message())
+    else:
+        last_assistant = next((line for line in reversed(conversation_history.strip().split('\n'))
+                               if line.startswith("Assistant:")), "")
+        state = dialog_state({}, last_assistant[len("Assistant:"):].strip())
+    return RESPONSE_CACHE.key(user_message, state)
+
+
+def is_cacheable_tool_call(tool_name, arguments=None):
+    """
+    Only read-only lookups are cached. A cached decision is replayed with its arguments for
+    anyone sending the same message, so a booking or a booking lookup must never be.
+    """
+    if tool_name == MULTI_TOOL_CALL:
+        return bool(arguments) and all(call.get("tool_name") in CACHEABLE_TOOLS for call in arguments)
+    return tool_name in CACHEABLE_TOOLS
+
+
+def match_fast_path(user_message, conversation_history):
+    """
+    Returns (tool_name, arguments) when the message alone (plus pinned facts) says exactly
+    which tool to run, so the turn can skip the LLM; otherwise None.
+    """
+    known_facts = conversation_history.pinned if isinstance(conversation_history, ConversationHistory) else None
+    intent = parse_intent(user_message, known_facts)
+    if intent is None or intent[0] not in AVAILABLE_TOOLS:
+        return None
+    return intent
+
+
+@TRACER.traced("prompt_build")
+def build_prompt_messages(user_message, conversation_history):
+    """
+    Builds the chat messages (system prompt, history turns, new user message) for the LLM.
+    conversation_history is a ConversationHistory or a legacy 'User: ...\\nAssistant: ...' string.
+    """
+    system_prompt = PROMPT_BUILDER.system_prompt()
 
     messages = [
         {"role": "system", "content": system_prompt}
     ]
-    # Add history turns - simple split approach, needs refinement for robustness
-    history_turns = conversation_history.strip().split('\n')
-    for turn in history_turns:
-        # parsing history string prefixes
-        if turn.startswith("User:"):
-             messages.append({"role": "user", "content": turn[len("User:"):].strip()})
-        elif turn.startswith("Assistant:"):
-             messages.append({"role": "assistant", "content": turn[len("Assistant:"):].strip()})
+    if isinstance(conversation_history, ConversationHistory):
+        messages.extend(conversation_history.to_messages())
+    else:
+        # Legacy string history - simple split approach
+        history_turns = conversation_history.strip().split('\n')
+        for turn in history_turns:
+            # parsing history string prefixes
+            if turn.startswith("User:"):
+                 messages.append({"role": "user", "content": turn[len("User:"):].strip()})
+            elif turn.startswith("Assistant:"):
+                 messages.append({"role": "assistant", "content": turn[len("Assistant:"):].strip()})
         
     messages.append({"role": "user", "content": user_message})
+    return messages
 
 
-    llm_response_raw = call_groq_llm(messages) 
-
-    
-    llm_response_dict = None 
+@TRACER.traced("parse")
+def parse_llm_response(llm_response_raw):
+    """
+    Parses the raw LLM output into (tool_name, arguments, direct_response).
+    tool_name is "none" when the output is a direct reply to the user.
+    """
     tool_name = None
     arguments = None
     direct_response = None
-    cleaned_response_raw = llm_response_raw 
+    cleaned_response_raw = llm_response_raw.strip()
 
-    try:
-        
-        if llm_response_raw.startswith("```json"):
-            cleaned_response_raw = llm_response_raw[7:-3].strip()
-        else:
-            
-            cleaned_response_raw = llm_response_raw.strip()
+    llm_response_dict, outcome = TOOL_CALL_PARSER.extract(llm_response_raw)
+    TRACER.annotate(outcome=outcome)
+    if outcome in ("extracted", "repaired"):
+        debug(f"--- Recovered a {outcome} JSON object from the LLM output ---")
 
-        
-        llm_response_dict = json.loads(cleaned_response_raw)
-
-        
-        if isinstance(llm_response_dict, dict):
-            tool_name = llm_response_dict.get("tool_name")
-            arguments = llm_response_dict.get("arguments")
-            direct_response = llm_response_dict.get("response")
-            
-            if tool_name and tool_name != "none" and direct_response:
-                 print(f"Warning: LLM returned both tool_name '{tool_name}' and direct_response. Prioritizing tool call.")
-                 direct_response = None 
-            
-            elif tool_name == "none" and direct_response is None:
-                 print(f"Warning: LLM returned tool_name 'none' but no 'response' field. Treating raw as response.")
-                 direct_response = cleaned_response_raw 
-                 tool_name = "none" 
+    if llm_response_dict is None:
+        debug(f"Warning: Could not decode LLM response as JSON, treating as direct response: '{cleaned_response_raw}'")
+        direct_response = cleaned_response_raw
+        tool_name = "none"
 
-        else:
-            print(f"Warning: LLM returned valid JSON, but not the expected dictionary format: {llm_response_dict}")
-            direct_response = cleaned_response_raw 
+    elif isinstance(llm_response_dict.get("tool_calls"), list):
+        tool_name = MULTI_TOOL_CALL
+        arguments = []
+        for call in [call for call in llm_response_dict["tool_calls"]
+                     if isinstance(call, dict) and call.get("tool_name")][:MAX_TOOL_CALLS_PER_TURN]:
+            call_name, call_arguments, _ = TOOL_CALL_PARSER.check_call(call["tool_name"], call.get("arguments"))
+            arguments.append({"tool_name": call_name, "arguments": call_arguments})
+        if not arguments:
             tool_name = "none"
 
-    except json.JSONDecodeError:
-        
-        print(f"Warning: Could not decode LLM response as JSON, treating as direct response: '{cleaned_response_raw}'")
-        direct_response = cleaned_response_raw 
-        tool_name = "none"
+    else:
+        tool_name = llm_response_dict.get("tool_name")
+        arguments = llm_response_dict.get("arguments")
+        direct_response = llm_response_dict.get("response")
+
+        if tool_name and tool_name != "none":
+            if direct_response:
+                debug(f"Warning: LLM returned both tool_name '{tool_name}' and direct_response. Prioritizing tool call.")
+                direct_response = None
+            tool_name, arguments, missing = TOOL_CALL_PARSER.check_call(tool_name, arguments)
+            if missing:
+                # Ask for exactly what is missing rather than failing inside the tool.
+                debug(f"Warning: LLM called '{tool_name}' without {missing}.")
+                details = ", ".join(name.replace("_str", "").replace("_", " ") for name in missing)
+                direct_response = f"To {tool_name.replace('_', ' ')} I still need the following: {details}."
+                tool_name, arguments = "none", None
+
+        elif tool_name == "none" and direct_response is None:
+            debug(f"Warning: LLM returned tool_name 'none' but no 'response' field. Treating raw as response.")
+            direct_response = cleaned_response_raw
+            tool_name = "none"
 
-    
-    
     if tool_name == "none" and not direct_response:
-        
         print(f"Error: tool_name is 'none' but direct_response is empty/None. Raw: '{llm_response_raw}'")
         direct_response = "Sorry, I received an empty response. Could you please try again?"
-        
         tool_name = "none"
 
+    return tool_name, arguments, direct_response
 
-    
-    updated_history = conversation_history 
 
-    if tool_name and tool_name != "none":
-        if tool_name in AVAILABLE_TOOLS:
-            tool_function = AVAILABLE_TOOLS[tool_name]
-            try:
+def format_tool_result(tool_name, tool_result):
+    """Turns a tool's return value into the reply shown to the user."""
+    if tool_name == "search_restaurants":
+        if not tool_result.get("success"):
+            response_to_user = f"Sorry, I couldn't search right now. Reason: {tool_result.get('reason', 'Unknown error')}"
+        elif not tool_result.get("restaurants"):
+            if tool_result.get("page", 1) > 1:
+                response_to_user = "That's all the restaurants matching your criteria."
+            else:
+                response_to_user = "I couldn't find any restaurants matching your criteria."
+        else:
+            response_lines = ["I found these options:" if tool_result.get("page", 1) == 1 else "Here are more options:"]
+            for r in tool_result["restaurants"]:
+                availability_info = ""
+                if r.get('availability_checked'):
+                    availability_info = " (Available at requested time)" if r.get('is_available_at_request') else " (Not Available at requested time)"
                 
-                tool_args = arguments if arguments is not None else {}
-                print(f"--- Executing Tool: {tool_name} with args: {tool_args} ---")
-                tool_result = tool_function(**tool_args) 
-                print(f"--- Tool Result: {tool_result} ---")
+                cuisine_str = ""
+                if isinstance(r.get('cuisine'), list):
+                    cuisine_str = ', '.join(r['cuisine'])
+                elif isinstance(r.get('cuisine'), str):
+                    cuisine_str = r['cuisine']
 
-                
-                if tool_name == "search_restaurants":
-                    if not tool_result:
-                        response_to_user = "I couldn't find any restaurants matching your criteria."
-                    else:
-                        response_lines = ["I found these options:"]
-                        for r in tool_result:
-                            availability_info = ""
-                            if r.get('availability_checked'):
-                                availability_info = " (Available at requested time)" if r.get('is_available_at_request') else " (Not Available at requested time)"
-                            
-                            cuisine_str = ""
-                            if isinstance(r.get('cuisine'), list):
-                                cuisine_str = ', '.join(r['cuisine'])
-                            elif isinstance(r.get('cuisine'), str):
-                                cuisine_str = r['cuisine']
-
-                            response_lines.append(f"- {r.get('name', 'N/A')} ({r.get('location_area', 'N/A')}, {cuisine_str}) - ID: {r.get('id', 'N/A')}{availability_info}")
-                        
-                        response_to_user = "\n".join(response_lines)
-                        if len(tool_result) > 0:
-                             response_to_user += "\n\nDo any of these look good? Please provide the ID (e.g., FS01) to check specific times or make a booking."
-
-                elif tool_name == "make_reservation":
-                    if tool_result.get("success"):
-                        details = tool_result.get('details', {})
-                        response_to_user = f"Booking confirmed! Your reservation at {details.get('restaurant_name', 'the restaurant')} for {details.get('party_size', 'N/A')} people on {details.get('date', 'N/A')} at {details.get('time', 'N/A')} is set. Your Booking ID is {details.get('booking_id', 'N/A')}."
-                    else:
-                        response_to_user = f"Sorry, I couldn't complete the booking. Reason: {tool_result.get('reason', 'Unknown error')}"
-
-                else: 
-                     response_to_user = f"Action {tool_name} completed. Result: {json.dumps(tool_result)}"
+                partial_info = ""
+                if r.get('unmatched'):
+                    partial_info = " (Partial match: not the requested " + " or ".join(name.replace('_', ' ') for name in r['unmatched']) + ")"
 
-                
-                updated_history = conversation_history + f"\nUser: {user_message}\nAssistant: {response_to_user}"
-                return response_to_user, updated_history
-
-            except TypeError as e:
-                  print(f"ERROR: Tool '{tool_name}' called with incorrect arguments: {arguments}. Error: {e}")
-                  response_to_user = f"Sorry, I seem to have the wrong details to {tool_name.replace('_', ' ')}. Could you please provide the required information again?"
-                  updated_history = conversation_history + f"\nUser: {user_message}\nAssistant: {response_to_user}" 
-                  return response_to_user, updated_history
-
-            except Exception as e:
-                print(f"ERROR: Failed to execute tool {tool_name} with args {arguments}: {e}")
-                response_to_user = f"Sorry, there was an error trying to {tool_name.replace('_', ' ')}. Please try again."
-                updated_history = conversation_history + f"\nUser: {user_message}\nAssistant: {response_to_user}" 
-                return response_to_user, updated_history
-        else:
+                response_lines.append(f"- {r.get('name', 'N/A')} ({r.get('location_area', 'N/A')}, {cuisine_str}) - ID: {r.get('id', 'N/A')}{partial_info}{availability_info}")
             
-            print(f"ERROR: LLM specified an unknown tool: {tool_name}")
-            response_to_user = "Sorry, I tried to use a tool I don't recognize. Please rephrase your request."
-            updated_history = conversation_history + f"\nUser: {user_message}\nAssistant: {response_to_user}" 
-            return response_to_user, updated_history
+            response_to_user = "\n".join(response_lines)
+            response_to_user += "\n\nDo any of these look good? Please provide the ID (e.g., FS01) to check specific times or make a booking."
+            if tool_result.get("has_more"):
+                response_to_user += " Or say \"show more\" to see more options."
+
+    elif tool_name == "make_reservation":
+        if tool_result.get("success"):
+            details = tool_result.get('details', {})
+            response_to_user = f"Booking confirmed! Your reservation at {details.get('restaurant_name', 'the restaurant')} for {details.get('party_size', 'N/A')} people on {details.get('date', 'N/A')} at {details.get('time', 'N/A')} is set. Your Booking ID is {details.get('booking_id', 'N/A')}."
+        else:
+            response_to_user = f"Sorry, I couldn't complete the booking. Reason: {tool_result.get('reason', 'Unknown error')}"
+
+    elif tool_name == "modify_reservation":
+        if tool_result.get("success"):
+            details = tool_result.get('details', {})
+            response_to_user = f"Done! Your reservation {details.get('booking_id', '')} at {details.get('restaurant_name', 'the restaurant')} is now for {details.get('party_size', 'N/A')} people on {details.get('date', 'N/A')} at {details.get('time', 'N/A')}."
+        else:
+            response_to_user = f"Sorry, I couldn't change the reservation. Reason: {tool_result.get('reason', 'Unknown error')}"
+            alternatives = tool_result.get("alternatives")
+            if alternatives:
+                times = ", ".join(a["time"] for a in alternatives)
+                response_to_user += f"\nThese times on {alternatives[0]['date']} still have room: {times}. Your current reservation is unchanged. Would one of these work?"
+
+    elif tool_name == "make_group_reservation":
+        results = tool_result.get("results", [])
+        if tool_result.get("success"):
+            response_lines = [f"All {len(results)} reservations are confirmed:" if len(results) > 1 else "Your reservation is confirmed:"]
+        elif not results:
+            response_lines = [f"Sorry, I couldn't book the group. Reason: {tool_result.get('reason', 'Unknown error')}"]
+        elif tool_result.get("booked"):
+            response_lines = [f"I booked {tool_result['booked']} of {len(results)} reservations:"]
+        else:
+            response_lines = ["Sorry, none of the reservations were booked:"]
+        for i, result in enumerate(results, 1):
+            if result.get("success"):
+                details = result["details"]
+                response_lines.append(f"- {details['restaurant_name']} for {details['party_size']} on {details['date']} at {details['time']} (Booking ID {details['booking_id']})")
+            else:
+                response_lines.append(f"- Reservation {i}: {result.get('reason', 'Unknown error')}")
+        response_to_user = "\n".join(response_lines)
+
+    elif tool_name == "check_availability":
+        if tool_result.get("available"):
+            response_to_user = "Good news, there's a table available at that time. Would you like me to book it?"
+        else:
+            response_to_user = f"Sorry, that time isn't available. Reason: {tool_result.get('reason', 'Unknown error')}"
+
+    elif tool_name == "cancel_reservation":
+        if tool_result.get("success"):
+            details = tool_result.get('details', {})
+            response_to_user = f"Your reservation {details.get('booking_id', '')} at {details.get('restaurant_name', 'the restaurant')} on {details.get('date', 'N/A')} at {details.get('time', 'N/A')} has been cancelled."
+        else:
+            response_to_user = f"Sorry, I couldn't cancel the booking. Reason: {tool_result.get('reason', 'Unknown error')}"
+
+    elif tool_name == "list_my_bookings":
+        bookings = tool_result.get("bookings") if tool_result.get("success") else None
+        if bookings is None:
+            response_to_user = f"Sorry, I couldn't look up your reservations. Reason: {tool_result.get('reason', 'Unknown error')}"
+        elif not bookings:
+            response_to_user = "I couldn't find any reservations under those details."
+        else:
+            response_lines = ["Here are your reservations:"]
+            for b in bookings:
+                response_lines.append(f"- {b['booking_id']}: {b['restaurant_name']} for {b['party_size']} on {b['date']} at {b['time']} ({b['status']})")
+            response_to_user = "\n".join(response_lines)
+
+    elif tool_name == "daily_manifest":
+        if not tool_result.get("success"):
+            response_to_user = f"Sorry, I couldn't get the manifest. Reason: {tool_result.get('reason', 'Unknown error')}"
+        else:
+            response_lines = [f"{tool_result['restaurant_name']} on {tool_result['date']}: {len(tool_result['bookings'])} reservations, {tool_result['covers']} guests"
+                              + (f" ({tool_result['cancelled']} cancelled)." if tool_result["cancelled"] else ".")]
+            for b in tool_result["bookings"]:
+                response_lines.append(f"- {b['time']} {b['customer_name']}, party of {b['party_size']} ({b['booking_id']})")
+            response_to_user = "\n".join(response_lines)
+
+    elif tool_name == "find_available_slots":
+        slots = tool_result.get("slots") if tool_result.get("success") else None
+        if tool_result.get("success") and not slots:
+            response_to_user = "I couldn't find any open tables for that party size in the requested window."
+        elif not slots:
+            response_to_user = f"Sorry, I couldn't search for open tables. Reason: {tool_result.get('reason', 'Unknown error')}"
+        else:
+            response_lines = ["Here are the nearest open tables:"]
+            for slot in slots:
+                response_lines.append(f"- {slot['restaurant_name']} (ID: {slot['restaurant_id']}) on {slot['date']} at {slot['time']}")
+            response_to_user = "\n".join(response_lines) + "\n\nWould you like me to book one of these?"
+
+    else:
+         response_to_user = f"Action {tool_name} completed. Result: {json.dumps(tool_result)}"
 
+    return response_to_user
+
+
+def execute_tool_call(tool_name, arguments):
+    """Runs a registered tool and returns the formatted reply (or an apology if it fails)."""
+    if tool_name not in AVAILABLE_TOOLS:
+        print(f"ERROR: LLM specified an unknown tool: {tool_name}")
+        return "Sorry, I tried to use a tool I don't recognize. Please rephrase your request."
+
+    tool_function = AVAILABLE_TOOLS[tool_name]
+    try:
+        
+        tool_args = arguments if arguments is not None else {}
+        debug(lambda: f"--- Executing Tool: {tool_name} with args: {tool_args} ---")
+        with TRACER.span("tool", tool=tool_name):
+            tool_result = tool_function(**tool_args) 
+        debug(lambda: f"--- Tool Result: {tool_result} ---")
+        with TRACER.span("format", tool=tool_name):
+            return format_tool_result(tool_name, tool_result)
+
+    except TypeError as e:
+          print(f"ERROR: Tool '{tool_name}' called with incorrect arguments: {arguments}. Error: {e}")
+          return f"Sorry, I seem to have the wrong details to {tool_name.replace('_', ' ')}. Could you please provide the required information again?"
+
+    except Exception as e:
+        print(f"ERROR: Failed to execute tool {tool_name} with args {arguments}: {e}")
+        return f"Sorry, there was an error trying to {tool_name.replace('_', ' ')}. Please try again."
+
+
+def combine_tool_replies(calls, replies):
+    """Joins the replies of several tool calls, labelling each with its restaurant when there is one."""
+    lines = []
+    for call, reply in zip(calls, replies):
+        restaurant_id = (call.get("arguments") or {}).get("restaurant_id")
+        lines.append(f"{restaurant_id}: {reply}" if restaurant_id else reply)
+    return "\n\n".join(lines)
+
+
+def respond_to_llm_output(tool_name, arguments, direct_response):
+    """Returns the reply for a parsed LLM output: a tool's formatted result or the direct response."""
+    if tool_name == MULTI_TOOL_CALL:
+        replies = [execute_tool_call(call["tool_name"], call.get("arguments")) for call in arguments]
+        return combine_tool_replies(arguments, replies)
+    elif tool_name and tool_name != "none":
+        return execute_tool_call(tool_name, arguments)
     elif direct_response:
-        response_to_user = direct_response
-        updated_history = conversation_history + f"\nUser: {user_message}\nAssistant: {response_to_user}" 
-        return response_to_user, updated_history
+        return direct_response
     else:
-      print(f"ERROR: Unhandled state after LLM response parsing. tool_name='{tool_name}', direct_response='{direct_response}'. Raw: '{llm_response_raw}'")
-      response_to_user = "Sorry, an unexpected error occurred while processing the response."
-      updated_history = conversation_history + f"\nUser: {user_message}\nAssistant: {response_to_user}" 
-      return response_to_user, updated_history
\ No newline at end of file
+        print(f"ERROR: Unhandled state after LLM response parsing. tool_name='{tool_name}', direct_response='{direct_response}'.")
+        return "Sorry, an unexpected error occurred while processing the response."
+
+
+def record_turn(conversation_history, user_message, response_to_user, tool_name=None, arguments=None):
+    """
+    Adds a finished exchange to the history and returns the updated history.
+    A ConversationHistory is updated in place (pinning the tool call's details); a legacy
+    string history is returned as a new, longer string.
+    """
+    if isinstance(conversation_history, ConversationHistory):
+        if tool_name == MULTI_TOOL_CALL:
+            # Only details every call agrees on (e.g. the date) describe the conversation as a whole.
+            shared = dict(arguments[0].get("arguments") or {})
+            for call in arguments[1:]:
+                shared = {key: value for key, value in shared.items() if (call.get("arguments") or {}).get(key) == value}
+            conversation_history.note_tool_call(tool_name, shared)
+        else:
+            conversation_history.note_tool_call(tool_name, arguments)
+        conversation_history.add_exchange(user_message, response_to_user)
+        return conversation_history
+    return conversation_history + f"\nUser: {user_message}\nAssistant: {response_to_user}"
+
+
+@TRACER.traced("turn")
+def process_user_message(user_message, conversation_history):
+    """
+    Main function to handle user input, interact with LLM, and execute tools.
+    Now uses the real Groq API call and robust JSON parsing.
+    """
+    fast_path = match_fast_path(user_message, conversation_history)
+    if fast_path is not None:
+        TRACER.annotate(route="fast_path")
+        debug(f"--- Fast path: {fast_path[0]} (skipping LLM) ---")
+        tool_name, arguments = fast_path
+        response_to_user = execute_tool_call(tool_name, arguments)
+        return response_to_user, record_turn(conversation_history, user_message, response_to_user, tool_name, arguments)
+
+    cache_key = response_cache_key(user_message, conversation_history)
+    llm_response_raw = cached_llm_output(cache_key)
+    llm_latency = None
+    if llm_response_raw is None:
+        messages = build_prompt_messages(user_message, conversation_history)
+        started = time.perf_counter()
+        llm_response_raw = call_groq_llm(messages) 
+        llm_latency = time.perf_counter() - started
+        TRACER.annotate(route="llm")
+    else:
+        TRACER.annotate(route="cache")
+        debug("--- Reusing cached LLM tool call ---")
+
+    tool_name, arguments, direct_response = parse_llm_response(llm_response_raw)
+    if llm_latency is not None and is_cacheable_tool_call(tool_name, arguments):
+        RESPONSE_CACHE.put(cache_key, llm_response_raw, llm_latency)
+
+    response_to_user = respond_to_llm_output(tool_name, arguments, direct_response)
+    updated_history = record_turn(conversation_history, user_message, response_to_user, tool_name, arguments)
+    return response_to_user, updated_history
+
+
+class StreamingTurn:
+    """
+    One agent turn whose reply is produced while the LLM is still streaming.
+    Iterate it (e.g. with st.write_stream) to receive reply text as soon as it is known:
+    a direct reply streams token by token, and a tool call is dispatched the moment its
+    JSON object closes. Afterwards, response and updated_history hold the same values
+    process_user_message returns.
+    """
+
+    def __init__(self, user_message, conversation_history):
+        self.user_message = user_message
+        self.conversation_history = conversation_history
+        self.response = None
+        self.updated_history = None
+        self.first_text_latency = None
+
+    def _reply_without_llm(self, started, route, tool_name, arguments, response_to_user):
+        self.response = response_to_user
+        self.first_text_latency = time.perf_counter() - started
+        yield response_to_user
+        self.updated_history = record_turn(self.conversation_history, self.user_message, response_to_user, tool_name, arguments)
+        TRACER.record_span("turn", time.perf_counter() - started, route=route, stream=True)
+
+    def __iter__(self):
+        started = time.perf_counter()
+        fast_path = match_fast_path(self.user_message, self.conversation_history)
+        if fast_path is not None:
+            debug(f"--- Fast path: {fast_path[0]} (skipping LLM) ---")
+            tool_name, arguments = fast_path
+            yield from self._reply_without_llm(started, "fast_path", tool_name, arguments,
+                                               execute_tool_call(tool_name, arguments))
+            return
+
+        cache_key = response_cache_key(self.user_message, self.conversation_history)
+        cached = cached_llm_output(cache_key)
+        if cached is not None:
+            debug("--- Reusing cached LLM tool call ---")
+            tool_name, arguments, direct_response = parse_llm_response(cached)
+            response_to_user = respond_to_llm_output(tool_name, arguments, direct_response)
+            yield from self._reply_without_llm(started, "cache", tool_name, arguments, response_to_user)
+            return
+
+        messages = build_prompt_messages(self.user_message, self.conversation_history)
+        detector = StreamingReplyDetector()
+        streamed = []
+
+        # The stream spans yields to the caller, so it is timed by hand rather than with TRACER.span.
+        llm_started = time.perf_counter()
+        deltas = call_groq_llm_stream(messages)
+        try:
+            for delta in deltas:
+                text = detector.feed(delta)
+                if text:
+                    if self.first_text_latency is None:
+                        self.first_text_latency = time.perf_counter() - started
+                    streamed.append(text)
+                    yield text
+                if detector.complete and detector.kind != "direct":
+                    break
+        finally:
+            deltas.close()
+            TRACER.record_span("llm_call", time.perf_counter() - llm_started, stream=True)
+
+        already_shown = "".join(streamed)
+        tool_name, arguments = None, None
+        if detector.kind == "direct" and detector.response_complete:
+            response_to_user = already_shown
+        else:
+            raw = detector.json_text or detector.buffer
+            tool_name, arguments, direct_response = parse_llm_response(raw)
+            if is_cacheable_tool_call(tool_name, arguments):
+                RESPONSE_CACHE.put(cache_key, raw, time.perf_counter() - started)
+            response_to_user = respond_to_llm_output(tool_name, arguments, direct_response)
+            if response_to_user.startswith(already_shown):
+                remainder = response_to_user[len(already_shown):]
+            else:
+                # Prose streamed before the tool call stays on screen, so it is part of the reply
+                # (and of the history sent back to the LLM) too.
+                remainder = ("\n\n" if already_shown.strip() else "") + response_to_user
+                response_to_user = already_shown + remainder
+            if remainder:
+                if self.first_text_latency is None:
+                    self.first_text_latency = time.perf_counter() - started
+                yield remainder
+
+        self.response = response_to_user
+        self.updated_history = record_turn(self.conversation_history, self.user_message, response_to_user, tool_name, arguments)
+        TRACER.record_span("turn", time.perf_counter() - started, route="llm", stream=True)
+
+
+def process_user_message_stream(user_message, conversation_history):
+    """Streaming counterpart of process_user_message; returns a StreamingTurn to iterate."""
+    return StreamingTurn(user_message, conversation_history)
+
+
+class _AsyncPool:
+    def __init__(self):
+        # The async pipeline's modules are imported on first use, not with this module.
+        import asyncio
+        import httpx
+
+        limits = httpx.Limits(max_connections=ASYNC_CONNECTIONS_PER_SHARD,
+                              max_keepalive_connections=ASYNC_CONNECTIONS_PER_SHARD,
+                              keepalive_expiry=ASYNC_KEEPALIVE_SECONDS)
+        self.shards = [(httpx.AsyncClient(base_url=GROQ_BASE_URL, headers={"Authorization": f"Bearer {groq_api_key}"},
+                                          timeout=httpx.Timeout(ASYNC_TIMEOUT_SECONDS, connect=ASYNC_CONNECT_TIMEOUT_SECONDS),
+                                          limits=limits),
+                        asyncio.Semaphore(ASYNC_CONNECTIONS_PER_SHARD))
+                       for _ in range(ASYNC_POOL_SHARDS)]
+        self._next = itertools.cycle(self.shards)
+
+    def shard(self):
+        return next(self._next)
+
+
+def _async_pool():
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    pool = _async_pools.get(loop)
+    if pool is None:
+        pool = _async_pools[loop] = _AsyncPool()
+    return pool
+
+
+def get_async_client():
+    """
+    Returns an httpx.AsyncClient from the running event loop's shared keep-alive pools to the
+    Groq API (round-robin), or None when no API key is configured.
+    """
+    if not groq_api_key:
+        return None
+    return _async_pool().shard()[0]
+
+
+async def close_async_client():
+    """Closes the running loop's shared async clients and their connection pools."""
+    import asyncio
+
+    pool = _async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        for async_client, _ in pool.shards:
+            await async_client.aclose()
+
+
+@TRACER.traced("llm_call")
+async def call_groq_llm_async(prompt_messages):
+    """
+    Async variant of call_groq_llm over the shared pooled client. It posts the chat request
+    directly, since the SDK's per-request payload transformation dominates CPU time at high concurrency.
+    """
+    if not groq_api_key:
+        print("ERROR: Groq client not initialized due to missing API key.")
+        return json.dumps({"tool_name": "none", "response": "Sorry, the AI service is not configured correctly (API key missing). Please contact support."})
+
+    pool = _async_pool()
+
+    async def request(timeout):
+        async_client, in_flight = pool.shard()
+        async with in_flight:
+            response = await async_client.post(GROQ_CHAT_COMPLETIONS_PATH, timeout=timeout, json={
+                "messages": prompt_messages,
+                "model": LLM_MODEL,
+                "temperature": 0.1,
+                "max_tokens": 500,
+            })
+        response.raise_for_status()
+        return response.json()
+
+    try:
+        completion = await LLM_CALLER.call_async(request)
+        usage = completion.get("usage") or {}
+        count_llm_tokens(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        return completion["choices"][0]["message"]["content"]
+
+    except CircuitOpenError:
+        print("WARNING: LLM circuit breaker is open; not calling Groq.")
+        return json.dumps({"tool_name": "none", "response": LLM_UNAVAILABLE_RESPONSE})
+
+    except Exception as e:
+        print(f"ERROR: Groq API call failed: {e}")
+        return json.dumps({
+            "tool_name": "none",
+            "response": f"Sorry, I encountered an error trying to reach the AI service ({type(e).__name__}). Please try again later."
+        })
+
+
+async def execute_tool_call_async(tool_name, arguments):
+    """Runs a tool in a worker thread, so the event loop keeps serving other sessions."""
+    import asyncio
+
+    return await asyncio.to_thread(execute_tool_call, tool_name, arguments)
+
+
+async def respond_to_llm_output_async(tool_name, arguments, direct_response):
+    """Async respond_to_llm_output: independent tool calls from one reply run concurrently."""
+    import asyncio
+
+    if tool_name == MULTI_TOOL_CALL:
+        replies = await asyncio.gather(*(execute_tool_call_async(call["tool_name"], call.get("arguments"))
+                                         for call in arguments))
+        return combine_tool_replies(arguments, replies)
+    if tool_name and tool_name != "none":
+        return await execute_tool_call_async(tool_name, arguments)
+    return respond_to_llm_output(tool_name, arguments, direct_response)
+
+
+@TRACER.traced("turn")
+async def process_user_message_async(user_message, conversation_history):
+    """
+    Async counterpart of process_user_message, for serving many sessions from one event loop.
+    Returns (response, updated_history).
+    """
+    fast_path = match_fast_path(user_message, conversation_history)
+    if fast_path is not None:
+        TRACER.annotate(route="fast_path")
+        tool_name, arguments = fast_path
+        response_to_user = await execute_tool_call_async(tool_name, arguments)
+        return response_to_user, record_turn(conversation_history, user_message, response_to_user, tool_name, arguments)
+
+    cache_key = response_cache_key(user_message, conversation_history)
+    llm_response_raw = cached_llm_output(cache_key)
+    llm_latency = None
+    if llm_response_raw is None:
+        messages = build_prompt_messages(user_message, conversation_history)
+        started = time.perf_counter()
+        llm_response_raw = await call_groq_llm_async(messages)
+        llm_latency = time.perf_counter() - started
+        TRACER.annotate(route="llm")
+    else:
+        TRACER.annotate(route="cache")
+
+    tool_name, arguments, direct_response = parse_llm_response(llm_response_raw)
+    if llm_latency is not None and is_cacheable_tool_call(tool_name, arguments):
+        RESPONSE_CACHE.put(cache_key, llm_response_raw, llm_latency)
+
+    response_to_user = await respond_to_llm_output_async(tool_name, arguments, direct_response)
+    updated_history = record_turn(conversation_history, user_message, response_to_user, tool_name, arguments)
+    return response_to_user, updated_history
@@ -1,18 +1,29 @@
 
 import streamlit as st
-from agent_logic import process_user_message 
+from conversation import ConversationHistory
+
+GREETING = "Hello! How can I help you with your FoodieSpot reservation today?"
 
 st.title(" FodieSpot Reservation Assistant")
 st.caption("Powered by Llama-3.1-8B (Simulated) - Built from scratch")
 
 
+# Streamlit re-runs this script on every interaction. The agent (tools, catalog, LLM client)
+# is imported and set up once per server process, after the page header is drawn.
+@st.cache_resource
+def load_agent():
+    import agent_logic
+    agent_logic.get_llm_client()
+    return agent_logic
+
+
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-if "history_string" not in st.session_state:
-     st.session_state.history_string = "Assistant: Hello! How can I help you with your FoodieSpot reservation today?"
+if "history" not in st.session_state:
+     st.session_state.history = ConversationHistory(greeting=GREETING)
      
-     st.session_state.messages.append({"role": "assistant", "content": st.session_state.history_string.split("Assistant: ")[1]})
+     st.session_state.messages.append({"role": "assistant", "content": GREETING})
 
 
 
@@ -29,13 +40,10 @@ if prompt := st.chat_input("Ask about restaurants or reservations..."):
 
     
     
-    assistant_response, updated_history = process_user_message(prompt, st.session_state.history_string)
-
-    
-    st.session_state.history_string = updated_history
-
-    
+    # Stream the reply into the chat bubble as it is generated.
     with st.chat_message("assistant"):
-        st.markdown(assistant_response)
+        turn = load_agent().process_user_message_stream(prompt, st.session_state.history)
+        st.write_stream(turn)
+    assistant_response = turn.response
     
     st.session_state.messages.append({"role": "assistant", "content": assistant_response})
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Group booking throughput: one add_bookings batch (partial and all-or-nothing) versus
+looping over make_reservation, for batches spread over the catalog, a week of dates and
+the evening seatings.
+
+Usage: python benchmarks/bench_batch_booking.py
+"""
+import datetime
+import random
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+import bookings
+from restaurants import RESTAURANT_STORE
+from tools import make_reservation
+
+TIMES = ["17:00", "17:30", "18:00", "18:30", "19:00", "19:30", "20:00"]
+ROUNDS = 20
+
+
+def make_batch(size, seed=7):
+    rng = random.Random(seed)
+    monday = datetime.date.today() + datetime.timedelta(days=7 - datetime.date.today().weekday())
+    # Wednesday to Saturday: the evenings every catalog restaurant except the cafe and deli is open.
+    dates = [(monday + datetime.timedelta(days=d)).isoformat() for d in range(2, 6)]
+    restaurant_ids = [r.id for r in RESTAURANT_STORE.values() if r.id not in ("FS04", "FS08")]
+    return [{"restaurant_id": rng.choice(restaurant_ids), "date": rng.choice(dates), "time": rng.choice(TIMES),
+             "party_size": rng.randint(1, 4), "customer_name": "Acme Corp", "customer_contact": "events@acme.test"}
+            for _ in range(size)]
+
+
+def timed(book, batch):
+    elapsed, booked = 0.0, 0
+    for _ in range(ROUNDS):
+        bookings.reset_bookings()
+        start = time.perf_counter()
+        booked = book(batch)
+        elapsed += time.perf_counter() - start
+    return elapsed / ROUNDS, booked
+
+
+def loop(batch):
+    return sum(make_reservation(**item)["success"] for item in batch)
+
+
+def main():
+    print(f"{'batch':>6} {'method':>22} {'ms/batch':>9} {'us/item':>8} {'booked':>7}")
+    for size in (10, 100, 1000):
+        batch = make_batch(size)
+        for label, book in (
+            ("make_reservation loop", loop),
+            ("add_bookings", lambda b: bookings.add_bookings(b)["booked"]),
+            ("add_bookings atomic", lambda b: bookings.add_bookings(b, all_or_nothing=True)["booked"]),
+        ):
+            elapsed, booked = timed(book, batch)
+            print(f"{size:>6} {label:>22} {elapsed * 1000:>9.2f} {elapsed / size * 1e6:>8.1f} {booked:>7}")
+    bookings.reset_bookings()
+
+
+if __name__ == "__main__":
+    main()
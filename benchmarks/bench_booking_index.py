@@ -0,0 +1,99 @@
+"""
+Booking lookups at 1M bookings: a customer's reservations, a restaurant's daily manifest
+and per-status counts through the secondary indexes versus scanning BOOKING_DETAILS, plus
+the cost of keeping the indexes current and their memory.
+
+Usage: python benchmarks/bench_booking_index.py [--bookings 1000000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+import bookings
+from booking_index import BookingIndex, customer_key
+from restaurants import RESTAURANT_STORE
+
+TIMES = ["12:00", "12:30", "13:00", "18:00", "18:30", "19:00", "19:30", "20:00", "20:30"]
+CUSTOMERS = 200_000
+QUERIES = 1000
+SCANS = 3
+
+
+def make_bookings(n, seed=7):
+    rng = random.Random(seed)
+    restaurant_ids = [(r.id, r.name) for r in RESTAURANT_STORE.values()]
+    for i in range(n):
+        restaurant_id, name = rng.choice(restaurant_ids)
+        customer = rng.randrange(CUSTOMERS)
+        yield {
+            "booking_id": f"BK{101 + i}", "restaurant_id": restaurant_id, "restaurant_name": name,
+            "date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", "time": rng.choice(TIMES),
+            "party_size": rng.randint(1, 6), "customer_name": f"Guest {customer}",
+            "customer_contact": f"+1 555 {customer:07d}",
+            "status": "Cancelled" if rng.random() < 0.05 else "Confirmed", "timestamp": "2026-10-18T12:00:00",
+        }
+
+
+def per_call(function, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        function(*args)
+    return (time.perf_counter() - start) / len(args_list)
+
+
+def scan_customer(name):
+    key = customer_key(name)
+    return [b for b in bookings.BOOKING_DETAILS.values() if customer_key(b["customer_name"]) == key]
+
+
+def scan_day(restaurant_id, date_str):
+    return [b for b in bookings.BOOKING_DETAILS.values() if b["restaurant_id"] == restaurant_id and b["date"] == date_str]
+
+
+def scan_status(status):
+    return sum(1 for b in bookings.BOOKING_DETAILS.values() if b["status"] == status)
+
+
+def report(label, indexed, scanned):
+    print(f"{label:<24} index {indexed * 1e6:9.1f} us   scan {scanned * 1000:9.1f} ms   {scanned / indexed:9.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = list(make_bookings(args.bookings))
+    bookings.reset_bookings()
+    start = time.perf_counter()
+    bookings.restore_bookings(rows)
+    print(f"restored {args.bookings:,} bookings (occupancy + indexes) in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(1)
+    names = [(f"Guest {rng.randrange(CUSTOMERS)}",) for _ in range(QUERIES)]
+    days = [(rng.choice(list(RESTAURANT_STORE)), f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}") for _ in range(QUERIES)]
+    report("list my bookings", per_call(bookings.find_bookings, names), per_call(scan_customer, names[:SCANS]))
+    report("daily manifest", per_call(bookings.get_daily_manifest, days), per_call(scan_day, days[:SCANS]))
+    report("cancelled count", per_call(lambda s: bookings.BOOKING_INDEX.status_counts()[s], [("Cancelled",)] * QUERIES),
+           per_call(scan_status, [("Cancelled",)] * SCANS))
+
+    # Incremental upkeep: cancel and re-book the same parties (both paths update every index).
+    targets = [b for b in rows[:QUERIES] if b["status"] == "Confirmed"]
+    cancel = per_call(bookings.cancel_reservation, [(b["booking_id"],) for b in targets])
+    book = per_call(bookings.add_booking, [(b["restaurant_id"], "2027-03-03", b["time"], 1, b["customer_name"],
+                                            b["customer_contact"]) for b in targets])
+    print(f"{'cancel_reservation':<24} {cancel * 1e6:9.1f} us   add_booking {book * 1e6:9.1f} us")
+
+    tracemalloc.start()
+    index = BookingIndex(rows)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"index memory: {size / 2**20:.0f} MiB ({size / len(rows):.0f} B/booking) for {len(index.by_customer):,} "
+          f"customers, {len(index.by_day):,} restaurant-days")
+    bookings.reset_bookings()
+
+
+if __name__ == "__main__":
+    main()
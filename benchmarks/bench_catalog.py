@@ -0,0 +1,49 @@
+"""
+Memory and lookup latency of the ID-keyed Restaurant store vs. the old list of dicts.
+
+Usage: python benchmarks/bench_catalog.py
+"""
+import random
+import timeit
+import tracemalloc
+
+from synthetic import make_restaurants
+from restaurants import build_store
+
+
+def linear_lookup(restaurants, restaurant_id):
+    """The pre-store get_restaurant_by_id."""
+    for r in restaurants:
+        if r['id'] == restaurant_id:
+            return r
+    return None
+
+
+def measure(build):
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    print(f"{'restaurants':>12} {'dicts B/r':>10} {'store B/r':>10} {'scan us':>10} {'store us':>10}")
+    for n in (1_000, 100_000):
+        raw = make_restaurants(n)
+        # Measure each representation from the same source rows, built from scratch.
+        dicts, dict_bytes = measure(lambda: [{k: (type(v)(v) if isinstance(v, (list, dict)) else v)
+                                              for k, v in r.items()} for r in raw])
+        store, store_bytes = measure(lambda: build_store(raw))
+
+        ids = [r['id'] for r in random.Random(0).sample(raw, min(200, n))]
+        number = 5 if n > 10_000 else 50
+        scan_s = timeit.timeit(lambda: [linear_lookup(dicts, i) for i in ids], number=number)
+        store_s = timeit.timeit(lambda: [store.get(i) for i in ids], number=number)
+        lookups = number * len(ids)
+        print(f"{n:>12} {dict_bytes / n:>10.0f} {store_bytes / n:>10.0f} "
+              f"{scan_s / lookups * 1e6:>10.2f} {store_s / lookups * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Startup cost of a 100k-restaurant catalog: a Python literal in a module (how restaurants.py
+ships the catalog) vs. a columnar file read by catalog_loader (Arrow IPC memory-mapped,
+and Parquet). Each variant runs in a fresh interpreter and reports
+
+- import: importing the catalog (the literal module; tools.py for the file, which now
+  builds nothing at import),
+- first search: building the ID store and search index and answering one search,
+- max RSS of the process.
+
+The literal is measured with its .pyc already written, i.e. the best case for it.
+
+Usage: python benchmarks/bench_catalog_loader.py [--restaurants 100000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from synthetic import make_restaurants
+from catalog_loader import write_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ru_maxrss survives exec on Linux (the child would report this process's peak), so the
+# children read their own high-water mark instead.
+PEAK_RSS = """
+def peak_rss():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+"""
+
+LITERAL = """
+import sys, time
+{peak_rss}sys.path[:0] = [{root!r}, {tmp!r}]
+start = time.perf_counter()
+import catalog_literal
+from restaurants import build_store
+imported = time.perf_counter()
+from search_index import RestaurantIndex
+index = RestaurantIndex(build_store(catalog_literal.CATALOG).values())
+list(index.ordered(index.query(cuisine="Thai")))[:3]
+done = time.perf_counter()
+print({{"import": imported - start, "first_search": done - imported,
+       "rss": peak_rss()}})
+"""
+
+FILE = """
+import sys, time
+{peak_rss}sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import tools
+imported = time.perf_counter()
+tools.search_restaurants(cuisine="Thai")
+done = time.perf_counter()
+print({{"import": imported - start, "first_search": done - imported,
+       "rss": peak_rss()}})
+"""
+
+
+def run(code, catalog_path=None):
+    env = dict(os.environ)
+    env.pop("FOODIESPOT_CATALOG", None)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # the literal module is measured from its .pyc
+    if catalog_path:
+        env["FOODIESPOT_CATALOG"] = catalog_path
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return eval(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = make_restaurants(args.restaurants)
+    with tempfile.TemporaryDirectory() as tmp:
+        literal_path = os.path.join(tmp, "catalog_literal.py")
+        with open(literal_path, "w", encoding="utf-8") as f:
+            f.write("CATALOG = " + json.dumps(rows, indent=1) + "\n")
+        arrow_path = os.path.join(tmp, "catalog.arrow")
+        parquet_path = os.path.join(tmp, "catalog.parquet")
+        write_catalog(rows, arrow_path)
+        write_catalog(rows, parquet_path)
+
+        literal = LITERAL.format(root=ROOT, tmp=tmp, peak_rss=PEAK_RSS)
+        from_file = FILE.format(root=ROOT, peak_rss=PEAK_RSS)
+        run(literal)  # compiles and caches catalog_literal's .pyc
+        variants = [
+            ("built-in list (11)", run(from_file)),
+            (f"literal module ({args.restaurants:,})", run(literal)),
+            (f"Arrow mmap ({args.restaurants:,})", run(from_file, arrow_path)),
+            (f"Parquet ({args.restaurants:,})", run(from_file, parquet_path)),
+        ]
+        assert os.listdir(os.path.join(tmp, "__pycache__")), "catalog_literal was not cached"
+        sizes = {"literal module": os.path.getsize(literal_path), "Arrow mmap": os.path.getsize(arrow_path),
+                 "Parquet": os.path.getsize(parquet_path)}
+
+    print(f"{'catalog':<28} {'import ms':>10} {'first search ms':>16} {'max RSS MiB':>12}")
+    for label, numbers in variants:
+        print(f"{label:<28} {numbers['import'] * 1000:>10.1f} {numbers['first_search'] * 1000:>16.1f} "
+              f"{numbers['rss'] / 1024:>12.0f}")
+    print("file size: " + ", ".join(f"{label} {size / 2**20:.1f} MiB" for label, size in sizes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+End-to-end agent benchmark, fully offline: drives process_user_message through the scripted
+conversations in conversations.json (booking, missing info, follow-ups that rely on history,
+open-table search, paging with "show more", out-of-context chat) against a FakeGroqClient, and reports
+
+- per-stage latency (turn by route, prompt build, LLM call, parse, tool and format per tool),
+- throughput in turns/s,
+- memory: peak allocated per turn and bytes retained per finished session.
+
+Every reply is checked against the conversation's expected text, so a parsing, history or
+booking regression fails the run (exit status 1). --save writes the per-stage numbers to a
+JSON file and --baseline compares against one, flagging stages that got slower.
+
+Replies come from the script, or from a file recorded against the real API with
+fake_llm.RecordingClient (--replay). Replies are instant unless --first-token-ms /
+--token-ms add simulated provider latency.
+
+Usage: python benchmarks/bench_e2e.py [--sessions 500] [--replay recording.jsonl]
+                                      [--save results.json] [--baseline results.json]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+from fake_llm import FakeGroqClient, ReplayReplies, load_recording
+import agent_logic
+import bookings
+from conversation import ConversationHistory
+from instrumentation import TRACER
+from llm_cache import ResponseCache
+
+CONVERSATIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conversations.json")
+GREETING = "Hello! How can I help you with your FoodieSpot reservation today?"
+MEMORY_SESSIONS = 200
+# Stage slowdowns smaller than this are timer noise, whatever the ratio.
+MIN_REGRESSION_MS = 0.01
+
+
+class SpanCollector:
+    """Tracer exporter keeping every span duration, for exact percentiles per stage."""
+
+    def __init__(self):
+        self.durations = {}
+
+    def export(self, span):
+        labels = "".join(f"[{span.attributes[k]}]" for k in ("route", "tool") if k in span.attributes)
+        self.durations.setdefault(span.name + labels, []).append(span.duration)
+
+
+def booking_day():
+    """A Wednesday at least two days out, when every scripted restaurant is open."""
+    day = datetime.date.today() + datetime.timedelta(days=2)
+    return (day + datetime.timedelta(days=(2 - day.weekday()) % 7)).isoformat()
+
+
+def load_conversations(path, day):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    conversations = json.loads(text.replace("{day}", day))
+    replies = {turn["user"]: json.dumps(turn["reply"]) for c in conversations for turn in c["turns"]}
+    return conversations, replies
+
+
+def run_session(conversation):
+    """Plays one conversation; returns (turns, failed expectations, final history)."""
+    history = ConversationHistory(greeting=GREETING)
+    failures = []
+    for turn in conversation["turns"]:
+        response, history = agent_logic.process_user_message(turn["user"], history)
+        if turn["expect"] not in response:
+            failures.append((conversation["name"], turn["user"], response))
+    return len(conversation["turns"]), failures, history
+
+
+def run(conversations, sessions):
+    """Plays sessions conversations round-robin; bookings are reset after each full round."""
+    turns, failures = 0, []
+    started = time.perf_counter()
+    for i in range(sessions):
+        if i % len(conversations) == 0:
+            bookings.reset_bookings()
+        session_turns, session_failures, _ = run_session(conversations[i % len(conversations)])
+        turns += session_turns
+        failures.extend(session_failures)
+    return turns, time.perf_counter() - started, failures
+
+
+def measure_memory(conversations, sessions=MEMORY_SESSIONS):
+    """Peak traced allocation per turn, and bytes still held per finished session (its history)."""
+    bookings.reset_bookings()
+    tracemalloc.start()
+    peak_per_turn = 0
+    histories = []
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(sessions):
+        history = ConversationHistory(greeting=GREETING)
+        histories.append(history)
+        for turn in conversations[i % len(conversations)]["turns"]:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            agent_logic.process_user_message(turn["user"], history)
+            peak_per_turn = max(peak_per_turn, tracemalloc.get_traced_memory()[1] - before)
+        if i % len(conversations) == len(conversations) - 1:
+            bookings.reset_bookings()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return peak_per_turn, retained / sessions
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def stage_summary(collector):
+    summary = {}
+    for stage, durations in sorted(collector.durations.items()):
+        durations = sorted(durations)
+        summary[stage] = {
+            "count": len(durations),
+            "mean_ms": sum(durations) / len(durations) * 1000,
+            "p50_ms": percentile(durations, 0.5) * 1000,
+            "p95_ms": percentile(durations, 0.95) * 1000,
+            "p99_ms": percentile(durations, 0.99) * 1000,
+        }
+    return summary
+
+
+def compare(summary, baseline_path, tolerance):
+    """Prints stages whose p50 got more than tolerance slower than the baseline; returns how many."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["stages"]
+    slower = 0
+    for stage, numbers in summary.items():
+        before = baseline.get(stage)
+        if (before and numbers["p50_ms"] > before["p50_ms"] * (1 + tolerance)
+                and numbers["p50_ms"] - before["p50_ms"] > MIN_REGRESSION_MS):
+            slower += 1
+            print(f"SLOWER: {stage} p50 {before['p50_ms']:.3f} -> {numbers['p50_ms']:.3f} ms")
+    if not slower:
+        print(f"no stage slower than the baseline by more than {tolerance:.0%}")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--conversations", default=CONVERSATIONS)
+    parser.add_argument("--replay", help="JSON-lines file written by fake_llm.RecordingClient")
+    parser.add_argument("--first-token-ms", type=float, default=0.0)
+    parser.add_argument("--token-ms", type=float, default=0.0)
+    parser.add_argument("--cache", action="store_true", help="keep the LLM response cache on")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    conversations, replies = load_conversations(args.conversations, booking_day())
+    if args.replay:
+        replies.update(load_recording(args.replay))
+    script = ReplayReplies(replies)
+    agent_logic.client = FakeGroqClient(script, first_token_latency=args.first_token_ms / 1000,
+                                        token_latency=args.token_ms / 1000)
+    if not args.cache:
+        # Otherwise repeated sessions would mostly measure cache hits instead of parsing.
+        agent_logic.RESPONSE_CACHE = ResponseCache(max_entries=0)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        run(conversations, len(conversations))  # warm-up: imports, prompt template, indexes
+        collector = SpanCollector()
+        TRACER.exporters.append(collector)
+        turns, elapsed, failures = run(conversations, args.sessions)
+        TRACER.exporters.remove(collector)
+        peak_per_turn, retained_per_session = measure_memory(conversations)
+
+    summary = stage_summary(collector)
+    print(f"{args.sessions} sessions, {turns} turns in {elapsed:.2f}s: {turns / elapsed:,.0f} turns/s  "
+          f"(LLM calls {len(agent_logic.client.calls)}, unscripted {script.misses})")
+    print(f"\n{'stage':<36} {'n':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, numbers in summary.items():
+        print(f"{stage:<36} {numbers['count']:>6} {numbers['mean_ms']:>9.3f} {numbers['p50_ms']:>9.3f} "
+              f"{numbers['p95_ms']:>9.3f} {numbers['p99_ms']:>9.3f}")
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nmemory: peak {peak_per_turn / 1024:.1f} KiB allocated per turn, "
+          f"{retained_per_session / 1024:.1f} KiB retained per session, max RSS {max_rss_mb:.0f} MiB")
+
+    for name, message, response in failures[:5]:
+        print(f"UNEXPECTED REPLY in {name!r} to {message!r}: {response!r}")
+    if failures:
+        print(f"{len(failures)} turns did not get the expected reply")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"turns_per_second": turns / elapsed, "stages": summary,
+                       "peak_bytes_per_turn": peak_per_turn, "retained_bytes_per_session": retained_per_session}, f, indent=2)
+    slower = compare(summary, args.baseline, args.tolerance) if args.baseline else 0
+    sys.exit(1 if failures or slower else 0)
+
+
+if __name__ == "__main__":
+    main()
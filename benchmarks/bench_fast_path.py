@@ -0,0 +1,71 @@
+"""
+Turn latency and LLM calls for structured transactional messages (book / cancel / bare
+restaurant ID), with the rule-based fast path versus always asking the LLM, against a
+fake Groq client.
+
+Usage: python benchmarks/bench_fast_path.py
+"""
+import contextlib
+import datetime
+import io
+import json
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+from fake_llm import FakeGroqClient
+import agent_logic
+from conversation import ConversationHistory
+from llm_cache import ResponseCache
+
+GREETING = "Hello! How can I help you with your FoodieSpot reservation today?"
+SESSIONS = 100
+
+
+def script():
+    day = (datetime.date.today() + datetime.timedelta(days=2)).isoformat()
+    return [
+        (f"book FS03 {day} 19:00 for 4 as Priya", "make_reservation",
+         {"restaurant_id": "FS03", "date": day, "time": "19:00", "party_size": 4, "customer_name": "Priya"}),
+        ("FS05", "check_availability",
+         {"restaurant_id": "FS05", "date_str": day, "time_str": "19:00", "party_size": 4}),
+        ("cancel BK101", "cancel_reservation", {"booking_id": "BK101"}),
+    ]
+
+
+def run(use_fast_path):
+    turns = script()
+    by_message = {message: (tool_name, arguments) for message, tool_name, arguments in turns}
+
+    def fake_llm(messages):
+        tool_name, arguments = by_message[messages[-1]["content"]]
+        return json.dumps({"tool_name": tool_name, "arguments": arguments})
+
+    agent_logic.client = FakeGroqClient(fake_llm, first_token_latency=0.02, token_latency=0.001)
+    # No response cache either way, so every turn the fast path misses pays for an LLM call.
+    original_cache, agent_logic.RESPONSE_CACHE = agent_logic.RESPONSE_CACHE, ResponseCache(max_entries=0)
+    original = agent_logic.match_fast_path
+    if not use_fast_path:
+        agent_logic.match_fast_path = lambda user_message, conversation_history: None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(SESSIONS):
+                history = ConversationHistory(greeting=GREETING)
+                for message, _, _ in turns:
+                    _, history = agent_logic.process_user_message(message, history)
+            elapsed = time.perf_counter() - start
+    finally:
+        agent_logic.match_fast_path = original
+        agent_logic.RESPONSE_CACHE = original_cache
+    return elapsed, len(agent_logic.client.calls)
+
+
+def main():
+    turns = SESSIONS * len(script())
+    for label, use_fast_path in (("LLM only", False), ("fast path", True)):
+        elapsed, llm_calls = run(use_fast_path)
+        print(f"{label:>10}: {turns} turns  {elapsed / turns * 1000:7.2f} ms/turn  LLM calls: {llm_calls}")
+
+
+if __name__ == "__main__":
+    main()
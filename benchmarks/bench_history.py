@@ -0,0 +1,56 @@
+"""
+Prompt size and turn latency over a 100-turn conversation: legacy ever-growing history
+string vs. the token-budgeted ConversationHistory, against a fake Groq client whose
+latency grows with prompt length.
+
+Usage: python benchmarks/bench_history.py
+"""
+import contextlib
+import io
+import json
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+from fake_llm import FakeGroqClient
+import agent_logic
+from conversation import ConversationHistory
+
+TURNS = 100
+REPORT_AT = (1, 10, 25, 50, 75, 100)
+GREETING = "Hello! How can I help you with your FoodieSpot reservation today?"
+
+USER_MESSAGES = [
+    "Can you suggest an Italian place downtown for 4 people?",
+    "What about something with a romantic ambiance instead?",
+    "Tell me a bit more about the seaside options and their price range.",
+    "Is there anything vegetarian friendly in the North End?",
+]
+REPLY = json.dumps({"tool_name": "none", "response": "Sure! FoodieSpot Trattoria (FS03) downtown is a great "
+                    "family-friendly Italian spot, and FoodieSpot Seaside Bistro (FS02) suits a romantic evening. "
+                    "Which date and time would you like, and how many guests?"})
+
+
+def run(history):
+    agent_logic.client = FakeGroqClient([REPLY], first_token_latency=0.0, token_latency=0.0,
+                                        prompt_token_latency=0.00002)
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for turn in range(1, TURNS + 1):
+            start = time.perf_counter()
+            _, history = agent_logic.process_user_message(USER_MESSAGES[turn % len(USER_MESSAGES)], history)
+            elapsed = time.perf_counter() - start
+            if turn in REPORT_AT:
+                rows.append((turn, agent_logic.client.prompt_tokens[-1], elapsed))
+    return rows
+
+
+def main():
+    legacy = run(f"Assistant: {GREETING}")
+    bounded = run(ConversationHistory(greeting=GREETING))
+    print(f"{'turn':>5} {'string tokens':>14} {'string ms':>10} {'budgeted tokens':>16} {'budgeted ms':>12}")
+    for (turn, legacy_tokens, legacy_s), (_, bounded_tokens, bounded_s) in zip(legacy, bounded):
+        print(f"{turn:>5} {legacy_tokens:>14} {legacy_s * 1e3:>10.2f} {bounded_tokens:>16} {bounded_s * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
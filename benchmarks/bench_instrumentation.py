@@ -0,0 +1,59 @@
+"""
+Per-turn cost of debug printing and of tracing, over full agent turns against a zero-latency
+fake Groq client: debug prints on (the old behaviour) vs. off, and tracing with and without
+the JSON-lines exporter. Prints the resulting per-span latency summary.
+
+Usage: python benchmarks/bench_instrumentation.py
+"""
+import contextlib
+import datetime
+import io
+import json
+import os
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+from fake_llm import FakeGroqClient
+import agent_logic
+import instrumentation
+from conversation import ConversationHistory
+from instrumentation import TRACER, JsonLinesExporter
+
+TURNS = 2000
+REPLY = json.dumps({"tool_name": "search_restaurants", "arguments": {"cuisine": "Italian", "party_size": 2}})
+
+
+def run(label, debug, exporter=None):
+    instrumentation.set_debug(debug)
+    TRACER.exporters[:] = [exporter] if exporter else []
+    agent_logic.client = FakeGroqClient([REPLY], first_token_latency=0, token_latency=0)
+    day = (datetime.date.today() + datetime.timedelta(days=2)).isoformat()
+    messages = ["Italian food for 2 please", f"book FS01 {day} 19:00 for 2 as Priya"]
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        started = time.perf_counter()
+        for i in range(TURNS):
+            agent_logic.RESPONSE_CACHE.clear()
+            agent_logic.process_user_message(messages[i % 2], ConversationHistory())
+        elapsed = time.perf_counter() - started
+    print(f"{label:>28}: {elapsed / TURNS * 1e6:8.1f} us/turn  stdout {len(sink.getvalue()) / TURNS:7.0f} B/turn")
+
+
+def main():
+    run("debug prints on", debug=True)
+    run("debug prints off", debug=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        exporter = JsonLinesExporter(os.path.join(tmp, "trace.jsonl"))
+        run("off + JSON-lines exporter", debug=False, exporter=exporter)
+        exporter.close()
+        print(f"{'':>28}  trace file {os.path.getsize(exporter.path) / TURNS:.0f} B/turn")
+    TRACER.exporters[:] = []
+
+    print("\nspan latency (all runs):")
+    for name, summary in sorted(TRACER.snapshot()["spans"].items()):
+        print(f"  {name:<28} n={summary['count']:>6}  mean {summary['mean_ms']:7.3f} ms  p95 <= {summary['p95_ms_le']:g} ms")
+
+
+if __name__ == "__main__":
+    main()
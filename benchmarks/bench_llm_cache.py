@@ -0,0 +1,53 @@
+"""
+Response-cache hit rate and saved LLM latency over a stream of near-identical opening
+queries, against a fake Groq client.
+
+Usage: python benchmarks/bench_llm_cache.py
+"""
+import contextlib
+import io
+import json
+import random
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+from fake_llm import FakeGroqClient
+import agent_logic
+from conversation import ConversationHistory
+
+GREETING = "Hello! How can I help you with your FoodieSpot reservation today?"
+SESSIONS = 300
+
+OPENERS = {
+    "Italian place downtown for 4": {"cuisine": "Italian", "location_area": "Downtown", "party_size": 4},
+    "italian place downtown for 4!": {"cuisine": "Italian", "location_area": "Downtown", "party_size": 4},
+    "Hi, can you find an Italian place downtown for 4 please": {"cuisine": "Italian", "location_area": "Downtown", "party_size": 4},
+    "Any sushi in Uptown?": {"cuisine": "Sushi", "location_area": "Uptown"},
+    "any sushi uptown": {"cuisine": "Sushi", "location_area": "Uptown"},
+    "Romantic seafood by the sea": {"cuisine": "Seafood", "ambiance": "Romantic"},
+}
+
+
+def fake_llm(messages):
+    arguments = OPENERS.get(messages[-1]["content"], {})
+    return json.dumps({"tool_name": "search_restaurants", "arguments": arguments})
+
+
+def main():
+    agent_logic.client = FakeGroqClient(fake_llm, first_token_latency=0.02, token_latency=0.001)
+    agent_logic.RESPONSE_CACHE.clear()
+    rng = random.Random(3)
+    openers = list(OPENERS)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(SESSIONS):
+            agent_logic.process_user_message(rng.choice(openers), ConversationHistory(greeting=GREETING))
+        elapsed = time.perf_counter() - start
+    stats = agent_logic.cache_metrics()
+    print(f"sessions: {SESSIONS}  LLM calls: {len(agent_logic.client.calls)}  wall: {elapsed:.2f}s")
+    print(f"hit rate: {stats['hit_rate']:.1%}  hits: {stats['hits']}  misses: {stats['misses']}  "
+          f"saved LLM latency: {stats['saved_latency_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
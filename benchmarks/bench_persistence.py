@@ -0,0 +1,82 @@
+"""
+Booking journal benchmarks: write throughput under group commit (per batch size and fsync
+mode) and recovery time (load + replay into memory) at 1M bookings.
+
+Usage: python benchmarks/bench_persistence.py [--bookings 1000000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+import bookings
+from booking_persistence import BOOKING_COLUMNS, SQLiteBookingLog, _UPSERT
+from restaurants import RESTAURANT_STORE
+
+TIMES = ["12:00", "12:30", "13:00", "18:00", "18:30", "19:00", "19:30", "20:00", "20:30"]
+
+
+def make_bookings(n, seed=7):
+    rng = random.Random(seed)
+    restaurants = list(RESTAURANT_STORE.values())
+    for i in range(n):
+        r = rng.choice(restaurants)
+        yield {
+            "booking_id": f"BK{101 + i}", "restaurant_id": r.id, "restaurant_name": r.name,
+            "date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", "time": rng.choice(TIMES),
+            "party_size": rng.randint(1, 6), "customer_name": f"Guest {i}", "customer_contact": "",
+            "status": "Cancelled" if rng.random() < 0.05 else "Confirmed", "timestamp": "2026-10-18T12:00:00",
+        }
+
+
+def bench_writes(directory, n=50_000):
+    print(f"{'synchronous':>12} {'batch':>6} {'rows/s':>10} {'commits':>8}")
+    rows = list(make_bookings(n))
+    for synchronous in ("NORMAL", "FULL"):
+        for batch_size in (1, 64, 512):
+            path = os.path.join(directory, f"writes-{synchronous}-{batch_size}.db")
+            log = SQLiteBookingLog(path, batch_size=batch_size, synchronous=synchronous)
+            count = n if batch_size > 1 else n // 10
+            start = time.perf_counter()
+            for booking in rows[:count]:
+                log.record(booking)
+            log.flush()
+            elapsed = time.perf_counter() - start
+            print(f"{synchronous:>12} {batch_size:>6} {count / elapsed:>10.0f} {log.commits:>8}")
+            log.close()
+
+
+def bench_recovery(directory, n):
+    path = os.path.join(directory, "recovery.db")
+    SQLiteBookingLog(path).close()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(_UPSERT, (tuple(b[c] for c in BOOKING_COLUMNS) for b in make_bookings(n)))
+    conn.close()
+
+    bookings.reset_bookings()
+    start = time.perf_counter()
+    log = SQLiteBookingLog(path)
+    rows = log.load()
+    loaded = time.perf_counter()
+    bookings.restore_bookings(rows)
+    replayed = time.perf_counter()
+    log.close()
+    print(f"recovery of {n} bookings: load {loaded - start:.2f}s + replay {replayed - loaded:.2f}s "
+          f"= {replayed - start:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        bench_writes(directory)
+        bench_recovery(directory, args.bookings)
+
+
+if __name__ == "__main__":
+    main()
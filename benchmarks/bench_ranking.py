@@ -0,0 +1,85 @@
+"""
+Ranked search at 100k restaurants: latency of RestaurantRanker.rank per query (p50 / p99),
+first page and a deep page, with and without live availability on a date with bookings at
+5% of the restaurants. Also times the seats-taken vector for a date and time: built from
+scratch, brought up to date after a booking on that date, and cached.
+
+Usage: python benchmarks/bench_ranking.py [--restaurants 100000]
+"""
+import argparse
+import random
+import time
+
+from synthetic import make_restaurants
+from ranking import RestaurantRanker
+from restaurants import Restaurant
+from slot_engine import SlotEngine
+
+REPEAT = 200
+DATE = "2026-11-04"
+QUERIES = [
+    {"cuisine": "Italian"},
+    {"cuisine": "Sushi", "location_area": "Uptown"},
+    {"location_area": "Downtown", "price_range": "$$", "ambiance": "Casual"},
+    {"ambiance": ["Romantic", "Cozy"], "price_range": "$$$$"},
+    {},
+]
+
+
+def timed(call):
+    durations = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return durations[len(durations) // 2] * 1e3, durations[int(len(durations) * 0.99)] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=100_000)
+    args = parser.parse_args()
+
+    records = [Restaurant.from_dict(r) for r in make_restaurants(args.restaurants)]
+    start = time.perf_counter()
+    ranker = RestaurantRanker(records)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    engine = SlotEngine()
+    rng = random.Random(0)
+    for r in rng.sample(records, len(records) // 20):
+        engine.reserve(r.id, DATE, rng.choice(["18:30", "19:00", "19:30"]), rng.randint(1, r.capacity))
+
+    def rebuild_taken():
+        engine.touch()  # as after reloading every booking
+        return ranker.seats_taken(engine, DATE, "19:00")
+    rebuild_ms = timed(rebuild_taken)
+
+    def update_taken():
+        r = rng.choice(records)
+        engine.reserve(r.id, DATE, "19:00", 1)
+        engine.release(r.id, DATE, "19:00", 1)
+        return ranker.seats_taken(engine, DATE, "19:00")
+    update_ms = timed(update_taken)
+    cached_ms = timed(lambda: ranker.seats_taken(engine, DATE, "19:00"))
+    live = {"party_size": 4, "date": DATE, "time": "19:00", "taken": ranker.seats_taken(engine, DATE, "19:00")}
+
+    print(f"{args.restaurants:,} restaurants, ranker built in {build_ms:.0f} ms")
+    print(f"seats taken at {DATE} 19:00 ({len(records) // 20:,} restaurants booked): "
+          f"p50 {rebuild_ms[0]:.3f} ms built, {update_ms[0]:.3f} ms after a booking that date, "
+          f"{cached_ms[0]:.4f} ms cached\n")
+    print(f"{'query':<64} {'matches':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    worst = 0.0
+    for query in QUERIES:
+        label = ", ".join(f"{k}={v}" for k, v in query.items()) or "(no criteria)"
+        _, total = ranker.rank(**query)
+        for variant, extra in (("", {}), (" +live", live), (" +live page 10", dict(live, offset=27))):
+            p50, p99 = timed(lambda: ranker.rank(**query, **extra))
+            worst = max(worst, p50)
+            print(f"{label + variant:<64} {total:>8} {p50:>8.3f} {p99:>8.3f}")
+    print(f"\nslowest ranked query p50: {worst:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
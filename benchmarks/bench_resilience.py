@@ -0,0 +1,111 @@
+"""
+LLM call latency under a simulated provider brownout (slow tail + transient errors) and a
+full outage, with the resilience layer (deadline, jittered retry, hedging, circuit breaker)
+versus the old single unbounded call. Timings are scaled down: 50 ms typical completions,
+3 s stragglers, 1 s deadline.
+
+Usage: python benchmarks/bench_resilience.py
+"""
+import contextlib
+import io
+import json
+import random
+import time
+from types import SimpleNamespace
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+import agent_logic
+from conversation import ConversationHistory
+from resilience import CircuitBreaker, ResilientCaller
+
+CALLS = 200
+TYPICAL_LATENCY = 0.05
+STRAGGLER_LATENCY = 3.0
+REPLY = json.dumps({"tool_name": "search_restaurants", "arguments": {"cuisine": "Italian"}})
+
+
+class BrownoutClient:
+    """Fake Groq client: a fraction of calls are stragglers, another fraction fail fast."""
+
+    def __init__(self, straggler_fraction, error_fraction, seed=7):
+        self.straggler_fraction = straggler_fraction
+        self.error_fraction = error_fraction
+        self._rng = random.Random(seed)
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, model=None, timeout=None, **kwargs):
+        self.requests += 1
+        roll = self._rng.random()
+        if roll < self.error_fraction:
+            time.sleep(0.01)
+            raise ConnectionError("connection reset by peer")
+        if roll < self.error_fraction + self.straggler_fraction:
+            delay = STRAGGLER_LATENCY
+        else:
+            delay = TYPICAL_LATENCY * (1 + self._rng.random())
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("read timed out")
+        time.sleep(delay)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=REPLY))])
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(label, caller, client, calls=CALLS):
+    agent_logic.LLM_CALLER = caller
+    agent_logic.client = client
+    messages = [{"role": "user", "content": "Italian food please"}]
+    latencies, failures = [], 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(calls):
+            started = time.perf_counter()
+            if agent_logic.call_groq_llm(messages) != REPLY:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+    print(f"{label:>34}: p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  "
+          f"max {max(latencies) * 1000:7.1f} ms  failed {failures:>3}/{calls}  provider requests {client.requests}")
+    return caller
+
+
+def resilient_caller():
+    return ResilientCaller(deadline_seconds=1.0, base_delay_seconds=0.02, max_delay_seconds=0.2,
+                           breaker=CircuitBreaker(failure_threshold=5, reset_seconds=5.0))
+
+
+def single_unbounded_call():
+    return ResilientCaller(deadline_seconds=3600.0, max_attempts=1, hedge_percentile=None,
+                           breaker=CircuitBreaker(failure_threshold=float("inf")))
+
+
+def main():
+    print("Brownout: 5% stragglers (3 s), 5% connection errors")
+    run("single unbounded call (before)", single_unbounded_call(), BrownoutClient(0.05, 0.05))
+    caller = run("deadline + retry + hedge", resilient_caller(), BrownoutClient(0.05, 0.05))
+    stats = caller.stats()
+    print(f"{'':>34}  retries {stats['retries']}  hedges {stats['hedges']} (won {stats['hedge_wins']})  "
+          f"deadlines exceeded {stats['deadlines_exceeded']}")
+
+    print("\nOutage: every request fails")
+    run("single unbounded call (before)", single_unbounded_call(), BrownoutClient(0.0, 1.0), calls=50)
+    caller = run("with circuit breaker", resilient_caller(), BrownoutClient(0.0, 1.0), calls=50)
+    print(f"{'':>34}  circuit {caller.stats()['circuit_state']}, rejected without calling: "
+          f"{caller.stats()['rejected_while_open']}")
+
+    # While the circuit is open, a repeated request is still answered from the (expired) cache.
+    history = ConversationHistory()
+    key = agent_logic.response_cache_key("Italian food please", history)
+    agent_logic.RESPONSE_CACHE.ttl_seconds = 0
+    agent_logic.RESPONSE_CACHE.put(key, REPLY)
+    with contextlib.redirect_stdout(io.StringIO()):
+        reply, _ = agent_logic.process_user_message("Italian food please", history)
+    print(f"\nrepeated request while open: {reply.splitlines()[0]!r} "
+          f"(stale cache hits: {agent_logic.cache_metrics()['stale_hits']})")
+
+
+if __name__ == "__main__":
+    main()
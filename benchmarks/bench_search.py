@@ -0,0 +1,69 @@
+"""
+Compares the inverted-index search against the previous linear scan.
+
+Usage: python benchmarks/bench_search.py
+"""
+import itertools
+import timeit
+
+from synthetic import make_restaurants
+from restaurants import Restaurant
+from search_index import RestaurantIndex
+
+QUERIES = [
+    {"cuisine": "Italian"},
+    {"cuisine": "Sushi", "location_area": "Uptown"},
+    {"location_area": "Downtown", "price_range": "$$", "ambiance": "Casual"},
+    {"ambiance": "Romantic", "price_range": "$$$$"},
+]
+
+
+def legacy_scan(restaurants, cuisine=None, location_area=None, price_range=None, ambiance=None, max_results=3):
+    """The pre-index search_restaurants filter loop (without availability checks)."""
+    results = []
+    for r in restaurants:
+        match = True
+        if cuisine:
+            cuisine_lower = cuisine.lower()
+            if not any(c.lower() == cuisine_lower for c in r['cuisine']):
+                match = False
+        if location_area and location_area.lower() != r['location_area'].lower():
+            match = False
+        if price_range and price_range != r['price_range']:
+            match = False
+        if ambiance:
+            ambiance_lower = ambiance.lower()
+            if not any(a.lower() == ambiance_lower for a in r['ambiance']):
+                match = False
+        if match:
+            results.append(r.copy())
+    results.sort(key=lambda x: x.get('is_available_at_request', False), reverse=True)
+    return results[:max_results]
+
+
+def indexed_search(index, max_results=3, **criteria):
+    return [index.restaurants[rid].as_dict()
+            for rid in itertools.islice(index.ordered(index.query(**criteria)), max_results)]
+
+
+def main():
+    print(f"{'restaurants':>12} {'build ms':>10} {'scan us/q':>12} {'index us/q':>12} {'speedup':>9}")
+    for n in (10, 1_000, 100_000):
+        restaurants = make_restaurants(n)
+        records = [Restaurant.from_dict(r) for r in restaurants]
+        build_s = timeit.timeit(lambda: RestaurantIndex(records), number=1)
+        index = RestaurantIndex(records)
+
+        for q in QUERIES:
+            assert [r['id'] for r in legacy_scan(restaurants, **q)] == [r['id'] for r in indexed_search(index, **q)]
+
+        number = max(1, 20_000 // n)
+        scan_s = timeit.timeit(lambda: [legacy_scan(restaurants, **q) for q in QUERIES], number=number)
+        index_s = timeit.timeit(lambda: [indexed_search(index, **q) for q in QUERIES], number=number)
+        per_query = number * len(QUERIES)
+        print(f"{n:>12} {build_s * 1e3:>10.2f} {scan_s / per_query * 1e6:>12.1f} "
+              f"{index_s / per_query * 1e6:>12.1f} {scan_s / index_s:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Startup cost, each measured in a fresh interpreter (median of --runs):
+
+- import agent_logic: cold import, plus which heavy modules it pulled in (the Groq SDK,
+  httpx and asyncio should load only on first use),
+- first turn: a fast-path booking right after import (builds the catalog store and indexes),
+- LLM client: the first get_llm_client() call, which imports the SDK (dummy key, no request),
+- Streamlit: the first run of app.py and the p50 of later reruns (what every interaction
+  costs), through streamlit's AppTest; skipped if streamlit is not installed.
+
+The slowest modules under agent_logic come from python -X importtime. --save writes the
+numbers to a JSON file and --baseline compares against one, flagging any that got slower
+(exit status 1).
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--save startup.json] [--baseline startup.json]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("groq", "httpx", "asyncio", "streamlit", "pyarrow")
+RERUNS = 20
+
+AGENT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import agent_logic
+imported = time.perf_counter()
+loaded = [m for m in {heavy!r} if m in sys.modules]
+from conversation import ConversationHistory
+agent_logic.process_user_message("book FS03 2026-11-20 19:00 for 4 as Priya", ConversationHistory())
+turned = time.perf_counter()
+agent_logic.groq_api_key = "benchmark-key"
+agent_logic.get_llm_client()
+built = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - start) * 1e3, "first_turn_ms": (turned - imported) * 1e3,
+                  "llm_client_ms": (built - turned) * 1e3, "loaded": loaded}}))
+"""
+
+APP = """
+import json, os, sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(os.path.join({root!r}, "app.py"))
+start = time.perf_counter()
+app.run()
+first = time.perf_counter() - start
+reruns = []
+for _ in range({reruns}):
+    start = time.perf_counter()
+    app.run()
+    reruns.append(time.perf_counter() - start)
+reruns.sort()
+print(json.dumps({{"app_first_run_ms": first * 1e3, "app_rerun_ms": reruns[len(reruns) // 2] * 1e3}}))
+"""
+
+
+def child(code, importtime=False):
+    env = dict(os.environ)
+    for name in ("GROQ_API_KEY", "FOODIESPOT_BOOKINGS_DB", "FOODIESPOT_SHARED_BOOKINGS_DB",
+                 "FOODIESPOT_CATALOG", "FOODIESPOT_TRACE_FILE", "FOODIESPOT_METRICS_PORT"):
+        env.pop(name, None)
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    done = subprocess.run(command, env=env, cwd=ROOT, check=True, capture_output=True, text=True)
+    return json.loads(done.stdout.strip().splitlines()[-1]), done.stderr
+
+
+def slowest_imports(stderr, count=8):
+    """The top-level imports made by agent_logic, by cumulative microseconds, from -X importtime."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            name = name[1:]
+            rows.append((name.strip(), len(name) - len(name.lstrip()), int(cumulative)))
+    # importtime lists children before their parent, indented two spaces per level.
+    end = next((i for i, (name, depth, _) in enumerate(rows) if name == "agent_logic" and depth == 0), len(rows))
+    start = max((i for i, (_, depth, _) in enumerate(rows[:end]) if depth == 0), default=-1) + 1
+    direct = [(name, us) for name, depth, us in rows[start:end] if depth == 2]
+    return sorted(direct, key=lambda item: -item[1])[:count]
+
+
+def compare(results, baseline_path, tolerance):
+    """Prints numbers more than tolerance slower than the baseline; returns how many."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    slower = 0
+    for name, value in results.items():
+        before = baseline.get(name)
+        if isinstance(value, float) and before and value > before * (1 + tolerance):
+            slower += 1
+            print(f"SLOWER: {name} {before:.1f} -> {value:.1f} ms")
+    if not slower:
+        print(f"nothing slower than the baseline by more than {tolerance:.0%}")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    agent_code = AGENT.format(root=ROOT, heavy=HEAVY_MODULES)
+    runs = [child(agent_code)[0] for _ in range(args.runs)]
+    results = {name: statistics.median(run[name] for run in runs)
+               for name in ("import_ms", "first_turn_ms", "llm_client_ms")}
+    loaded = runs[0]["loaded"]
+    _, importtime = child(agent_code, importtime=True)
+
+    if importlib.util.find_spec("streamlit") is None:
+        print("streamlit is not installed; skipping the app.py runs")
+    else:
+        app_code = APP.format(root=ROOT, reruns=RERUNS)
+        app_runs = [child(app_code)[0] for _ in range(args.runs)]
+        results.update({name: statistics.median(run[name] for run in app_runs)
+                        for name in ("app_first_run_ms", "app_rerun_ms")})
+
+    labels = {"import_ms": "import agent_logic", "first_turn_ms": "first (fast-path) turn",
+              "llm_client_ms": "first get_llm_client()", "app_first_run_ms": "app.py first run",
+              "app_rerun_ms": f"app.py rerun (p50 of {RERUNS})"}
+    print(f"{'stage':<28} {'median ms':>10}")
+    for name, value in results.items():
+        print(f"{labels[name]:<28} {value:>10.1f}")
+    print("heavy modules loaded by import agent_logic: " + (", ".join(loaded) or "none"))
+    print("slowest imports under agent_logic: " + ", ".join(f"{name} {us / 1000:.1f} ms"
+                                                            for name, us in slowest_imports(importtime)))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    slower = compare(results, args.baseline, args.tolerance) if args.baseline else 0
+    sys.exit(1 if slower else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Time-to-first-text of the streaming agent turn vs. the blocking one, against a fake
+streaming Groq client (no network).
+
+Usage: python benchmarks/bench_streaming.py
+"""
+import contextlib
+import io
+import json
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+from fake_llm import FakeGroqClient
+import agent_logic
+
+DIRECT = json.dumps({"tool_name": "none", "response": "Happy to help! " + "We have lovely tables this evening. " * 12 +
+                     "What date, time and party size should I look for?"})
+TOOL = json.dumps({"tool_name": "search_restaurants", "arguments": {"cuisine": "Italian", "location_area": "Downtown"}})
+FENCED_TOOL = "```json\n" + TOOL + "\n```\nLet me know if you need anything else!"
+
+
+def run(reply, stream):
+    agent_logic.client = FakeGroqClient([reply], first_token_latency=0.3, token_latency=0.02)
+    agent_logic.RESPONSE_CACHE.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if stream:
+            turn = agent_logic.process_user_message_stream("Hi", "")
+            for _ in turn:
+                pass
+            return turn.first_text_latency, time.perf_counter() - start, turn.response
+        response, _ = agent_logic.process_user_message("Hi", "")
+        elapsed = time.perf_counter() - start
+        return elapsed, elapsed, response
+
+
+def main():
+    print(f"{'reply':>12} {'mode':>9} {'first text s':>13} {'turn s':>8}")
+    for name, reply in (("direct", DIRECT), ("tool call", TOOL), ("fenced tool", FENCED_TOOL)):
+        blocking = run(reply, stream=False)
+        streaming = run(reply, stream=True)
+        assert blocking[2] == streaming[2] or name == "fenced tool", (blocking[2], streaming[2])
+        for mode, (first, total, _) in (("blocking", blocking), ("streaming", streaming)):
+            print(f"{name:>12} {mode:>9} {first:>13.3f} {total:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Tool-call parsing over a mix of well-formed and sloppy LLM outputs (prose around the JSON,
+fences, single quotes, trailing commas, truncation, wrong argument names): how many turns
+end up as a usable tool call ("asks" = the reply names the missing details), and the parse cost per reply, for the single-pass extractor
+versus the old fence-slicing json.loads.
+
+Usage: python benchmarks/bench_tool_call_parser.py
+"""
+import contextlib
+import inspect
+import io
+import json
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+import agent_logic
+from tool_call_parser import ToolCallParser
+from tools import AVAILABLE_TOOLS, TOOL_PARAMETERS
+
+REPEAT = 2000
+CALL = {"tool_name": "make_reservation", "arguments": {"restaurant_id": "FS03", "date": "2026-10-21",
+                                                       "time": "19:00", "party_size": 4, "customer_name": "Priya"}}
+CLEAN = json.dumps(CALL)
+OUTPUTS = {
+    "clean": CLEAN,
+    "fenced": f"```json\n{CLEAN}\n```",
+    "prose before": f"Sure, I can book that for you.\n{CLEAN}",
+    "prose after": f"{CLEAN}\nLet me know if you need anything else!",
+    "fence + prose": f"Here is the call:\n```json\n{CLEAN}\n```",
+    "single quotes": str(CALL),
+    "trailing comma": CLEAN[:-2] + ",}}",
+    "cut off at the end": CLEAN[:-2],
+    "cut off mid-name": CLEAN[:-5],
+    "party size as text": CLEAN.replace('"party_size": 4', '"party_size": "4 people"'),
+    "check with date/time": json.dumps({"tool_name": "check_availability", "arguments": {
+        "restaurant_id": "FS03", "date": "2026-10-21", "time": "19:00", "party_size": 4}}),
+    "direct reply": json.dumps({"tool_name": "none", "response": "Which restaurant would you like?"}),
+}
+
+
+def legacy_parse(raw):
+    """The previous parse: strip a leading ```json fence by slicing, else json.loads the whole text."""
+    try:
+        text = raw[7:-3].strip() if raw.startswith("```json") else raw.strip()
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return "none", None
+    return (value.get("tool_name"), value.get("arguments")) if isinstance(value, dict) else ("none", None)
+
+
+def outcome(tool_name, arguments, label):
+    """'ok' if the call would run its tool without a TypeError (or is the expected direct reply)."""
+    if tool_name == "none":
+        return "ok" if label == "direct reply" else "LOST"
+    try:
+        inspect.signature(AVAILABLE_TOOLS[tool_name]).bind(**(arguments or {}))
+    except (KeyError, TypeError):
+        return "LOST"
+    return "ok"
+
+
+def main():
+    print(f"{'output':<22} {'before':>8} {'after':>8}")
+    for label, raw in OUTPUTS.items():
+        before = outcome(*legacy_parse(raw), label)
+        with contextlib.redirect_stdout(io.StringIO()):
+            tool_name, arguments, response = agent_logic.parse_llm_response(raw)
+        after = outcome(tool_name, arguments, label)
+        if after == "LOST" and response.startswith("To "):
+            after = "asks"  # a question naming the missing details instead of a failed tool call
+        print(f"{label:<22} {before:>8} {after:>8}")
+
+    parser = ToolCallParser(AVAILABLE_TOOLS, TOOL_PARAMETERS)
+    for label, parse in (("old json.loads", legacy_parse), ("extractor", parser.extract)):
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            for raw in OUTPUTS.values():
+                parse(raw)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>15}: {elapsed / (REPEAT * len(OUTPUTS)) * 1e6:6.1f} us/reply")
+    stats = parser.stats()
+    print(f"extractor outcomes: clean {stats['clean']}, extracted {stats['extracted']}, "
+          f"repaired {stats['repaired']}, failed {stats['failed']} of {stats['replies']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Local stand-in for the Groq client, for offline benchmarks.
+
+FakeGroqClient exposes the one call agent_logic uses, client.chat.completions.create(...),
+in both blocking and stream=True form, and replays scripted replies with configurable
+time-to-first-token, per-output-token and per-prompt-token latency.
+
+RecordingClient wraps the real Groq client and appends every exchange to a JSON-lines file;
+load_recording() turns such a file back into replies a FakeGroqClient can replay.
+"""
+import itertools
+import json
+import re
+import time
+from types import SimpleNamespace
+
+_TOKEN = re.compile(r"\s*\S+|\s+")
+
+
+def tokenize(text):
+    """Splits text into word-sized pseudo tokens (leading whitespace attached)."""
+    return _TOKEN.findall(text)
+
+
+class FakeGroqClient:
+    def __init__(self, responses, first_token_latency=0.2, token_latency=0.01, prompt_token_latency=0.0):
+        """responses: a list of reply strings (cycled) or a callable(messages) -> reply string."""
+        self._next = responses if callable(responses) else _cycler(responses)
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.prompt_token_latency = prompt_token_latency
+        self.calls = []
+        self.prompt_tokens = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, model=None, stream=False, **kwargs):
+        self.calls.append(messages)
+        prompt_tokens = sum(len(tokenize(m["content"])) for m in messages)
+        self.prompt_tokens.append(prompt_tokens)
+        reply = self._next(messages)
+        tokens = tokenize(reply)
+        # Prefill cost grows with the prompt, then tokens are generated one by one.
+        first_token = self.first_token_latency + self.prompt_token_latency * prompt_tokens
+        if stream:
+            return self._stream(tokens, first_token)
+        time.sleep(first_token + self.token_latency * len(tokens))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))],
+                               usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=len(tokens)))
+
+    def _stream(self, tokens, first_token_latency):
+        time.sleep(first_token_latency)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.token_latency)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+
+def _cycler(responses):
+    replies = itertools.cycle(responses)
+    return lambda messages: next(replies)
+
+
+def last_user_message(messages):
+    return next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+
+
+class ReplayReplies:
+    """
+    Replies keyed by the last user message, for FakeGroqClient(ReplayReplies(...)).
+    Unknown messages get the fallback reply (a polite 'none' by default); misses are counted.
+    """
+
+    def __init__(self, replies=None, fallback=None):
+        self.replies = dict(replies or {})
+        self.fallback = fallback or json.dumps({"tool_name": "none", "response": "Sorry, could you rephrase that?"})
+        self.misses = 0
+
+    def __call__(self, messages):
+        reply = self.replies.get(last_user_message(messages))
+        if reply is None:
+            self.misses += 1
+            return self.fallback
+        return reply
+
+
+def load_recording(path):
+    """Reads a RecordingClient file into {user message: reply} (later entries win)."""
+    replies = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                replies[entry["user"]] = entry["reply"]
+    return replies
+
+
+class RecordingClient:
+    """Pass-through to a real (blocking) Groq client that logs each user message and raw reply to path."""
+
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **kwargs):
+        completion = self._client.chat.completions.create(messages=messages, **kwargs)
+        entry = {"user": last_user_message(messages), "reply": completion.choices[0].message.content}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return completion
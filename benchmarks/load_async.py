@@ -0,0 +1,115 @@
+"""
+Load test of the agent pipeline against a local mock Groq server: turns per second and
+turn latency at 1, 16 and 128 concurrent sessions, for process_user_message_async on one
+event loop versus the blocking process_user_message with one thread per session.
+The second turn of each session returns three availability checks in one reply, which the
+async pipeline runs concurrently.
+
+Usage: python benchmarks/load_async.py
+"""
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+from mock_llm_server import MockLLMServer
+
+CONCURRENCY = (1, 16, 128)
+ROUNDS = 3
+LLM_LATENCY = 0.05
+GREETING = "Hello! How can I help you with your FoodieSpot reservation today?"
+
+
+def script():
+    day = (datetime.date.today() + datetime.timedelta(days=2)).isoformat()
+    checks = [{"tool_name": "check_availability",
+               "arguments": {"restaurant_id": rid, "date_str": day, "time_str": "19:00", "party_size": 4}}
+              for rid in ("FS01", "FS05", "FS07")]
+    return {
+        "Italian place downtown for 4": {"tool_name": "search_restaurants",
+                                         "arguments": {"cuisine": "Italian", "location_area": "Downtown", "party_size": 4}},
+        f"Can you check FS01, FS05 and FS07 on {day} at 19:00 for 4?": {"tool_calls": checks},
+        "Thanks, I'll think about it": {"tool_name": "none", "response": "Sure, just let me know!"},
+    }
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def async_sessions(agent_logic, sessions, turns):
+    latencies = []
+
+    async def session():
+        history = agent_logic.ConversationHistory(greeting=GREETING)
+        for _ in range(ROUNDS):
+            for message in turns:
+                started = time.perf_counter()
+                _, history = await agent_logic.process_user_message_async(message, history)
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    await agent_logic.close_async_client()
+    return elapsed, latencies
+
+
+def threaded_sessions(agent_logic, sessions, turns):
+    latencies = []
+
+    def session():
+        history = agent_logic.ConversationHistory(greeting=GREETING)
+        for _ in range(ROUNDS):
+            for message in turns:
+                started = time.perf_counter()
+                _, history = agent_logic.process_user_message(message, history)
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        for future in [pool.submit(session) for _ in range(sessions)]:
+            future.result()
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    replies = script()
+    server = MockLLMServer(lambda messages: json.dumps(replies[messages[-1]["content"]]), latency=LLM_LATENCY,
+                           in_subprocess=True).start()
+    # Both clients read these when created, so they must be set before agent_logic is imported.
+    os.environ["GROQ_API_KEY"] = "mock-key"
+    os.environ["GROQ_BASE_URL"] = server.base_url
+    with contextlib.redirect_stdout(io.StringIO()):
+        import agent_logic
+        from llm_cache import ResponseCache
+    # Measure the LLM path: a response cache would answer every round after the first.
+    agent_logic.RESPONSE_CACHE = ResponseCache(max_entries=0)
+
+    turns = list(replies)
+    print(f"mock LLM latency {LLM_LATENCY * 1000:.0f} ms, {ROUNDS * len(turns)} turns per session")
+    try:
+        for sessions in CONCURRENCY:
+            for label in ("async", "threads"):
+                requests, connections = server.requests, server.connections
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if label == "async":
+                        elapsed, latencies = asyncio.run(async_sessions(agent_logic, sessions, turns))
+                    else:
+                        elapsed, latencies = threaded_sessions(agent_logic, sessions, turns)
+                print(f"{sessions:>4} sessions {label:>7}: {len(latencies) / elapsed:8.1f} turns/s  "
+                      f"p50 {statistics.median(latencies) * 1000:6.1f} ms  p95 {percentile(latencies, 0.95) * 1000:6.1f} ms  "
+                      f"LLM requests {server.requests - requests:>4}  TCP connections {server.connections - connections:>4}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
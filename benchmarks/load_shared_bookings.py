@@ -0,0 +1,140 @@
+"""
+Multi-process booking load test: several worker processes, each an independent Python
+interpreter like a separate Streamlit worker, book, cancel and modify reservations
+against one shared SQLite inventory (bookings.use_shared_backend). Reports end-to-end
+attempts and confirmed bookings per second as the process count grows, next to the
+in-process backend in a single process.
+
+After each round it recomputes occupancy from the shared table and fails if any slot
+is over capacity, if a booking ID was handed out twice, or if any worker's in-memory
+replica, once synced, differs from the shared table.
+
+Usage: python benchmarks/load_shared_bookings.py [--processes 1 2 4 8] [--attempts 2000]
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+
+# Workers choose their backend explicitly.
+os.environ.pop("FOODIESPOT_BOOKINGS_DB", None)
+os.environ.pop("FOODIESPOT_SHARED_BOOKINGS_DB", None)
+
+# Four weeks, so most attempts still find a table when 8 processes book at once.
+DATES = [(datetime.date(2026, 11, 1) + datetime.timedelta(days=offset)).isoformat() for offset in range(28)]
+TIMES = ["18:00", "18:15", "18:30", "19:00", "19:15", "19:30", "20:00"]
+
+
+def occupancy_summary(slot_engine, restaurant_ids):
+    """{(restaurant_id, date): occupancy list} for every day with seats taken."""
+    summary = {}
+    for restaurant_id in restaurant_ids:
+        for date_str in DATES:
+            occupancy = slot_engine.day(restaurant_id, date_str)
+            if occupancy is not None and occupancy.any():
+                summary[restaurant_id, date_str] = occupancy.tolist()
+    return summary
+
+
+def worker(seed, path, attempts, start, finished, results, replicas):
+    import bookings
+    from restaurants import RESTAURANT_STORE
+
+    if path:
+        bookings.use_shared_backend(path)
+    restaurant_ids = list(RESTAURANT_STORE)
+    rng = random.Random(seed)
+    made = []
+    start.wait()
+    began = time.perf_counter()
+    for _ in range(attempts):
+        roll = rng.random()
+        if made and roll < 0.1:
+            bookings.cancel_reservation(rng.choice(made))
+        elif made and roll < 0.3:
+            bookings.modify_reservation(rng.choice(made), new_time_str=rng.choice(TIMES),
+                                        new_party_size=rng.randint(1, 8))
+        else:
+            result = bookings.add_booking(rng.choice(restaurant_ids), rng.choice(DATES), rng.choice(TIMES),
+                                          rng.randint(1, 8), f"Guest {seed}", "load@example.com")
+            if result["success"]:
+                made.append(result["booking_id"])
+    results.put((made, time.perf_counter() - began))
+    finished.wait()  # sync only once every worker has stopped writing
+    bookings.sync_bookings()
+    replicas.put(occupancy_summary(bookings.SLOT_ENGINE, restaurant_ids))
+
+
+def verify(path, replicas):
+    """Checks the shared table against capacity and against every worker's replica."""
+    from restaurants import RESTAURANT_STORE
+    from slot_engine import SlotEngine
+
+    engine = SlotEngine()
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT restaurant_id, date, time, party_size FROM shared_bookings "
+                        "WHERE status != 'Cancelled'").fetchall()
+    total = conn.execute("SELECT COUNT(*) FROM shared_bookings").fetchone()[0]
+    conn.close()
+    for restaurant_id, date_str, time_str, party_size in rows:
+        engine.reserve(restaurant_id, date_str, time_str, party_size)
+    for (restaurant_id, date_str), occupancy in occupancy_summary(engine, list(RESTAURANT_STORE)).items():
+        capacity = RESTAURANT_STORE[restaurant_id].capacity
+        assert max(occupancy) <= capacity, f"overbooked {restaurant_id} {date_str}: {max(occupancy)} > {capacity}"
+    expected = occupancy_summary(engine, list(RESTAURANT_STORE))
+    for replica in replicas:
+        assert replica == expected, "a worker's synced replica differs from the shared table"
+    return total
+
+
+def run(processes, attempts, shared=True):
+    context = multiprocessing.get_context("spawn")
+    start, finished = context.Event(), context.Event()
+    results, replicas = context.Queue(), context.Queue()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shared_bookings.db") if shared else None
+        workers = [context.Process(target=worker, args=(seed, path, attempts, start, finished, results, replicas))
+                   for seed in range(processes)]
+        for p in workers:
+            p.start()
+        time.sleep(1.0)  # let every interpreter finish importing before the clock starts
+        began = time.perf_counter()
+        start.set()
+        outcomes = [results.get() for _ in workers]
+        elapsed = time.perf_counter() - began
+        finished.set()
+        synced = [replicas.get() for _ in workers]
+        for p in workers:
+            p.join()
+            assert p.exitcode == 0, "a worker failed"
+
+        ids = [booking_id for made, _ in outcomes for booking_id in made]
+        assert len(ids) == len(set(ids)), "duplicate booking IDs"
+        if shared:
+            assert verify(path, synced) == len(ids)
+    return len(ids), processes * attempts / elapsed, len(ids) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--attempts", type=int, default=2_000, help="operations per process")
+    args = parser.parse_args()
+
+    print(f"{'backend':<12} {'processes':>9} {'booked':>8} {'ops/s':>10} {'bookings/s':>11}")
+    booked, ops, rate = run(1, args.attempts, shared=False)
+    print(f"{'in-process':<12} {1:>9} {booked:>8} {ops:>10.0f} {rate:>11.0f}")
+    for processes in args.processes:
+        booked, ops, rate = run(processes, args.attempts)
+        print(f"{'shared':<12} {processes:>9} {booked:>8} {ops:>10.0f} {rate:>11.0f}")
+    print("OK: no overbooking, no duplicate booking IDs, every replica matches the shared table")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Local mock of the Groq chat-completions HTTP endpoint, for load tests of the real clients.
+
+MockLLMServer answers POST /openai/v1/chat/completions with an OpenAI-style completion
+after a fixed delay, over HTTP/1.1 keep-alive, and counts requests and TCP connections so
+tests can confirm that clients reuse pooled connections. Point a client at it with
+GROQ_BASE_URL=server.base_url. With in_subprocess=True it serves from a forked process, so
+its threads do not compete for the GIL with the client under test.
+"""
+import json
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fake_llm
+
+
+class MockLLMServer:
+    def __init__(self, responses, latency=0.05, host="127.0.0.1", port=0, in_subprocess=False):
+        """responses: a callable(messages) -> reply string; latency: seconds per completion."""
+        self.responses = responses
+        self.latency = latency
+        self.in_subprocess = in_subprocess
+        # Shared memory, so the counters are visible from the parent in subprocess mode too.
+        self._requests = multiprocessing.Value("q", 0)
+        self._connections = multiprocessing.Value("q", 0)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        # The default backlog (5) drops connections when many sessions connect at once.
+        self._server.socket.listen(1024)
+        self._runner = None
+
+    @property
+    def requests(self):
+        return self._requests.value
+
+    @property
+    def connections(self):
+        return self._connections.value
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, Nagle + delayed ACK add ~40 ms.
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._connections.get_lock():
+                    server._connections.value += 1
+
+            def handle(self):
+                # Under load, clients hang up mid-request (a timed-out or hedged call): that
+                # is expected, so close the connection quietly instead of printing a traceback.
+                try:
+                    super().handle()
+                except (ConnectionError, json.JSONDecodeError):
+                    self.close_connection = True
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with server._requests.get_lock():
+                    server._requests.value += 1
+                reply = server.responses(body["messages"])
+                time.sleep(server.latency)
+                payload = json.dumps({
+                    "id": f"chatcmpl-{server.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "mock"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": reply}}],
+                    "usage": {"prompt_tokens": sum(len(fake_llm.tokenize(m["content"])) for m in body["messages"]),
+                              "completion_tokens": len(fake_llm.tokenize(reply)),
+                              "total_tokens": 0},
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        if self.in_subprocess:
+            self._runner = multiprocessing.get_context("fork").Process(target=self._server.serve_forever, daemon=True)
+        else:
+            self._runner = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._runner.start()
+        return self
+
+    def stop(self):
+        if self.in_subprocess:
+            self._runner.terminate()
+            self._runner.join()
+        else:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,44 @@
+"""Synthetic catalog generator shared by the benchmark scripts."""
+import os
+import random
+import sys
+
+# Benchmarks are run as plain scripts from the repo root (python benchmarks/<name>.py).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CUISINES = ["American", "Steakhouse", "Seafood", "French", "Italian", "Pizza", "Cafe",
+            "Sandwiches", "Vegetarian", "Asian Fusion", "Sushi", "Mexican", "Mediterranean",
+            "Healthy", "Deli", "Indian", "BBQ", "Tapas", "Cocktails", "Thai", "Korean", "Greek"]
+AREAS = ["Downtown", "Seaside", "North End", "Uptown", "West Side", "East Side",
+         "Old Town", "Harbor", "Midtown", "University District"]
+PRICES = ["$", "$$", "$$$", "$$$$"]
+AMBIANCES = ["Business", "Casual", "Modern", "Romantic", "Scenic", "Cozy", "Family-Friendly",
+             "Warm", "Quiet", "Lively", "Trendy", "Elegant", "Outdoor Seating", "Relaxed",
+             "Quick Bite", "Authentic", "Rustic", "Upscale"]
+HOURS = [
+    {"mon-fri": "11:00-22:00", "sat-sun": "12:00-23:00"},
+    {"tue-sun": "12:00-21:00", "mon": "closed"},
+    {"mon-sun": "12:00-22:00"},
+    {"mon-sat": "16:00-00:00", "sun": "16:00-22:00"},
+]
+
+
+def make_restaurants(n, seed=42):
+    """Returns n restaurant dicts shaped like restaurants.RESTAURANTS."""
+    rng = random.Random(seed)
+    restaurants = []
+    for i in range(n):
+        area = rng.choice(AREAS)
+        restaurants.append({
+            "id": f"FS{i + 1:06d}",
+            "name": f"FoodieSpot {area} #{i + 1}",
+            "location_area": area,
+            "address": f"{rng.randint(1, 999)} Synthetic St, {area}",
+            "cuisine": rng.sample(CUISINES, rng.randint(1, 3)),
+            "capacity": rng.randint(20, 150),
+            "opening_hours": rng.choice(HOURS),
+            "price_range": rng.choice(PRICES),
+            "ambiance": rng.sample(AMBIANCES, rng.randint(2, 4)),
+            "description": "Synthetic benchmark location.",
+        })
+    return restaurants
@@ -0,0 +1,134 @@
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+
+from booking_persistence import BOOKING_COLUMNS
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS shared_bookings (
+    booking_id TEXT PRIMARY KEY,
+    restaurant_id TEXT NOT NULL,
+    restaurant_name TEXT,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    party_size INTEGER NOT NULL,
+    customer_name TEXT,
+    customer_contact TEXT,
+    status TEXT NOT NULL,
+    timestamp TEXT,
+    seq INTEGER NOT NULL
+)
+"""
+_CREATE_SEQ_INDEX = "CREATE INDEX IF NOT EXISTS shared_bookings_seq ON shared_bookings (seq)"
+_UPSERT = (f"INSERT OR REPLACE INTO shared_bookings ({', '.join(BOOKING_COLUMNS)}, seq) "
+           f"VALUES ({', '.join('?' for _ in BOOKING_COLUMNS)}, ?)")
+_SELECT_SINCE = f"SELECT {', '.join(BOOKING_COLUMNS)}, seq FROM shared_bookings WHERE seq > ? ORDER BY seq"
+
+
+class InProcessBookings:
+    """The default booking backend: the inventory lives in this process only, with nothing to share or sync."""
+
+    shared = False
+
+    def transaction(self):
+        return nullcontext()
+
+    def sync(self):
+        pass
+
+    def record(self, booking):
+        pass
+
+    def close(self):
+        pass
+
+
+class SharedSQLiteBookings:
+    """
+    Booking inventory shared by every process that opens the same SQLite file, so several
+    app workers can take bookings without splitting or overbooking it.
+
+    Each process keeps its in-memory state (occupancy, details, indexes) as a replica of
+    the shared table, and every row carries the sequence number of the write that last
+    changed it. A write runs in an IMMEDIATE transaction, which holds SQLite's write lock
+    across processes: it first applies the rows other processes committed since this one
+    last synced, so the capacity check sees the whole inventory, then stores the bookings
+    it changed under the next sequence numbers. Reads only catch up on newer rows.
+
+    apply(bookings) brings the replica up to date with changed booking dicts; reset()
+    empties it, before a full reload after a failed write.
+    """
+
+    shared = True
+
+    def __init__(self, path, apply, reset, busy_timeout=30.0):
+        self.path = path
+        self.commits = 0
+        self._apply = apply
+        self._reset = reset
+        self._seq = 0
+        self._pending = None
+        # One connection per process; writes (and syncs) from its threads take turns on it.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_CREATE_TABLE)
+        self._conn.execute(_CREATE_SEQ_INDEX)
+        with self._lock:
+            self._catch_up()
+
+    def _catch_up(self):
+        rows = self._conn.execute(_SELECT_SINCE, (self._seq,)).fetchall()
+        if rows:
+            self._seq = rows[-1][-1]
+            self._apply([dict(zip(BOOKING_COLUMNS, row)) for row in rows])
+
+    def sync(self):
+        """
+        Applies the bookings other processes committed since the last sync. Skipped while
+        a write in this process holds the connection, since that write syncs first anyway.
+        """
+        if self._lock.acquire(blocking=False):
+            try:
+                self._catch_up()
+            finally:
+                self._lock.release()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs a booking change with the shared inventory locked and up to date, and commits
+        the bookings recorded meanwhile. If anything fails, the transaction is rolled back
+        and the replica reloaded, so it never keeps changes that were not committed.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._pending = {}
+            try:
+                self._catch_up()
+                yield
+                rows = [row + (self._seq + i,) for i, row in enumerate(self._pending.values(), 1)]
+                if rows:
+                    self._conn.executemany(_UPSERT, rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._reset()
+                self._seq = 0
+                self._catch_up()
+                raise
+            finally:
+                self._pending = None
+            self._seq += len(rows)
+            self.commits += 1
+
+    def record(self, booking):
+        """Stores the current state of a booking with the enclosing transaction."""
+        if self._pending is None:
+            raise RuntimeError("bookings can only change inside a booking transaction")
+        self._pending[booking["booking_id"]] = tuple(booking[column] for column in BOOKING_COLUMNS)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
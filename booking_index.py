@@ -0,0 +1,106 @@
+import re
+import threading
+
+_NON_DIGITS = re.compile(r"\D")
+# Separators phone numbers are usually written with; deleting them is much cheaper than the regex.
+_PHONE_SEPARATORS = str.maketrans("", "", " +-().")
+
+
+def customer_key(name):
+    """Normalizes a customer name: case and spacing do not matter."""
+    return " ".join(name.split()).casefold() if isinstance(name, str) and name.strip() else None
+
+
+def contact_key(contact):
+    """Normalizes a contact: emails case-insensitively, phone numbers by their digits only."""
+    if not isinstance(contact, str) or not contact.strip() or contact == "Not Provided":
+        return None
+    if "@" in contact:
+        return contact.strip().casefold()
+    digits = contact.translate(_PHONE_SEPARATORS)
+    if not digits.isdigit():
+        digits = _NON_DIGITS.sub("", contact)
+    return digits if len(digits) >= 7 else contact.strip().casefold()
+
+
+class BookingIndex:
+    """
+    Secondary indexes over booking dicts, by customer name, customer contact, (restaurant,
+    date) and status. Each maps a key to the IDs of the bookings carrying it (as dict keys,
+    which take less memory than sets at this size), so lookups and per-day manifests never
+    scan the whole store.
+
+    Indexes are kept up to date incrementally: call add() for a new booking, and discard()
+    before / add() after changing a booking's indexed fields (date, status, ...).
+    """
+
+    def __init__(self, bookings=()):
+        self.by_customer = {}
+        self.by_contact = {}
+        self.by_day = {}
+        self.by_status = {}
+        self._lock = threading.Lock()
+        self.add_many(bookings)
+
+    def _keys(self, booking):
+        return (
+            (self.by_customer, customer_key(booking.get("customer_name"))),
+            (self.by_contact, contact_key(booking.get("customer_contact"))),
+            (self.by_day, (booking["restaurant_id"], booking["date"])),
+            (self.by_status, booking["status"]),
+        )
+
+    def _add(self, booking):
+        booking_id = booking["booking_id"]
+        for index, key in self._keys(booking):
+            if key is not None:
+                ids = index.get(key)
+                if ids is None:
+                    index[key] = {booking_id: None}
+                else:
+                    ids[booking_id] = None
+
+    def add(self, booking):
+        with self._lock:
+            self._add(booking)
+
+    def add_many(self, bookings):
+        """Indexes many bookings under one lock acquisition (e.g. when replaying the journal)."""
+        with self._lock:
+            for booking in bookings:
+                self._add(booking)
+
+    def discard(self, booking):
+        booking_id = booking["booking_id"]
+        with self._lock:
+            for index, key in self._keys(booking):
+                ids = index.get(key)
+                if ids is not None:
+                    ids.pop(booking_id, None)
+                    if not ids:
+                        del index[key]
+
+    def clear(self):
+        with self._lock:
+            for index in (self.by_customer, self.by_contact, self.by_day, self.by_status):
+                index.clear()
+
+    def for_customer(self, customer_name=None, customer_contact=None):
+        """IDs of the bookings made under a name and/or contact (both must match when both are given)."""
+        with self._lock:
+            by_name = self.by_customer.get(customer_key(customer_name), {}) if customer_name else None
+            by_contact = self.by_contact.get(contact_key(customer_contact), {}) if customer_contact else None
+            if by_name is None:
+                return list(by_contact or ())
+            if by_contact is None:
+                return list(by_name)
+            return [booking_id for booking_id in by_name if booking_id in by_contact]
+
+    def for_day(self, restaurant_id, date_str):
+        """IDs of every booking (any status) at a restaurant on a date."""
+        with self._lock:
+            return list(self.by_day.get((restaurant_id, date_str), ()))
+
+    def status_counts(self):
+        with self._lock:
+            return {status: len(ids) for status, ids in self.by_status.items()}
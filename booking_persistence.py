@@ -0,0 +1,125 @@
+import queue
+import sqlite3
+import threading
+
+BOOKING_COLUMNS = ("booking_id", "restaurant_id", "restaurant_name", "date", "time", "party_size",
+                   "customer_name", "customer_contact", "status", "timestamp")
+
+_CREATE_TABLE = f"""
+CREATE TABLE IF NOT EXISTS bookings (
+    booking_id TEXT PRIMARY KEY,
+    restaurant_id TEXT NOT NULL,
+    restaurant_name TEXT,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    party_size INTEGER NOT NULL,
+    customer_name TEXT,
+    customer_contact TEXT,
+    status TEXT NOT NULL,
+    timestamp TEXT
+)
+"""
+_UPSERT = (f"INSERT OR REPLACE INTO bookings ({', '.join(BOOKING_COLUMNS)}) "
+           f"VALUES ({', '.join('?' for _ in BOOKING_COLUMNS)})")
+_SELECT_ALL = f"SELECT {', '.join(BOOKING_COLUMNS)} FROM bookings"
+
+_STOP = object()
+
+
+class BookingLogError(Exception):
+    """Raised when bookings queued for the journal could not be committed."""
+
+
+class SQLiteBookingLog:
+    """
+    Durable booking journal backed by SQLite in WAL mode.
+    record() only enqueues a copy of the booking; a background writer drains the queue and
+    group-commits everything pending in one transaction (one fsync per batch), and
+    checkpoints the WAL into the main database every few thousand rows to keep it compact.
+
+    A booking is therefore confirmed before it is durable: a crash can lose the last few
+    milliseconds of bookings, and flush() waits until everything queued is committed. If
+    a batch fails to commit, the writer logs it, counts its rows in failed_rows and keeps
+    going; the next flush() raises BookingLogError. record() never raises for it, since
+    the booking it is called for has already been made.
+    """
+
+    def __init__(self, path, batch_size=512, synchronous="NORMAL", checkpoint_every=50_000):
+        self.path = path
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.rows_written = 0
+        self.failed_rows = 0
+        self.commits = 0
+        self._queue = queue.Queue()
+        self._error = None
+        self._error_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.execute(_CREATE_TABLE)
+        self._writer = threading.Thread(target=self._drain, name="booking-log-writer", daemon=True)
+        self._writer.start()
+
+    def load(self):
+        """Returns every persisted booking as a dict."""
+        cursor = self._conn.execute(_SELECT_ALL)
+        return [dict(zip(BOOKING_COLUMNS, row)) for row in cursor]
+
+    def record(self, booking):
+        """Queues the current state of a booking for durable storage."""
+        self._queue.put(tuple(booking[column] for column in BOOKING_COLUMNS))
+
+    def flush(self):
+        """Blocks until every queued booking has been written; raises BookingLogError if any failed to commit."""
+        self._queue.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        with self._error_lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise BookingLogError(f"bookings could not be written to {self.path}: {error}") from error
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._conn.close()
+
+    def _drain(self):
+        since_checkpoint = 0
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not _STOP]
+            try:
+                if rows:
+                    since_checkpoint = self._commit(rows, since_checkpoint)
+            except Exception as e:
+                # Keep the writer alive, so flush() returns and later bookings are still written.
+                print(f"ERROR: Failed to write {len(rows)} bookings to the journal: {e}")
+                with self._error_lock:
+                    self._error = e
+                    self.failed_rows += len(rows)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(rows) < len(batch):
+                return
+
+    def _commit(self, rows, since_checkpoint):
+        """Commits rows in one transaction; returns the rows written since the last checkpoint."""
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(_UPSERT, rows)
+        self.rows_written += len(rows)
+        self.commits += 1
+        since_checkpoint += len(rows)
+        if since_checkpoint >= self.checkpoint_every:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            since_checkpoint = 0
+        return since_checkpoint
@@ -1,48 +1,201 @@
+import atexit
 import datetime
-from restaurants import RESTAURANTS, get_restaurant_by_id
+import functools
+import itertools
+import os
+import threading
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from booking_backend import InProcessBookings, SharedSQLiteBookings
+from booking_index import BookingIndex
+from booking_persistence import SQLiteBookingLog
+from instrumentation import debug
+from opening_hours import describe_hours, get_schedule, is_open
+from restaurants import get_restaurant
+from slot_engine import SlotEngine, slot_to_time
 
 
+# Seat occupancy per restaurant/date, modelled over each party's dining interval.
+SLOT_ENGINE = SlotEngine()
 
-BOOKINGS = {}
+# BOOKINGS[restaurant_id][date_str] is the day's occupancy array of time buckets.
+BOOKINGS = SLOT_ENGINE.days
 
 
 
 BOOKING_DETAILS = {}
-_next_booking_id = 101
 
+# Secondary indexes over BOOKING_DETAILS (customer, contact, restaurant/date, status), kept
+# current by every function below that adds or changes a booking.
+BOOKING_INDEX = BookingIndex()
+
+# Booking state is guarded per (restaurant, date) by a fixed pool of striped locks, so
+# concurrent sessions booking different venues or days never wait on each other.
+LOCK_STRIPES = 64
+_locks = tuple(threading.Lock() for _ in range(LOCK_STRIPES))
+
+_booking_ids = itertools.count(101)
+_booking_id_lock = threading.Lock()
+
+# How many alternative seatings a failed modification suggests, searched this many slots either side.
+ALTERNATIVE_TIMES = 3
+ALTERNATIVE_WINDOW_SLOTS = 8
+
+# Durable journal for BOOKING_DETAILS; None keeps bookings in memory only.
+BOOKINGS_DB_ENV = "FOODIESPOT_BOOKINGS_DB"
+_journal = None
+
+# Where the inventory lives: this process only (the default), or a SQLite file shared by
+# several app processes (see use_shared_backend). Changes go through BACKEND.transaction(),
+# reads first pick up other processes' bookings with BACKEND.sync().
+SHARED_BOOKINGS_DB_ENV = "FOODIESPOT_SHARED_BOOKINGS_DB"
+BACKEND = InProcessBookings()
+
+def _next_booking_id():
+    """Returns a new, unique booking ID."""
+    with _booking_id_lock:
+        return f"BK{next(_booking_ids)}"
+
+def _stripe(restaurant_id, date_str):
+    return hash((restaurant_id, date_str)) % LOCK_STRIPES
+
+@contextmanager
+def _locked(*keys):
+    """Holds the stripe locks for the given (restaurant_id, date_str) keys, acquired in a fixed order."""
+    with ExitStack() as stack:
+        for stripe in sorted({_stripe(*key) for key in keys}):
+            stack.enter_context(_locks[stripe])
+        yield
+
+@contextmanager
+def _locked_booking(booking, *extra_keys):
+    """Locks a booking's current (restaurant, date) plus extra keys, retrying if it moves meanwhile."""
+    while True:
+        key = (booking["restaurant_id"], booking["date"])
+        with _locked(key, *extra_keys):
+            if (booking["restaurant_id"], booking["date"]) == key:
+                yield
+                return
+
+def _persist(booking):
+    BACKEND.record(booking)
+    if _journal is not None:
+        _journal.record(booking)
+
+def _writes(func):
+    """Runs a booking change in a backend transaction."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with BACKEND.transaction():
+            return func(*args, **kwargs)
+    return wrapper
+
+def _reads(func):
+    """Syncs bookings made by other processes before a read."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        BACKEND.sync()
+        return func(*args, **kwargs)
+    return wrapper
+
+def sync_bookings():
+    """Picks up bookings made by other app processes; call before reading SLOT_ENGINE directly."""
+    BACKEND.sync()
+
+def restore_bookings(bookings):
+    """
+    Rebuilds BOOKING_DETAILS, its indexes, seat occupancy and the ID counter from persisted
+    booking dicts. A booking already known is replaced, seats included.
+    """
+    global _booking_ids
+    # Sum party sizes per seating first, so occupancy is replayed once per distinct slot.
+    seats = Counter()
+    last_id = 100
+    restored = []
+    for booking in bookings:
+        booking_id = booking["booking_id"]
+        previous = BOOKING_DETAILS.get(booking_id)
+        if previous is not None:
+            BOOKING_INDEX.discard(previous)
+            if previous["status"] != "Cancelled":
+                seats[previous["restaurant_id"], previous["date"], previous["time"]] -= previous["party_size"]
+        BOOKING_DETAILS[booking_id] = booking
+        restored.append(booking)
+        if booking["status"] != "Cancelled":
+            seats[booking["restaurant_id"], booking["date"], booking["time"]] += booking["party_size"]
+        last_id = max(last_id, int(booking_id[2:]))
+    for (restaurant_id, date_str, time_str), party_size in seats.items():
+        if party_size > 0:
+            SLOT_ENGINE.reserve(restaurant_id, date_str, time_str, party_size)
+        elif party_size < 0:
+            SLOT_ENGINE.release(restaurant_id, date_str, time_str, -party_size)
+    BOOKING_INDEX.add_many(restored)
+    with _booking_id_lock:
+        # Never moves back: replayed changes may all be to older bookings.
+        _booking_ids = itertools.count(max(last_id + 1, next(_booking_ids)))
+
+def enable_persistence(path, **options):
+    """Opens (or creates) the booking journal at path, replays it, and journals every later change."""
+    global _journal
+    journal = SQLiteBookingLog(path, **options)
+    restore_bookings(journal.load())
+    _journal = journal
+    atexit.register(journal.close)
+    return journal
+
+def use_shared_backend(path):
+    """
+    Shares the booking inventory through the SQLite file at path with every other process
+    using it: loads the bookings already there, then commits each change to it and syncs
+    other processes' changes before checking capacity. The file is durable storage too,
+    so no separate journal is needed.
+    """
+    global BACKEND
+    backend = SharedSQLiteBookings(path, apply=restore_bookings, reset=reset_bookings)
+    BACKEND = backend
+    atexit.register(backend.close)
+    return backend
+
+@_reads
 def get_current_bookings(restaurant_id, date_str):
-    """Gets booked seats for a restaurant on a specific date."""
-    return BOOKINGS.get(restaurant_id, {}).get(date_str, {})
+    """Gets booked seats per time bucket for a restaurant on a specific date."""
+    return SLOT_ENGINE.bookings_by_time(restaurant_id, date_str)
 
 def get_restaurant_capacity(restaurant_id):
     """Gets the total capacity of a restaurant."""
-    restaurant = get_restaurant_by_id(restaurant_id)
-    return restaurant['capacity'] if restaurant else 0
+    restaurant = get_restaurant(restaurant_id)
+    return restaurant.capacity if restaurant else 0
+
+def _is_party_size(party_size):
+    """True for a positive whole number of people (not a bool or a numeric string)."""
+    return isinstance(party_size, int) and not isinstance(party_size, bool) and party_size >= 1
 
+@_writes
 def add_booking(restaurant_id, date_str, time_str, party_size, customer_name, customer_contact):
-    """Adds a booking if space is available."""
-    global _next_booking_id
-    capacity = get_restaurant_capacity(restaurant_id)
-    if capacity == 0:
+    """Adds a booking if space is available for the whole dining interval."""
+    if not _is_party_size(party_size):
+        return {"success": False, "reason": "Party size must be a positive whole number."}
+    restaurant = get_restaurant(restaurant_id)
+    if restaurant is None or restaurant.capacity == 0:
         return {"success": False, "reason": "Invalid restaurant ID."}
+    capacity = restaurant.capacity
 
-    
-    if restaurant_id not in BOOKINGS:
-        BOOKINGS[restaurant_id] = {}
-    if date_str not in BOOKINGS[restaurant_id]:
-        BOOKINGS[restaurant_id][date_str] = {}
+    with _locked((restaurant_id, date_str)):
+        try:
+            peak_seats = SLOT_ENGINE.peak(restaurant_id, date_str, time_str)
+        except ValueError as e:
+            return {"success": False, "reason": str(e)}
 
-    current_bookings_at_time = BOOKINGS[restaurant_id][date_str].get(time_str, 0)
+        if peak_seats + party_size > capacity:
+            available_seats = capacity - peak_seats
+            return {"success": False, "reason": f"Not enough capacity. Only {available_seats} seats available at {time_str}."}
 
-    if current_bookings_at_time + party_size <= capacity:
-        BOOKINGS[restaurant_id][date_str][time_str] = current_bookings_at_time + party_size
-        
-        
-        booking_id = f"BK{_next_booking_id}"
+        SLOT_ENGINE.reserve(restaurant_id, date_str, time_str, party_size)
+        booking_id = _next_booking_id()
         BOOKING_DETAILS[booking_id] = {
             "booking_id": booking_id,
             "restaurant_id": restaurant_id,
-            "restaurant_name": get_restaurant_by_id(restaurant_id)['name'],
+            "restaurant_name": restaurant.name,
             "date": date_str,
             "time": time_str,
             "party_size": party_size,
@@ -51,85 +204,310 @@ def add_booking(restaurant_id, date_str, time_str, party_size, customer_name, cu
             "status": "Confirmed",
             "timestamp": datetime.datetime.now().isoformat()
         }
-        _next_booking_id += 1
-        
-        print(f"DEBUG: Bookings for {restaurant_id} on {date_str}: {BOOKINGS[restaurant_id][date_str]}") 
+        BOOKING_INDEX.add(BOOKING_DETAILS[booking_id])
+        _persist(BOOKING_DETAILS[booking_id])
+
+        debug(lambda: f"DEBUG: Bookings for {restaurant_id} on {date_str}: {get_current_bookings(restaurant_id, date_str)}")
         return {"success": True, "booking_id": booking_id, "details": BOOKING_DETAILS[booking_id]}
-    else:
-        available_seats = capacity - current_bookings_at_time
-        return {"success": False, "reason": f"Not enough capacity. Only {available_seats} seats available at {time_str}."}
 
+def _validate_batch_item(item, restaurants, weekdays):
+    """Returns (restaurant, (start, end) interval) for a batch item, or a failure dict. Caches per batch."""
+    restaurant_id = item.get("restaurant_id")
+    if restaurant_id not in restaurants:
+        restaurants[restaurant_id] = get_restaurant(restaurant_id)
+    restaurant = restaurants[restaurant_id]
+    if restaurant is None or restaurant.capacity == 0:
+        return {"success": False, "reason": "Invalid restaurant ID."}
+    if not _is_party_size(item.get("party_size")):
+        return {"success": False, "reason": "Party size must be a positive whole number."}
+    if not item.get("customer_name"):
+        return {"success": False, "reason": "Missing the name for the reservation."}
+
+    date_str = item.get("date")
+    if date_str not in weekdays:
+        try:
+            weekdays[date_str] = datetime.date.fromisoformat(date_str).weekday()
+        except (TypeError, ValueError):
+            weekdays[date_str] = None
+    try:
+        interval = SLOT_ENGINE.interval(item.get("time"))
+    except (AttributeError, ValueError):
+        interval = None
+    if weekdays[date_str] is None or interval is None:
+        return {"success": False, "reason": "Invalid date or time format (use YYYY-MM-DD and HH:MM)."}
+    # The engine's buckets and the opening-hours grid share SLOT_MINUTES, so the seating bucket indexes both.
+    if not get_schedule(restaurant)[weekdays[date_str], interval[0]]:
+        return {"success": False, "reason": f"{restaurant.name} is closed at that time (hours: {describe_hours(restaurant)})."}
+    return restaurant, interval
+
+def _reserve_group(restaurant, date_str, items, stop_on_failure):
+    """
+    Fits a (restaurant, date) group of batch items into one occupancy array, in request
+    order; the caller holds the group's lock. Returns (booked [(index, item)], failures
+    [(index, result)], reserved intervals for rollback).
+    """
+    occupancy = SLOT_ENGINE.day(restaurant.id, date_str, create=True)
+    booked, failures, reserved = [], [], []
+    for index, item, (start, end) in items:
+        peak_seats = int(occupancy[start:end].max())
+        if peak_seats + item["party_size"] > restaurant.capacity:
+            available_seats = restaurant.capacity - peak_seats
+            failures.append((index, {"success": False, "reason": f"Not enough capacity. Only {available_seats} seats available at {item['time']}."}))
+            if stop_on_failure:
+                break
+            continue
+        occupancy[start:end] += item["party_size"]
+        reserved.append((occupancy, start, end, item["party_size"]))
+        booked.append((index, item))
+    if reserved:
+        SLOT_ENGINE.touch(restaurant.id, date_str)
+    return booked, failures, reserved
+
+def _record_batch_booking(restaurant, item, timestamp):
+    booking_id = _next_booking_id()
+    BOOKING_DETAILS[booking_id] = {
+        "booking_id": booking_id,
+        "restaurant_id": restaurant.id,
+        "restaurant_name": restaurant.name,
+        "date": item["date"],
+        "time": item["time"],
+        "party_size": item["party_size"],
+        "customer_name": item["customer_name"],
+        "customer_contact": item.get("customer_contact") or "Not Provided",
+        "status": "Confirmed",
+        "timestamp": timestamp,
+    }
+    BOOKING_INDEX.add(BOOKING_DETAILS[booking_id])
+    _persist(BOOKING_DETAILS[booking_id])
+    return {"success": True, "booking_id": booking_id, "details": BOOKING_DETAILS[booking_id]}
+
+def _batch_result(results, rolled_back=False):
+    if rolled_back:
+        results = [result or {"success": False, "reason": "Not booked: another reservation in the batch failed."}
+                   for result in results]
+    booked = sum(1 for result in results if result["success"])
+    return {"success": booked == len(results), "booked": booked, "results": results}
+
+@_writes
+def add_bookings(items, all_or_nothing=False):
+    """
+    Books several parties at once (e.g. a group or corporate event across tables, venues or
+    dates). items are dicts with restaurant_id, date, time, party_size, customer_name and
+    optionally customer_contact. Each item is validated once, then items are grouped per
+    (restaurant, date) so each day's occupancy is locked and updated once.
+
+    Returns {"success": True only if every item was booked, "booked": count, "results": one
+    add_booking-style dict per item, in order}. With all_or_nothing, one failing item books
+    nothing: it reports its reason and every other item says it was not booked.
+    """
+    timestamp = datetime.datetime.now().isoformat()
+    results = [None] * len(items)
+    groups = {}
+    restaurants, weekdays = {}, {}
+    for index, item in enumerate(items):
+        checked = _validate_batch_item(item, restaurants, weekdays)
+        if isinstance(checked, dict):
+            results[index] = checked
+            continue
+        restaurant, interval = checked
+        groups.setdefault((restaurant.id, item["date"]), (restaurant, []))[1].append((index, item, interval))
+
+    if not all_or_nothing:
+        for (restaurant_id, date_str), (restaurant, group_items) in groups.items():
+            with _locked((restaurant_id, date_str)):
+                booked, failures, _ = _reserve_group(restaurant, date_str, group_items, stop_on_failure=False)
+                for index, item in booked:
+                    results[index] = _record_batch_booking(restaurant, item, timestamp)
+                for index, result in failures:
+                    results[index] = result
+        return _batch_result(results)
+
+    if any(result is not None for result in results):
+        return _batch_result(results, rolled_back=True)
+    # Every group stays locked for the whole batch, so a late failure is undone before anyone sees it.
+    with _locked(*groups):
+        reserved, booked = [], []
+        for (restaurant_id, date_str), (restaurant, group_items) in groups.items():
+            group_booked, failures, group_reserved = _reserve_group(restaurant, date_str, group_items, stop_on_failure=True)
+            reserved.extend(group_reserved)
+            if failures:
+                for occupancy, start, end, party_size in reserved:
+                    occupancy[start:end] -= party_size
+                for restaurant_id, date_str in groups:
+                    SLOT_ENGINE.touch(restaurant_id, date_str)
+                for index, result in failures:
+                    results[index] = result
+                return _batch_result(results, rolled_back=True)
+            booked.extend((restaurant, index, item) for index, item in group_booked)
+        for restaurant, index, item in booked:
+            results[index] = _record_batch_booking(restaurant, item, timestamp)
+    return _batch_result(results)
+
+@_reads
 def check_restaurant_availability(restaurant_id, date_str, time_str, party_size):
-    """Checks if a specific time slot is available."""
-    capacity = get_restaurant_capacity(restaurant_id)
-    if capacity == 0:
+    """Checks if the restaurant is open and a party fits for the whole dining interval starting at a time slot."""
+    if not _is_party_size(party_size):
+        return {"available": False, "reason": "Party size must be a positive whole number."}
+    restaurant = get_restaurant(restaurant_id)
+    if restaurant is None or restaurant.capacity == 0:
         return {"available": False, "reason": "Invalid restaurant ID."}
-        
-    current_bookings_at_time = get_current_bookings(restaurant_id, date_str).get(time_str, 0)
-    
-    if current_bookings_at_time + party_size <= capacity:
+    capacity = restaurant.capacity
+
+    try:
+        if not is_open(restaurant, date_str, time_str):
+            return {"available": False, "reason": f"The restaurant is closed at that time (hours: {describe_hours(restaurant)})."}
+        peak_seats = SLOT_ENGINE.peak(restaurant_id, date_str, time_str)
+    except ValueError as e:
+        return {"available": False, "reason": str(e)}
+
+    if peak_seats + party_size <= capacity:
         return {"available": True}
     else:
-        available_seats = capacity - current_bookings_at_time
+        available_seats = capacity - peak_seats
         return {"available": False, "reason": f"Not enough seats. Only {available_seats} left."}
 
 
 
 
+@_writes
 def cancel_reservation(booking_id):
     """Cancels a reservation by booking ID."""
-    if booking_id not in BOOKING_DETAILS:
+    booking = BOOKING_DETAILS.get(booking_id)
+    if booking is None:
         return {"success": False, "reason": "Booking ID not found."}
 
-    booking = BOOKING_DETAILS[booking_id]
-    restaurant_id = booking["restaurant_id"]
-    date_str = booking["date"]
-    time_str = booking["time"]
-    party_size = booking["party_size"]
-
-    
-    current_bookings_at_time = BOOKINGS[restaurant_id][date_str].get(time_str, 0)
-    BOOKINGS[restaurant_id][date_str][time_str] = current_bookings_at_time - party_size
+    with _locked_booking(booking):
+        if booking["status"] == "Cancelled":
+            return {"success": False, "reason": "Booking is already cancelled."}
 
-    
-    booking["status"] = "Cancelled"
-    booking["timestamp"] = datetime.datetime.now().isoformat()
+        SLOT_ENGINE.release(booking["restaurant_id"], booking["date"], booking["time"], booking["party_size"])
+        BOOKING_INDEX.discard(booking)
+        booking["status"] = "Cancelled"
+        BOOKING_INDEX.add(booking)
+        booking["timestamp"] = datetime.datetime.now().isoformat()
+        _persist(booking)
 
     return {"success": True, "details": booking}
 
+def _nearby_times(restaurant, date_str, occupancy, start_slot, party_size, limit=ALTERNATIVE_TIMES):
+    """Open seatings on the same day, nearest to start_slot first, where the party fits."""
+    schedule_day = get_schedule(restaurant)[datetime.date.fromisoformat(date_str).weekday()]
+    alternatives = []
+    for distance in range(1, ALTERNATIVE_WINDOW_SLOTS + 1):
+        for slot in (start_slot - distance, start_slot + distance):
+            if not 0 <= slot < SLOT_ENGINE.slots_per_day or not schedule_day[slot]:
+                continue
+            peak_seats = int(occupancy[slot:slot + SLOT_ENGINE.dining_slots].max()) if occupancy is not None else 0
+            if peak_seats + party_size <= restaurant.capacity:
+                alternatives.append({"date": date_str, "time": slot_to_time(slot, SLOT_ENGINE.slot_minutes),
+                                     "seats_available": restaurant.capacity - peak_seats})
+                if len(alternatives) == limit:
+                    return alternatives
+    return alternatives
+
+@_writes
 def modify_reservation(booking_id, new_date_str=None, new_time_str=None, new_party_size=None):
-    """Modifies an existing reservation."""
-    if booking_id not in BOOKING_DETAILS:
+    """Moves a reservation to a new date and/or time and/or changes its party size, only if the new slot has room."""
+    booking = BOOKING_DETAILS.get(booking_id)
+    if booking is None:
         return {"success": False, "reason": "Booking ID not found."}
+    if not (new_date_str or new_time_str or new_party_size):
+        return {"success": False, "reason": "Nothing to change: give a new date, time or party size."}
+    if new_party_size is not None and not _is_party_size(new_party_size):
+        return {"success": False, "reason": "Party size must be a positive whole number."}
+    restaurant = get_restaurant(booking["restaurant_id"])
+    if restaurant is None:
+        # Removed from the catalog (e.g. by a reload) since the booking was made.
+        return {"success": False, "reason": "This restaurant is no longer listed, so the reservation can't be changed. It can still be cancelled."}
 
-    booking = BOOKING_DETAILS[booking_id]
-    restaurant_id = booking["restaurant_id"]
-    old_date_str = booking["date"]
-    old_time_str = booking["time"]
-    old_party_size = booking["party_size"]
+    with _locked_booking(booking, (booking["restaurant_id"], new_date_str or booking["date"])):
+        if booking["status"] == "Cancelled":
+            return {"success": False, "reason": "Booking is cancelled."}
+        date_str = new_date_str or booking["date"]
+        time_str = new_time_str or booking["time"]
+        party_size = new_party_size or booking["party_size"]
+        try:
+            if not is_open(restaurant, date_str, time_str):
+                return {"success": False, "reason": f"{restaurant.name} is closed at that time (hours: {describe_hours(restaurant)})."}
+            start, end = SLOT_ENGINE.interval(time_str)
+        except ValueError as e:
+            return {"success": False, "reason": str(e)}
 
-    
-    current_bookings_at_time = BOOKINGS[restaurant_id][old_date_str].get(old_time_str, 0)
-    BOOKINGS[restaurant_id][old_date_str][old_time_str] = current_bookings_at_time - old_party_size
+        # Both sides touch the day arrays directly, once; the old seats are released only
+        # tentatively, so a move that does not fit leaves everything as it was.
+        old_start, old_end = SLOT_ENGINE.interval(booking["time"])
+        old_day = SLOT_ENGINE.day(booking["restaurant_id"], booking["date"], create=True)
+        new_day = old_day if date_str == booking["date"] else SLOT_ENGINE.day(booking["restaurant_id"], date_str, create=True)
+        old_day[old_start:old_end] -= booking["party_size"]
+        peak_seats = int(new_day[start:end].max())
+        if peak_seats + party_size > restaurant.capacity:
+            alternatives = _nearby_times(restaurant, date_str, new_day, start, party_size)
+            old_day[old_start:old_end] += booking["party_size"]
+            SLOT_ENGINE.touch(booking["restaurant_id"], booking["date"])
+            return {"success": False, "alternatives": alternatives,
+                    "reason": f"Not enough capacity. Only {restaurant.capacity - peak_seats} seats available at {time_str}."}
+        new_day[start:end] += party_size
+        SLOT_ENGINE.touch(booking["restaurant_id"], booking["date"])
+        if date_str != booking["date"]:
+            SLOT_ENGINE.touch(booking["restaurant_id"], date_str)
 
-    
-    if new_date_str:
-        booking["date"] = new_date_str
-    if new_time_str:
-        booking["time"] = new_time_str
-    if new_party_size:
-        booking["party_size"] = new_party_size
+        BOOKING_INDEX.discard(booking)
+        booking["date"] = date_str
+        booking["time"] = time_str
+        booking["party_size"] = party_size
+        booking["status"] = "Modified"
+        booking["timestamp"] = datetime.datetime.now().isoformat()
+        BOOKING_INDEX.add(booking)
+        _persist(booking)
 
-    
-    if restaurant_id not in BOOKINGS:
-        BOOKINGS[restaurant_id] = {}
-    if booking["date"] not in BOOKINGS[restaurant_id]:
-        BOOKINGS[restaurant_id][booking["date"]] = {}
+    return {"success": True, "details": booking}
 
-    new_bookings_at_time = BOOKINGS[restaurant_id][booking["date"]].get(booking["time"], 0)
-    BOOKINGS[restaurant_id][booking["date"]][booking["time"]] = new_bookings_at_time + booking["party_size"]
 
-    booking["status"] = "Modified"
-    booking["timestamp"] = datetime.datetime.now().isoformat()
+def _in_order(booking_ids):
+    bookings = (BOOKING_DETAILS.get(booking_id) for booking_id in booking_ids)
+    return sorted((b for b in bookings if b is not None),
+                  key=lambda b: (b["date"], b["time"], int(b["booking_id"][2:])))
 
-    return {"success": True, "details": booking}
+@_reads
+def find_bookings(customer_name=None, customer_contact=None, include_cancelled=False):
+    """Lists a customer's reservations, found by the name and/or the phone number or email used when booking."""
+    if not customer_name and not customer_contact:
+        return {"success": False, "reason": "Please give the name or contact used for the booking."}
+    bookings = _in_order(BOOKING_INDEX.for_customer(customer_name, customer_contact))
+    if not include_cancelled:
+        bookings = [b for b in bookings if b["status"] != "Cancelled"]
+    return {"success": True, "bookings": bookings}
+
+@_reads
+def get_daily_manifest(restaurant_id, date_str):
+    """Lists every reservation at a restaurant on a date, by seating time, with the total number of guests."""
+    restaurant = get_restaurant(restaurant_id)
+    if restaurant is None:
+        return {"success": False, "reason": "Invalid restaurant ID."}
+    try:
+        datetime.date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return {"success": False, "reason": "Invalid date format (use YYYY-MM-DD)."}
+    bookings = _in_order(BOOKING_INDEX.for_day(restaurant_id, date_str))
+    active = [b for b in bookings if b["status"] != "Cancelled"]
+    return {
+        "success": True,
+        "restaurant_id": restaurant_id,
+        "restaurant_name": restaurant.name,
+        "date": date_str,
+        "bookings": active,
+        "covers": sum(b["party_size"] for b in active),
+        "cancelled": len(bookings) - len(active),
+    }
+
+def reset_bookings():
+    """Forgets every booking (occupancy, details and indexes) in this process; the journal or shared database, if any, is left as is."""
+    SLOT_ENGINE.clear()
+    BOOKING_DETAILS.clear()
+    BOOKING_INDEX.clear()
+
+
+if os.environ.get(SHARED_BOOKINGS_DB_ENV):
+    use_shared_backend(os.environ[SHARED_BOOKINGS_DB_ENV])
+elif os.environ.get(BOOKINGS_DB_ENV):
+    enable_persistence(os.environ[BOOKINGS_DB_ENV])
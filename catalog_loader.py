@@ -0,0 +1,144 @@
+"""
+Reads and writes the restaurant catalog as a columnar file, so locations can be added
+without editing restaurants.py.
+
+Two formats are supported, picked by file extension:
+- Arrow IPC (.arrow / .feather, uncompressed): memory-mapped, so opening it costs the
+  same at 10 or 100k restaurants and the pages are shared between processes.
+- Parquet (.parquet): smaller on disk, decoded on open.
+
+pyarrow is imported on first use only, to keep it out of the app's import time.
+
+Usage: python catalog_loader.py catalog.arrow   (exports the built-in catalog)
+"""
+import os
+import sys
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+COLUMNS = ("id", "name", "location_area", "address", "cuisine", "capacity",
+           "opening_hours", "price_range", "ambiance", "description")
+# Rows converted to Python objects at a time when loading.
+BATCH_ROWS = 10_000
+
+
+def _schema():
+    import pyarrow as pa
+    # Low-cardinality columns are dictionary-encoded: each area or price is stored once.
+    return pa.schema([
+        ("id", pa.string()),
+        ("name", pa.string()),
+        ("location_area", pa.dictionary(pa.int32(), pa.string())),
+        ("address", pa.string()),
+        ("cuisine", pa.list_(pa.string())),
+        ("capacity", pa.int32()),
+        ("opening_hours", pa.map_(pa.string(), pa.string())),
+        ("price_range", pa.dictionary(pa.int32(), pa.string())),
+        ("ambiance", pa.list_(pa.string())),
+        ("description", pa.string()),
+    ])
+
+
+def _is_parquet(path):
+    return str(path).lower().endswith(PARQUET_EXTENSIONS)
+
+
+def write_catalog(restaurants, path):
+    """
+    Writes restaurants (catalog dicts or Restaurant records) to path. The file is written
+    next to its final name and then renamed over it, so a running app that reloads the
+    catalog never sees it half-written.
+    """
+    import pyarrow as pa
+
+    rows = [r if isinstance(r, dict) else r.as_dict() for r in restaurants]
+    columns = {name: [] for name in COLUMNS}
+    for row in rows:
+        for name in COLUMNS:
+            columns[name].append(row.get(name))
+    columns["opening_hours"] = [list((hours or {}).items()) for hours in columns["opening_hours"]]
+    columns["address"] = [a or "" for a in columns["address"]]
+    columns["description"] = [d or "" for d in columns["description"]]
+    table = pa.table(columns, schema=_schema())
+
+    tmp_path = f"{path}.tmp"
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        pq.write_table(table, tmp_path)
+    else:
+        # Uncompressed, so the file can be memory-mapped and read without copying.
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+def open_catalog(path):
+    """
+    Opens a catalog file and checks its columns; returns a pyarrow Table. Arrow files are
+    memory-mapped, so nothing is copied until the columns are read. Raises ValueError
+    for a file without the catalog columns.
+    """
+    import pyarrow as pa
+
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, memory_map=True)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    missing = [name for name in ("id", "name", "location_area", "capacity", "price_range")
+               if name not in table.column_names]
+    if missing:
+        raise ValueError(f"catalog file {path} has no column(s): {', '.join(missing)}")
+    return table
+
+
+def _column_values(column):
+    """
+    A column as a Python list. Dictionary-encoded strings, and the strings inside string
+    lists, are converted once per distinct value instead of once per row.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if pa.types.is_dictionary(column.type):
+        values = []
+        for chunk in column.chunks:
+            dictionary = chunk.dictionary.to_pylist()
+            values.extend(dictionary[i] for i in chunk.indices.to_pylist())
+        return values
+    if pa.types.is_list(column.type) and pa.types.is_string(column.type.value_type):
+        values = []
+        for chunk in column.chunks:
+            encoded = pc.dictionary_encode(chunk.flatten())
+            dictionary = encoded.dictionary.to_pylist()
+            flat = [dictionary[i] for i in encoded.indices.to_pylist()]
+            offsets = chunk.offsets.to_pylist()
+            base = offsets[0]
+            values.extend(flat[offsets[i] - base:offsets[i + 1] - base] for i in range(len(chunk)))
+        return values
+    return column.to_pylist()
+
+
+def read_restaurants(table, batch_rows=BATCH_ROWS):
+    """
+    Returns a Restaurant record per row, converting batch_rows rows at a time column by
+    column, so the intermediate Python lists stay small.
+    """
+    import pyarrow as pa
+    from restaurants import Restaurant
+
+    names = [name for name in COLUMNS if name in table.column_names]
+    restaurants = []
+    for batch in table.select(names).to_batches(max_chunksize=batch_rows):
+        columns = {name: _column_values(pa.chunked_array([batch.column(i)]))
+                   for i, name in enumerate(names)}
+        restaurants.extend(Restaurant.from_columns(columns))
+    return restaurants
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python catalog_loader.py <catalog.arrow | catalog.parquet>")
+    from restaurants import RESTAURANT_STORE
+    count = write_catalog(RESTAURANT_STORE.values(), sys.argv[1])
+    print(f"Wrote {count} restaurants to {sys.argv[1]}")
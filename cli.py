@@ -0,0 +1,78 @@
+"""
+Runs the reservation assistant headless, without Streamlit, for batch jobs and scripts.
+
+Every message is one turn of the same conversation, so follow-ups work as in the app.
+Messages come from the arguments, else one per line from --file or standard input:
+
+    python cli.py "Italian in Downtown for 4 tomorrow at 19:00" "book the first one as Priya"
+    python cli.py --file messages.txt --json    (one JSON line per turn)
+    python cli.py                               (interactive; Ctrl-D to quit)
+"""
+import argparse
+import contextlib
+import json
+import sys
+
+GREETING = "Hello! How can I help you with your FoodieSpot reservation today?"
+
+
+def run(messages, as_json=False, out=sys.stdout):
+    """Plays messages as one conversation, writing each reply as it streams (or as JSON lines)."""
+    import agent_logic
+    from conversation import ConversationHistory
+
+    history = ConversationHistory(greeting=GREETING)
+    if not as_json:
+        out.write(f"Assistant: {GREETING}\n")
+    for message in messages:
+        message = message.strip()
+        if not message:
+            continue
+        turn = agent_logic.process_user_message_stream(message, history)
+        if as_json:
+            for _ in turn:
+                pass
+            out.write(json.dumps({"user": message, "assistant": turn.response}) + "\n")
+        else:
+            out.write("Assistant: ")
+            for text in turn:
+                out.write(text)
+                out.flush()
+            out.write("\n")
+        out.flush()
+
+
+def prompt_lines():
+    """Reads messages typed at the terminal until end of input."""
+    while True:
+        try:
+            yield input("You: ")
+        except EOFError:
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FoodieSpot reservation assistant without Streamlit.")
+    parser.add_argument("messages", nargs="*", help="user messages, in order")
+    parser.add_argument("--file", help="read messages from this file, one per line ('-' for stdin)")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per turn")
+    args = parser.parse_args()
+
+    if args.messages:
+        messages = args.messages
+    elif args.file and args.file != "-":
+        with open(args.file, encoding="utf-8") as f:
+            messages = f.read().splitlines()
+    elif args.file or not sys.stdin.isatty():
+        messages = sys.stdin.read().splitlines()
+    else:
+        messages = prompt_lines()
+    # Replies go to stdout; the agent's own ERROR/DEBUG prints go to stderr, so they
+    # never break up a reply or the JSON lines.
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        run(messages, as_json=args.json, out=out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+from collections import deque
+
+DEFAULT_TOKEN_BUDGET = 1200
+MAX_SUMMARY_LINES = 8
+SUMMARY_SNIPPET_CHARS = 80
+
+# Tool arguments worth remembering after the turn that carried them is evicted.
+PINNED_ARGUMENTS = ("restaurant_id", "date", "time", "party_size", "customer_name", "customer_contact",
+                    "cuisine", "location_area", "price_range", "ambiance", "booking_id")
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+class ConversationHistory:
+    """
+    Structured per-session chat history with a token budget.
+    Turns are appended without re-parsing; once the budget is exceeded the oldest turns are
+    evicted into a short rolling summary, while facts pinned from tool calls (selected
+    restaurant, party size, date...) are kept and sent with every prompt.
+    """
+
+    def __init__(self, greeting=None, token_budget=DEFAULT_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self.turns = deque()
+        self.tokens = 0
+        self.pinned = {}
+        self.summary = deque(maxlen=MAX_SUMMARY_LINES)
+        if greeting:
+            self.append("assistant", greeting)
+
+    def append(self, role, content):
+        tokens = estimate_tokens(content)
+        self.turns.append((role, content, tokens))
+        self.tokens += tokens
+        self._evict()
+
+    def add_exchange(self, user_message, assistant_message):
+        self.append("user", user_message)
+        self.append("assistant", assistant_message)
+
+    def pin(self, **facts):
+        """Remembers facts (e.g. restaurant_id="FS03") for the rest of the conversation."""
+        self.pinned.update({key: value for key, value in facts.items() if value not in (None, "")})
+
+    def note_tool_call(self, tool_name, arguments):
+        """Pins the conversation-relevant arguments of a tool call."""
+        if tool_name and tool_name != "none" and isinstance(arguments, dict):
+            self.pin(**{key: arguments[key] for key in PINNED_ARGUMENTS if key in arguments})
+
+    def last_assistant_message(self):
+        for role, content, _ in reversed(self.turns):
+            if role == "assistant":
+                return content
+        return None
+
+    def context_message(self):
+        """Returns the system message carrying pinned facts and the summary of evicted turns, or None."""
+        parts = []
+        if self.pinned:
+            parts.append("Known details so far: " + ", ".join(f"{k}={v}" for k, v in self.pinned.items()) + ".")
+        if self.summary:
+            parts.append("Earlier in the conversation:\n" + "\n".join(self.summary))
+        if not parts:
+            return None
+        return {"role": "system", "content": "\n".join(parts)}
+
+    def to_messages(self):
+        """Returns the history as chat messages, ready to follow the system prompt."""
+        messages = []
+        context = self.context_message()
+        if context:
+            messages.append(context)
+        messages.extend({"role": role, "content": content} for role, content, _ in self.turns)
+        return messages
+
+    def _evict(self):
+        # Always keep the latest exchange, even if it alone exceeds the budget.
+        while self.tokens > self.token_budget and len(self.turns) > 2:
+            role, content, tokens = self.turns.popleft()
+            self.tokens -= tokens
+            snippet = content if len(content) <= SUMMARY_SNIPPET_CHARS else content[:SUMMARY_SNIPPET_CHARS - 3] + "..."
+            self.summary.append(f"- {role}: {' '.join(snippet.split())}")
+
+    def __str__(self):
+        """The legacy 'User: ...\\nAssistant: ...' rendering of the retained turns."""
+        return "\n".join(f"{'User' if role == 'user' else 'Assistant'}: {content}" for role, content, _ in self.turns)
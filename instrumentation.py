@@ -0,0 +1,254 @@
+import atexit
+import bisect
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEBUG_ENV = "FOODIESPOT_DEBUG"
+TRACE_FILE_ENV = "FOODIESPOT_TRACE_FILE"
+METRICS_PORT_ENV = "FOODIESPOT_METRICS_PORT"
+
+# Histogram bucket upper bounds, in seconds.
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Span attributes that become histogram labels (everything else only goes to the exporter).
+HISTOGRAM_LABELS = ("route", "tool")
+
+_debug_enabled = os.environ.get(DEBUG_ENV, "").lower() not in ("", "0", "false", "no")
+_current_span = contextvars.ContextVar("current_span", default=None)
+_span_ids = itertools.count(1)
+
+
+def set_debug(enabled):
+    """Turns debug printing on or off (off by default; FOODIESPOT_DEBUG=1 turns it on)."""
+    global _debug_enabled
+    _debug_enabled = bool(enabled)
+
+
+def debug(message):
+    """Prints a debug line only when debugging is on; pass a callable to defer building the message too."""
+    if _debug_enabled:
+        print(message() if callable(message) else message)
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets, in the Prometheus layout."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction):
+        """Upper bound of the bucket holding the given quantile (None if empty)."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        for bound, cumulative in zip(self.buckets + (float("inf"),), itertools.accumulate(self.counts)):
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_time", "duration")
+
+    def __init__(self, name, parent, attributes):
+        self.span_id = next(_span_ids)
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.duration = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def as_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """
+    Spans (nested per turn via contextvars, so they follow asyncio tasks and to_thread calls),
+    per-span/per-tool latency histograms and counters such as LLM token usage. Finished spans
+    go to the exporters; histograms and counters are kept in memory for snapshot() and the
+    Prometheus endpoint.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.exporters = []
+
+    @contextmanager
+    def span(self, name, **attributes):
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        started = self._clock()
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            span.duration = self._clock() - started
+            _current_span.reset(token)
+            self._finish(span)
+
+    def annotate(self, **attributes):
+        """Adds attributes to the current span, if any."""
+        span = _current_span.get()
+        if span is not None:
+            span.set(**attributes)
+
+    def record_span(self, name, duration, **attributes):
+        """Records an already-timed span (e.g. one that spans generator yields) under the current span."""
+        span = Span(name, _current_span.get(), attributes)
+        span.duration = duration
+        self._finish(span)
+
+    def traced(self, name):
+        """Decorator wrapping each call of a function (or coroutine function) in a span."""
+        def decorate(function):
+            if inspect.iscoroutinefunction(function):
+                @functools.wraps(function)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name):
+                        return await function(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def _finish(self, span):
+        labels = tuple((label, span.attributes[label]) for label in HISTOGRAM_LABELS if label in span.attributes)
+        key = (span.name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(span.duration)
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def snapshot(self):
+        """Latency summary per span (and per tool) plus counters, as plain dicts."""
+        with self._lock:
+            spans = {
+                name + "".join(f"[{value}]" for _, value in labels): {
+                    "count": h.count,
+                    "mean_ms": h.sum / h.count * 1000,
+                    "p50_ms_le": h.quantile(0.5) * 1000,
+                    "p95_ms_le": h.quantile(0.95) * 1000,
+                }
+                for (name, labels), h in self.histograms.items()
+            }
+            counters = {name + "".join(f"[{value}]" for _, value in labels): value
+                        for (name, labels), value in self.counters.items()}
+        return {"spans": spans, "counters": counters}
+
+    def render_prometheus(self):
+        """Histograms and counters in the Prometheus text exposition format."""
+        lines = ["# TYPE foodiespot_span_duration_seconds histogram"]
+        with self._lock:
+            for (name, labels), h in sorted(self.histograms.items()):
+                label_text = ",".join([f'span="{name}"'] + [f'{label}="{value}"' for label, value in labels])
+                for bound, cumulative in zip(h.buckets + (float("inf"),), itertools.accumulate(h.counts)):
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'foodiespot_span_duration_seconds_bucket{{{label_text},le="{le}"}} {cumulative}')
+                lines.append(f"foodiespot_span_duration_seconds_sum{{{label_text}}} {h.sum}")
+                lines.append(f"foodiespot_span_duration_seconds_count{{{label_text}}} {h.count}")
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE foodiespot_{name} counter")
+                    typed.add(name)
+                label_text = ",".join(f'{label}="{label_value}"' for label, label_value in labels)
+                lines.append(f"foodiespot_{name}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class JsonLinesExporter:
+    """Appends each finished span as one JSON line; writes are buffered and flushed on close."""
+
+    def __init__(self, path, buffer_bytes=1 << 16):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8", buffering=buffer_bytes)
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.as_dict(), default=str) + "\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def serve_prometheus(tracer, port, host="127.0.0.1"):
+    """Serves tracer.render_prometheus() at http://host:port/metrics from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = tracer.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+TRACER = Tracer()
+
+if os.environ.get(TRACE_FILE_ENV):
+    _trace_file = JsonLinesExporter(os.environ[TRACE_FILE_ENV])
+    TRACER.exporters.append(_trace_file)
+    atexit.register(_trace_file.close)
+
+if os.environ.get(METRICS_PORT_ENV):
+    serve_prometheus(TRACER, int(os.environ[METRICS_PORT_ENV]))
@@ -0,0 +1,131 @@
+import datetime
+import re
+
+_FLAGS = re.IGNORECASE
+_CANCEL = re.compile(r"^\s*(?:please\s+)?cancel\b(?:\s+(?:my|the))?(?:\s+(?:booking|reservation))?(?:\s+(?:id|number|no\.?))?"
+                     r"\s*#?\s*(BK\d+)\s*(?:please)?\s*[.!]?\s*$", _FLAGS)
+_BOOK_VERB = re.compile(r"^\s*(?:please\s+)?(?:book|reserve)\b", _FLAGS)
+_CHECK_VERB = re.compile(r"^\s*(?:please\s+)?(?:check|is)\b|\bavailab", _FLAGS)
+_BARE_RESTAURANT = re.compile(r"^\s*(?:id\s*:?\s*)?(FS\d+)\s*(?:please)?\s*[.!]?\s*$", _FLAGS)
+
+_RESTAURANT_ID = re.compile(r"\b(FS\d+)\b", _FLAGS)
+_ISO_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+_RELATIVE_DATE = re.compile(r"\b(today|tonight|tomorrow)\b", _FLAGS)
+_TIME_24H = re.compile(r"(?<![\d-])([01]?\d|2[0-3]):([0-5]\d)(?!\s*[ap]\.?m)\b", _FLAGS)
+_TIME_12H = re.compile(r"\b(1[0-2]|0?[1-9])(?::([0-5]\d))?\s*([ap])\.?m\.?(?!\w)", _FLAGS)
+_PARTY_SIZE = re.compile(r"\b(?:for|party of|table for)\s+(\d{1,3})\b(?!\s*(?::|[ap]\.?m))|\b(\d{1,3})\s+(?:people|persons|guests|pax|of us)\b", _FLAGS)
+_NAME = re.compile(r"\b(as|under(?:\s+the\s+name)?|name(?:d|\s+is)?)\s+([A-Za-z][A-Za-z'\-]*(?:\s+(?!(?:on|at|for|with|contact|phone|email|please)\b)[A-Za-z][A-Za-z'\-]*){0,2})", _FLAGS)
+# Words that follow "as"/"under" in ordinary phrases ("as soon as possible", "as my wife"), never in a name.
+_NOT_NAMES = frozenset({
+    "a", "an", "the", "my", "our", "your", "his", "her", "their", "its", "this", "that", "these", "those",
+    "i", "me", "we", "us", "you", "he", "him", "she", "they", "them", "it", "mine", "ours", "someone",
+    "soon", "possible", "usual", "always", "before", "well", "much", "many", "early", "late", "planned",
+    "discussed", "requested", "agreed", "same", "last", "per", "if", "though", "long", "usually",
+    "wife", "husband", "friend", "friends", "family", "guest", "guests", "group", "party",
+})
+_EMAIL = re.compile(r"[\w.+\-]+@[\w\-]+\.[\w.\-]+")
+_PHONE = re.compile(r"\b(?:phone|tel|contact|call)\s*:?\s*(\+?\d[\d\s\-]{5,}\d)", _FLAGS)
+
+
+def _extract_date(message, today):
+    match = _ISO_DATE.search(message)
+    if match:
+        try:
+            datetime.date.fromisoformat(match.group(1))
+        except ValueError:
+            return None
+        return match.group(1)
+    match = _RELATIVE_DATE.search(message)
+    if match:
+        offset = 1 if match.group(1).lower() == "tomorrow" else 0
+        return (today + datetime.timedelta(days=offset)).isoformat()
+    return None
+
+
+def _extract_time(message):
+    match = _TIME_12H.search(message)
+    if match:
+        hour = int(match.group(1)) % 12 + (12 if match.group(3).lower() == "p" else 0)
+        return f"{hour:02d}:{int(match.group(2) or 0):02d}"
+    match = _TIME_24H.search(message)
+    if match:
+        return f"{int(match.group(1)):02d}:{match.group(2)}"
+    return None
+
+
+def _extract_party_size(message):
+    match = _PARTY_SIZE.search(message)
+    if not match:
+        return None
+    size = int(match.group(1) or match.group(2))
+    return size if size > 0 else None
+
+
+def _extract_contact(message):
+    match = _EMAIL.search(message) or _PHONE.search(message)
+    if not match:
+        return None
+    return (match.group(1) if match.re is _PHONE else match.group(0)).strip()
+
+
+def _extract_name(message):
+    """The name a booking is for, or None when the words after "as"/"under"/"name" do not look like one."""
+    match = _NAME.search(message)
+    if not match:
+        return None
+    keyword, name = match.group(1).lower(), match.group(2).strip()
+    if any(word.lower() in _NOT_NAMES for word in name.split()):
+        return None
+    # A bare "as" starts many ordinary phrases, so only a capitalized word after it counts as a name.
+    if keyword == "as" and not name[0].isupper():
+        return None
+    return name
+
+
+def parse_intent(message, known_facts=None, today=None):
+    """
+    Deterministically maps a self-contained transactional message to (tool_name, arguments).
+    Returns None unless every argument the tool needs is present, so anything ambiguous
+    still goes to the LLM. known_facts (e.g. pinned date/time/party_size) fill gaps for a
+    bare restaurant ID.
+    """
+    known_facts = known_facts or {}
+    today = today or datetime.date.today()
+
+    match = _CANCEL.match(message)
+    if match:
+        return "cancel_reservation", {"booking_id": match.group(1).upper()}
+
+    match = _BARE_RESTAURANT.match(message)
+    if match:
+        if all(known_facts.get(key) for key in ("date", "time", "party_size")):
+            return "check_availability", {"restaurant_id": match.group(1).upper(), "date_str": known_facts["date"],
+                                          "time_str": known_facts["time"], "party_size": known_facts["party_size"]}
+        return None
+
+    # More than one restaurant in a message (e.g. "check FS01 and FS05") is left to the LLM.
+    restaurant_ids = {match.upper() for match in _RESTAURANT_ID.findall(message)}
+    if len(restaurant_ids) != 1:
+        return None
+    restaurant_id = restaurant_ids.pop()
+    date = _extract_date(message, today)
+    time = _extract_time(message)
+    party_size = _extract_party_size(message)
+    if not (date and time and party_size):
+        return None
+
+    if _BOOK_VERB.match(message):
+        name = _extract_name(message)
+        if not name:
+            return None
+        arguments = {"restaurant_id": restaurant_id, "date": date, "time": time, "party_size": party_size,
+                     "customer_name": name}
+        contact = _extract_contact(message)
+        if contact:
+            arguments["customer_contact"] = contact
+        return "make_reservation", arguments
+
+    if _CHECK_VERB.search(message):
+        return "check_availability", {"restaurant_id": restaurant_id, "date_str": date, "time_str": time,
+                                      "party_size": party_size}
+    return None
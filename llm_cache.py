@@ -0,0 +1,100 @@
+import datetime
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 15 * 60
+
+_NON_WORD = re.compile(r"[^\w$:\-]+")
+# Politeness and filler words that do not change what the user is asking for.
+_FILLER_WORDS = frozenset("""
+    a an the please pls hi hello hey can could would you u i me we us like want wanna to find get
+    some any looking for need is there are there's just thanks thank
+""".split())
+
+
+def normalize_message(text):
+    """Lowercases, strips punctuation and filler words, so near-identical requests share a key."""
+    words = _NON_WORD.sub(" ", text.lower()).split()
+    return " ".join(word for word in words if word not in _FILLER_WORDS)
+
+
+class ResponseCache:
+    """
+    LRU cache with TTL for the LLM's tool-call decisions.
+    Keys combine the normalized user message, a compact dialog state and today's date (so
+    "tonight" never crosses midnight). Values are the raw LLM tool-call output: on a hit the
+    tool still runs against live data, only the LLM round-trip is skipped.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+        self.saved_latency_seconds = 0.0
+
+    def key(self, user_message, dialog_state=()):
+        return (normalize_message(user_message), tuple(dialog_state), datetime.date.today().isoformat())
+
+    def get(self, key):
+        """Returns the cached LLM output for key, or None (counting the hit or miss)."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            # Expired entries stay until LRU eviction or overwrite, for get_stale().
+            if entry is None or entry[0] <= now:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_latency_seconds += entry[2]
+            return entry[1]
+
+    def get_stale(self, key):
+        """Returns the cached LLM output for key even if expired, or None (for when the LLM is down)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stale_hits += 1
+            return entry[1]
+
+    def put(self, key, llm_output, latency_seconds=0.0):
+        """Stores an LLM output along with how long the LLM took to produce it."""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, llm_output, latency_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "stale_hits": self.stale_hits,
+            "saved_latency_seconds": self.saved_latency_seconds,
+        }
+
+
+def dialog_state(pinned_facts, last_assistant_message):
+    """Compact dialog state for cache keys: pinned facts plus a digest of the last assistant turn."""
+    digest = hashlib.blake2b((last_assistant_message or "").encode("utf-8"), digest_size=8).hexdigest()
+    return tuple(sorted((key, str(value)) for key, value in pinned_facts.items())) + (digest,)
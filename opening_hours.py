@@ -0,0 +1,85 @@
+import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from slot_engine import SLOT_MINUTES, time_to_minutes
+
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_DAY_INDEX = {name: i for i, name in enumerate(DAY_NAMES)}
+
+
+def parse_days(day_spec):
+    """Expands 'mon-fri', 'sat' or wrapping ranges like 'fri-mon' into weekday numbers (Monday = 0)."""
+    first, sep, last = day_spec.strip().lower().partition("-")
+    if first not in _DAY_INDEX or (sep and last not in _DAY_INDEX):
+        raise ValueError(f"Invalid day range '{day_spec}'.")
+    start = _DAY_INDEX[first]
+    end = _DAY_INDEX[last] if sep else start
+    return [(start + offset) % 7 for offset in range((end - start) % 7 + 1)]
+
+
+def parse_hours(hours_spec):
+    """
+    Parses '11:00-22:00' into (open_minute, close_minute), or None for 'closed'.
+    A close time at or before the open time (e.g. '16:00-00:00') runs past midnight.
+    """
+    hours_spec = hours_spec.strip().lower()
+    if hours_spec == "closed":
+        return None
+    opens, sep, closes = hours_spec.partition("-")
+    if not sep:
+        raise ValueError(f"Invalid opening hours '{hours_spec}'.")
+    open_minute, close_minute = time_to_minutes(opens.strip()), time_to_minutes(closes.strip())
+    if close_minute <= open_minute:
+        close_minute += 24 * 60
+    return open_minute, close_minute
+
+
+@lru_cache(maxsize=None)
+def compile_schedule(opening_hours, slot_minutes=SLOT_MINUTES):
+    """
+    Compiles opening-hours pairs (('mon-fri', '11:00-22:00'), ...) into a (7, slots_per_day)
+    boolean array of slots in which a party can be seated. Hours past midnight spill into
+    the next weekday's row.
+    """
+    slots_per_day = 24 * 60 // slot_minutes
+    week = np.zeros(7 * slots_per_day, dtype=bool)
+    for day_spec, hours_spec in opening_hours:
+        hours = parse_hours(hours_spec)
+        if hours is None:
+            continue
+        open_slot = hours[0] // slot_minutes
+        close_slot = -(-hours[1] // slot_minutes)
+        for weekday in parse_days(day_spec):
+            offset = weekday * slots_per_day
+            slots = np.arange(offset + open_slot, offset + close_slot) % week.size
+            week[slots] = True
+    week = week.reshape(7, slots_per_day)
+    week.flags.writeable = False
+    return week
+
+
+# (opening_hours, bitmap) per restaurant ID, compiled on first use; restaurants sharing opening
+# hours share one bitmap. The hours are kept so a reloaded catalog with new hours recompiles.
+WEEKLY_SCHEDULES = {}
+
+
+def get_schedule(restaurant):
+    """Returns the weekly open-slot bitmap for a Restaurant record."""
+    cached = WEEKLY_SCHEDULES.get(restaurant.id)
+    if cached is None or cached[0] is not restaurant.opening_hours:
+        cached = WEEKLY_SCHEDULES[restaurant.id] = (restaurant.opening_hours,
+                                                    compile_schedule(restaurant.opening_hours))
+    return cached[1]
+
+
+def is_open(restaurant, date_str, time_str):
+    """Returns True if a party can be seated at the restaurant at this date and time. Raises ValueError on bad input."""
+    weekday = datetime.date.fromisoformat(date_str).weekday()
+    return bool(get_schedule(restaurant)[weekday, time_to_minutes(time_str) // SLOT_MINUTES])
+
+
+def describe_hours(restaurant):
+    """Formats the opening hours for messages, e.g. 'mon-fri 11:00-22:00, sat-sun 12:00-23:00'."""
+    return ", ".join(f"{days} {hours}" for days, hours in restaurant.opening_hours)
@@ -0,0 +1,122 @@
+import datetime
+import hashlib
+import inspect
+import json
+
+SYSTEM_PROMPT_TEMPLATE = """
+You are FoodieBot, a helpful assistant for booking tables at FoodieSpot restaurants.
+Be concise and helpful. Use the available tools to answer user requests about finding restaurants and making reservations.
+If you need to ask clarifying questions, do so.
+
+Available Tools Description:
+{tool_descriptions}
+
+Instructions:
+Analyze the user's request based on the conversation history.
+Determine the user's intent. If a tool can fulfill the request, respond ONLY with a single JSON object containing the 'tool_name' and 'arguments'. Use the exact tool names and parameter names described above.
+If several independent tool calls are needed at once (e.g. checking availability at several restaurants), respond ONLY with a single JSON object like: {{"tool_calls": [{{"tool_name": "...", "arguments": {{...}}}}, {{"tool_name": "...", "arguments": {{...}}}}]}}
+If no tool is needed, or you need to ask a clarifying question, respond ONLY with a single JSON object like: {{"tool_name": "none", "response": "Your natural language response here."}}
+Ensure all required parameters for a tool call are extracted from the conversation or the user message. Ask for clarification if essential parameters are missing for a required tool. Do not make up information.
+Respond only with the JSON object, nothing else.
+"""
+
+# The only per-day part of the prompt goes last, so the long prefix above stays byte-identical.
+DATE_LINE_TEMPLATE = "Today's date is {today}.\n"
+
+
+def tool_schema(tool_name, function, parameter_specs):
+    """
+    Builds a tool's schema from its signature: parameter names and optionality come from
+    the function, types and descriptions from parameter_specs (name -> (type, description)),
+    and the tool description from the docstring.
+    """
+    parameters = []
+    for name, parameter in inspect.signature(function).parameters.items():
+        if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+        param_type, description = parameter_specs.get(name, ("string", name.replace("_", " ")))
+        if parameter.default is not parameter.empty:
+            description = f"(Optional) {description}"
+        parameters.append({"name": name, "type": param_type, "description": description})
+    return {
+        "tool_name": tool_name,
+        "description": " ".join(inspect.getdoc(function).split()) if function.__doc__ else tool_name,
+        "parameters": parameters,
+    }
+
+
+def render_tool_descriptions(tools, parameter_specs):
+    """Renders every registered tool's schema as the JSON block embedded in the system prompt."""
+    # Same layout as the original hand-written block: one line per parameter keeps it compact.
+    blocks = []
+    for name, function in tools.items():
+        schema = tool_schema(name, function, parameter_specs)
+        parameters = ",\n".join(f"            {json.dumps(p)}" for p in schema["parameters"])
+        blocks.append(
+            "    {\n"
+            f'        "tool_name": {json.dumps(schema["tool_name"])},\n'
+            f'        "description": {json.dumps(schema["description"])},\n'
+            f'        "parameters": [\n{parameters}\n        ]\n'
+            "    }"
+        )
+    return "Available Tools:\n[\n" + ",\n".join(blocks) + "\n]"
+
+
+class PromptBuilder:
+    """
+    Builds the system prompt from a static, byte-stable prefix (persona, tool schemas and
+    instructions) rendered once per tool set, plus the date line rendered once per day.
+    Keeping the prefix identical across requests lets provider-side prompt caching hit.
+    """
+
+    def __init__(self, tools, parameter_specs):
+        self.tools = tools
+        self.parameter_specs = parameter_specs
+        self._tool_set = None
+        self._prefix = None
+        self._day = None
+        self._prompt = None
+        self.prefix_sha256 = None
+        self.prefix_bytes = 0
+        self.prefix_builds = 0
+        self.prompt_builds = 0
+        self.prompt_reuses = 0
+
+    def _current_tool_set(self):
+        return tuple((name, id(function)) for name, function in self.tools.items())
+
+    def prefix(self):
+        """Returns the static prompt prefix, re-rendering it only when the registered tools change."""
+        tool_set = self._current_tool_set()
+        if tool_set != self._tool_set:
+            self._prefix = SYSTEM_PROMPT_TEMPLATE.format(
+                tool_descriptions=render_tool_descriptions(self.tools, self.parameter_specs))
+            encoded = self._prefix.encode("utf-8")
+            self.prefix_sha256 = hashlib.sha256(encoded).hexdigest()
+            self.prefix_bytes = len(encoded)
+            self.prefix_builds += 1
+            self._tool_set = tool_set
+            self._day = None
+        return self._prefix
+
+    def system_prompt(self, today=None):
+        """Returns the full system prompt for today (or the given date)."""
+        today = today or datetime.date.today()
+        prefix = self.prefix()
+        if today != self._day:
+            self._prompt = prefix + DATE_LINE_TEMPLATE.format(today=today.isoformat())
+            self._day = today
+            self.prompt_builds += 1
+        else:
+            self.prompt_reuses += 1
+        return self._prompt
+
+    def metrics(self):
+        """Prefix hash/size and build counters, to confirm the prefix stays stable between calls."""
+        return {
+            "prefix_sha256": self.prefix_sha256,
+            "prefix_bytes": self.prefix_bytes,
+            "prefix_builds": self.prefix_builds,
+            "prompt_builds": self.prompt_builds,
+            "prompt_reuses": self.prompt_reuses,
+        }
@@ -0,0 +1,220 @@
+import datetime
+import threading
+
+import numpy as np
+
+from opening_hours import compile_schedule
+from search_index import as_terms
+from slot_engine import SLOT_MINUTES, time_to_minutes
+
+# Soft criteria only order the restaurants that pass the cuisine and location filters.
+AMBIANCE_WEIGHT = 2.0
+PRICE_WEIGHT = 2.0
+# Added in proportion to the share of seats still free at the requested time.
+HEADROOM_WEIGHT = 1.0
+# Restaurants that are closed or too full at the requested time rank below every bookable one.
+UNAVAILABLE_PENALTY = 100.0
+MAX_PRICE_LEVEL = 4
+# (date, time) pairs whose seats-taken vector is kept between searches.
+SEATS_TAKEN_CACHE_SIZE = 16
+
+
+def price_level(price_range):
+    """Returns 1-4 for '$' to '$$$$' (or '1' to '4'), None for anything else."""
+    if not isinstance(price_range, str) or not price_range.strip():
+        return None
+    value = price_range.strip()
+    level = value.count("$") if set(value) == {"$"} else int(value) if value.isdigit() else None
+    return level if level and 1 <= level <= MAX_PRICE_LEVEL else None
+
+
+class RestaurantRanker:
+    """
+    Ranks a catalog's restaurants for a search.
+
+    Cuisine and location are filters: when given, only restaurants serving one of the
+    cuisines in one of the areas are returned. Price and ambiance only order them, by
+    closeness to the requested price and the share of requested ambiance terms, and a
+    result that misses either says so. When a date and time are given, restaurants that
+    can seat the party gain up to HEADROOM_WEIGHT for free seats, and the rest sink to
+    the bottom.
+
+    Scoring runs in a few vectorized passes over catalog positions: match terms map to
+    position arrays, prices, capacities and opening-hours codes are columns, and opening
+    hours are compiled once per distinct schedule. The page is cut at the score of its
+    last entry, so only the page itself is ordered by position.
+    """
+
+    def __init__(self, restaurants):
+        restaurants = list(restaurants)
+        self.ids = [r.id for r in restaurants]
+        self.positions = {restaurant_id: i for i, restaurant_id in enumerate(self.ids)}
+        self.capacity = np.array([r.capacity for r in restaurants], dtype=np.int32)
+        self.price = np.array([price_level(r.price_range) or 0 for r in restaurants], dtype=np.intp)
+        # _price_scores[level][restaurant price level]: the score for closeness to a requested level.
+        levels = np.arange(MAX_PRICE_LEVEL + 1)
+        self._price_scores = [
+            np.where(levels > 0, PRICE_WEIGHT * (1 - np.abs(levels - level) / (MAX_PRICE_LEVEL - 1)), 0).astype(np.float32)
+            for level in range(MAX_PRICE_LEVEL + 1)]
+
+        postings = {"cuisine": {}, "location_area": {}, "ambiance": {}}
+        for position, r in enumerate(restaurants):
+            for field, terms in postings.items():
+                for term in as_terms(getattr(r, field)):
+                    terms.setdefault(term, []).append(position)
+        self.postings = {field: {term: np.array(p, dtype=np.intp) for term, p in terms.items()}
+                         for field, terms in postings.items()}
+
+        schedules = {}
+        self.hours_code = np.array([schedules.setdefault(r.opening_hours, len(schedules)) for r in restaurants],
+                                   dtype=np.intp)
+        slots_per_day = 24 * 60 // SLOT_MINUTES
+        self.schedules = (np.stack([compile_schedule(hours) for hours in schedules]) if schedules
+                          else np.zeros((0, 7, slots_per_day), dtype=bool))
+        self._taken = {}
+        self._taken_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def seats_taken(self, engine, date, time):
+        """
+        Returns an int array, by catalog position, of the peak seats already taken during a
+        party's dining interval from date/time in a SlotEngine. Cached per date and time;
+        after bookings on that date only the restaurants they changed are recomputed.
+        Raises ValueError on a bad time.
+        """
+        key = (date, time)
+        with self._taken_lock:
+            cached = self._taken.get(key)
+        if cached is not None:
+            version, changed = engine.changed_since(date, cached[0])
+            if changed is not None:
+                taken = cached[1]
+                if changed:
+                    taken = taken.copy()  # the cached array may be in use by another search
+                    start, end = engine.interval(time)
+                    for restaurant_id in changed:
+                        position = self.positions.get(restaurant_id)
+                        occupancy = engine.day(restaurant_id, date)
+                        if position is not None:
+                            taken[position] = occupancy[start:end].max() if occupancy is not None else 0
+                self._remember_taken(key, version, taken)
+                return taken
+        # Read before the occupancy, so a change made meanwhile is picked up next time.
+        version = engine.version
+        restaurant_ids, peaks = engine.peaks_at(date, time)
+        taken = np.zeros(len(self.ids), dtype=np.int32)
+        positions = [self.positions.get(restaurant_id, -1) for restaurant_id in restaurant_ids]
+        if positions:
+            positions = np.array(positions, dtype=np.intp)
+            known = positions >= 0
+            taken[positions[known]] = peaks[known]
+        self._remember_taken(key, version, taken)
+        return taken
+
+    def _remember_taken(self, key, version, taken):
+        with self._taken_lock:
+            if len(self._taken) >= SEATS_TAKEN_CACHE_SIZE and key not in self._taken:
+                self._taken.pop(next(iter(self._taken)))
+            self._taken[key] = (version, taken)
+
+    def _matching(self, field, value):
+        """Positions of the restaurants matching any of the terms, in catalog order; None without terms."""
+        terms = as_terms(value)
+        if not terms:
+            return None
+        postings = self.postings[field]
+        hits = [postings[term] for term in terms if term in postings]
+        if len(hits) == 1:
+            return hits[0]
+        return np.unique(np.concatenate(hits)) if hits else np.zeros(0, dtype=np.intp)
+
+    def rank(self, cuisine=None, location_area=None, price_range=None, ambiance=None,
+             party_size=None, date=None, time=None, taken=None, offset=0, limit=3):
+        """
+        Returns (page, total): up to limit of the best matches after skipping offset, each
+        a dict with id, score, unmatched (the requested price_range and/or ambiance it
+        misses) and, when date and time are given, available and free_seats; and the number
+        of restaurants passing the cuisine and location filters (every restaurant without
+        them). taken holds the seats already taken at the requested time by catalog position
+        (see seats_taken); none are taken without it. Raises ValueError on a bad date or time.
+        """
+        candidates = None
+        for field, value in (("cuisine", cuisine), ("location_area", location_area)):
+            matching = self._matching(field, value)
+            if matching is None:
+                continue
+            if candidates is None:
+                candidates = matching
+            else:
+                keep = np.zeros(len(self.ids), dtype=bool)
+                keep[matching] = True
+                candidates = candidates[keep[candidates]]
+        total = len(self.ids) if candidates is None else len(candidates)
+
+        def column(values):
+            return values if candidates is None else values.take(candidates)
+
+        scores = np.zeros(total, dtype=np.float32)
+        level = price_level(price_range)
+        if level:
+            scores += self._price_scores[level].take(column(self.price))
+        ambiance_terms = as_terms(ambiance)
+        ambiance_share = None
+        if ambiance_terms:
+            # By catalog position, for the partial-match flags of the page.
+            ambiance_share = np.zeros(len(self.ids), dtype=np.float32)
+            postings = self.postings["ambiance"]
+            for term in ambiance_terms:
+                if term in postings:
+                    ambiance_share[postings[term]] += 1 / len(ambiance_terms)
+            scores += column(ambiance_share) * np.float32(AMBIANCE_WEIGHT)
+
+        available = free_seats = None
+        if date and time:
+            weekday = datetime.date.fromisoformat(date).weekday()
+            slot = time_to_minutes(time) // SLOT_MINUTES
+            capacity = column(self.capacity)
+            free_seats = capacity
+            if taken is not None:
+                free_seats = free_seats - column(taken)
+            available = self.schedules[:, weekday, slot].take(column(self.hours_code))
+            available &= free_seats >= max(1, party_size or 1)
+            headroom = np.divide(free_seats, np.maximum(capacity, 1), dtype=np.float32)
+            # (Penalties are multiplied in: np.where costs several times more on a scattered mask.)
+            headroom *= available * np.float32(HEADROOM_WEIGHT)
+            headroom -= ~available * np.float32(UNAVAILABLE_PENALTY)
+            scores += headroom
+
+        wanted = min(offset + limit, total)
+        if wanted <= offset:
+            return [], total
+        if wanted < total:
+            # The wanted-th best score; take everything above it, then the earliest ties,
+            # so every page is cut from the same order (score, then catalog position).
+            # (Found by sorting the score values: numpy's vectorized sort takes a steady
+            # 0.1-0.3 ms here, while np.partition slows to over 1 ms on score distributions
+            # with many duplicates.)
+            threshold = np.sort(scores)[total - wanted]
+            above = np.flatnonzero(scores > threshold)
+            ties = np.flatnonzero(scores == threshold)[:wanted - len(above)]
+            best = np.concatenate((above, ties))
+        else:
+            best = np.arange(total)
+        best = best[np.lexsort((best, -scores[best]))][offset:wanted]
+
+        page = []
+        for i in best:
+            position = i if candidates is None else candidates[i]
+            unmatched = []
+            if level and self.price[position] != level:
+                unmatched.append("price_range")
+            if ambiance_share is not None and not ambiance_share[position]:
+                unmatched.append("ambiance")
+            item = {"id": self.ids[position], "score": round(float(scores[i]), 2), "unmatched": unmatched}
+            if available is not None:
+                item["available"] = bool(available[i])
+                item["free_seats"] = int(free_seats[i])
+            page.append(item)
+        return page, total
@@ -0,0 +1,315 @@
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+DEFAULT_DEADLINE_SECONDS = 15.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY_SECONDS = 0.25
+DEFAULT_MAX_DELAY_SECONDS = 2.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_SECONDS = 30.0
+DEFAULT_HEDGE_PERCENTILE = 0.95
+# At most this fraction of calls send a hedge, so hedging cannot double the load when the
+# provider slows down across the board.
+DEFAULT_HEDGE_BUDGET = 0.05
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 256
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit breaker is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call (including its retries and hedges) runs past its deadline."""
+
+
+def is_retryable(error):
+    """Timeouts, connection failures, rate limits and 5xx responses are worth retrying."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # The SDKs are only looked up, never imported here: an error from one means it is loaded.
+    httpx = sys.modules.get("httpx")
+    groq = sys.modules.get("groq")
+    if httpx is not None:
+        if isinstance(error, httpx.TransportError):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+    if groq is not None:
+        if isinstance(error, groq.APIConnectionError):
+            return True
+        if isinstance(error, groq.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failed calls; after failure_threshold of them the circuit opens and
+    calls fail fast for reset_seconds. Then a single probe call is let through (half-open):
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_seconds=DEFAULT_RESET_SECONDS,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self):
+        """Returns True if a call may go to the provider now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self._clock() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def is_open(self):
+        with self._lock:
+            return self.state == "open" and self._clock() - self.opened_at < self.reset_seconds
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = self._clock()
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction, min_samples=1):
+        """The given percentile of the window, or None with fewer than min_samples samples."""
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+class ResilientCaller:
+    """
+    Wraps calls to a remote provider with a per-call deadline, jittered exponential retry on
+    retryable errors, a circuit breaker and request hedging: when an attempt is slower than
+    the hedge_percentile of recent latencies, a second identical request is sent (for at most
+    hedge_budget of calls) and the first to succeed wins.
+
+    request is a callable taking the remaining timeout in seconds (pass it on to the HTTP
+    client, so abandoned attempts do not linger) and returning the response.
+    """
+
+    def __init__(self, deadline_seconds=DEFAULT_DEADLINE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 base_delay_seconds=DEFAULT_BASE_DELAY_SECONDS, max_delay_seconds=DEFAULT_MAX_DELAY_SECONDS,
+                 hedge_percentile=DEFAULT_HEDGE_PERCENTILE, hedge_budget=DEFAULT_HEDGE_BUDGET, breaker=None,
+                 retryable=is_retryable, clock=time.monotonic, sleep=time.sleep, rng=None, max_workers=256):
+        self.deadline_seconds = deadline_seconds
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.retryable = retryable
+        self.latency = LatencyTracker()
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-call")
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.deadlines_exceeded = 0
+        self.rejected = 0
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff before retry number attempt + 1."""
+        return self._rng.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** attempt))
+
+    def hedge_delay(self):
+        """Seconds after which a hedge request is sent, or None until enough latencies are known."""
+        if not self.hedge_percentile or self.hedges >= self.hedge_budget * self.calls:
+            return None
+        return self.latency.percentile(self.hedge_percentile, HEDGE_MIN_SAMPLES)
+
+    def _timed(self, request, timeout):
+        started = self._clock()
+        result = request(timeout)
+        self.latency.record(self._clock() - started)
+        return result
+
+    def _start(self):
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError("The LLM provider is failing; not calling it for now.")
+        self.calls += 1
+        return self._clock() + self.deadline_seconds
+
+    def _retry_delay(self, error, attempt, deadline):
+        """Seconds to wait before retrying after error, or None if the call should give up."""
+        if not self.retryable(error) or attempt + 1 >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        if self._clock() + delay >= deadline:
+            return None
+        self.retries += 1
+        return delay
+
+    def _give_up(self, error):
+        if isinstance(error, DeadlineExceeded):
+            self.deadlines_exceeded += 1
+        if self.retryable(error):
+            self.failures += 1
+            self.breaker.record_failure()
+        else:
+            # The provider answered (e.g. a 400), so it is not a sign of an outage.
+            self.breaker.record_success()
+        raise error
+
+    def call(self, request, hedge=True):
+        """Runs request with deadline, retries, hedging and the circuit breaker; returns its result."""
+        deadline = self._start()
+        for attempt in range(self.max_attempts):
+            try:
+                result = self._attempt(request, deadline, hedge)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    self._give_up(e)
+                self._sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def _attempt(self, request, deadline, hedge):
+        timeout = deadline - self._clock()
+        if timeout <= 0:
+            raise DeadlineExceeded(f"LLM call exceeded its {self.deadline_seconds:.1f}s deadline.")
+        primary = self._executor.submit(self._timed, request, timeout)
+        pending = {primary}
+        hedge_delay = self.hedge_delay() if hedge else None
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = wait(pending, timeout=hedge_delay)
+            if not done:
+                self.hedges += 1
+                pending.add(self._executor.submit(self._timed, request, deadline - self._clock()))
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - self._clock()), return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"LLM call exceeded its {self.deadline_seconds:.1f}s deadline.")
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    async def call_async(self, request, hedge=True):
+        """Async call(): request(timeout) returns an awaitable; losing hedges are cancelled."""
+        import asyncio  # already loaded by the running loop; kept out of this module's import
+
+        deadline = self._start()
+        for attempt in range(self.max_attempts):
+            try:
+                result = await self._attempt_async(request, deadline, hedge)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    self._give_up(e)
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def _timed_async(self, request, timeout):
+        started = self._clock()
+        result = await request(timeout)
+        self.latency.record(self._clock() - started)
+        return result
+
+    async def _attempt_async(self, request, deadline, hedge):
+        import asyncio
+
+        timeout = deadline - self._clock()
+        if timeout <= 0:
+            raise DeadlineExceeded(f"LLM call exceeded its {self.deadline_seconds:.1f}s deadline.")
+        primary = asyncio.ensure_future(self._timed_async(request, timeout))
+        pending = {primary}
+        try:
+            hedge_delay = self.hedge_delay() if hedge else None
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+                if not done:
+                    self.hedges += 1
+                    pending.add(asyncio.ensure_future(self._timed_async(request, deadline - self._clock())))
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, deadline - self._clock()),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise DeadlineExceeded(f"LLM call exceeded its {self.deadline_seconds:.1f}s deadline.")
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "deadlines_exceeded": self.deadlines_exceeded,
+            "rejected_while_open": self.rejected,
+            "circuit_state": self.breaker.state,
+            "times_opened": self.breaker.times_opened,
+            "p50_seconds": self.latency.percentile(0.5),
+            "p95_seconds": self.latency.percentile(0.95),
+        }
@@ -1,4 +1,123 @@
-RESTAURANTS = [
+import os
+import sys
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+from opening_hours import compile_schedule
+from ranking import RestaurantRanker
+from search_index import RestaurantIndex
+
+# Path of a columnar catalog file (see catalog_loader.py); the built-in list is used without it.
+CATALOG_ENV = "FOODIESPOT_CATALOG"
+# How often the catalog file is checked for changes, in seconds.
+CATALOG_CHECK_SECONDS = 2.0
+
+
+# Canonical instances of repeated tuples (cuisine lists, ambiance lists, opening hours),
+# so restaurants sharing a value share one object.
+_SHARED_VALUES = {}
+
+
+def _shared(value):
+    return _SHARED_VALUES.setdefault(value, value)
+
+
+@dataclass(frozen=True, slots=True)
+class Restaurant:
+    """A single catalog entry. Slotted and immutable so large chains stay compact."""
+    id: str
+    name: str
+    location_area: str
+    address: str
+    cuisine: tuple
+    capacity: int
+    opening_hours: tuple
+    price_range: str
+    ambiance: tuple
+    description: str
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a record from a catalog dict, interning the highly repeated strings."""
+        cuisine = data.get("cuisine") or ()
+        if isinstance(cuisine, str):
+            cuisine = (cuisine,)
+        # A dict in the catalog literal, (days, hours) pairs when read from a columnar file.
+        opening_hours = data.get("opening_hours") or {}
+        if isinstance(opening_hours, dict):
+            opening_hours = opening_hours.items()
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            location_area=sys.intern(data["location_area"]),
+            address=data.get("address", ""),
+            cuisine=_shared(tuple(sys.intern(c) for c in cuisine)),
+            capacity=int(data["capacity"]),
+            opening_hours=_shared(tuple((sys.intern(days), sys.intern(hours))
+                                        for days, hours in opening_hours)),
+            price_range=sys.intern(data["price_range"]),
+            ambiance=_shared(tuple(sys.intern(a) for a in data.get("ambiance") or ())),
+            description=data.get("description", ""),
+        )
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Builds records from a dict of equal-length column lists, as read from a columnar
+        catalog file (opening_hours as lists of (days, hours) pairs). Each distinct string
+        or tuple is interned once, not once per row, which keeps a 100k load fast.
+        """
+        shared = {}
+
+        def intern_all(values):
+            return [shared.get(v) or shared.setdefault(v, sys.intern(v)) for v in values]
+
+        def shared_tuples(values, convert):
+            out = []
+            for value in values:
+                key = tuple(value or ())
+                cached = shared.get(key)
+                if cached is None:
+                    cached = shared[key] = _shared(tuple(convert(v) for v in key))
+                out.append(cached)
+            return out
+
+        def intern_pair(pair):
+            return sys.intern(pair[0]), sys.intern(pair[1])
+
+        count = len(columns["id"])
+        blank = [""] * count
+        empty = [()] * count
+        cuisine = columns.get("cuisine")
+        opening_hours = columns.get("opening_hours")
+        ambiance = columns.get("ambiance")
+        return [cls(*row) for row in zip(
+            columns["id"],
+            columns["name"],
+            intern_all(columns["location_area"]),
+            [a or "" for a in columns["address"]] if "address" in columns else blank,
+            shared_tuples(cuisine, sys.intern) if cuisine else empty,
+            [int(c) for c in columns["capacity"]],
+            shared_tuples(opening_hours, intern_pair) if opening_hours else empty,
+            intern_all(columns["price_range"]),
+            shared_tuples(ambiance, sys.intern) if ambiance else empty,
+            [d or "" for d in columns["description"]] if "description" in columns else blank,
+        )]
+
+    def as_dict(self):
+        """Returns a fresh dict in the original catalog shape."""
+        return {
+            "id": self.id, "name": self.name, "location_area": self.location_area,
+            "address": self.address, "cuisine": list(self.cuisine),
+            "capacity": self.capacity, "opening_hours": dict(self.opening_hours),
+            "price_range": self.price_range, "ambiance": list(self.ambiance),
+            "description": self.description,
+        }
+
+
+_CATALOG_DATA = [
     {
         "id": "FS01", "name": "FoodieSpot Downtown Grill", "location_area": "Downtown",
         "address": "123 Main St, City Center", "cuisine": ["American", "Steakhouse"],
@@ -78,8 +197,225 @@ RESTAURANTS = [
     }
 ]
 
+class RestaurantListView(Sequence):
+    """
+    Read-only list-of-dicts view over the catalog, for code written against the old
+    RESTAURANTS list. records is a callable returning the current catalog's records as a
+    list (built once per catalog version), so indexing is constant time.
+    """
+
+    def __init__(self, records):
+        self._records = records
+
+    def __len__(self):
+        return len(self._records())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [r.as_dict() for r in self._records()[index]]
+        try:
+            return self._records()[index].as_dict()
+        except IndexError:
+            raise IndexError("restaurant index out of range") from None
+
+    def __iter__(self):
+        for restaurant in self._records():
+            yield restaurant.as_dict()
+
+
+def build_store(catalog_data):
+    """
+    Builds an ID-keyed store of Restaurant records, preserving catalog order. A restaurant
+    whose opening hours do not parse is reported and left out, so no search or booking
+    has to handle it.
+    """
+    store = {}
+    for data in catalog_data:
+        restaurant = data if isinstance(data, Restaurant) else Restaurant.from_dict(data)
+        try:
+            compile_schedule(restaurant.opening_hours)  # cached per distinct schedule
+        except ValueError as e:
+            print(f"ERROR: Skipping restaurant {restaurant.id} in the catalog: {e}")
+            continue
+        store[restaurant.id] = restaurant
+    return store
+
+
+class Catalog:
+    """
+    One loaded version of the restaurant catalog. The ID store, the search index and the
+    ranker are built on first use, so importing the app pays for none of them. A reload swaps in a new
+    Catalog; code still holding the old one keeps a consistent view.
+    """
+
+    def __init__(self, load_records, source=None, version=None):
+        self.source = source
+        self.version = version
+        self._load_records = load_records
+        self._store = None
+        self._records = None
+        self._search_index = None
+        self._ranker = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        """ID-keyed dict of Restaurant records, in catalog order."""
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = build_store(self._load_records())
+                    self._load_records = None
+        return self._store
+
+    @property
+    def records(self):
+        """The store's records as a list, in catalog order."""
+        if self._records is None:
+            store = self.store
+            with self._lock:
+                if self._records is None:
+                    self._records = list(store.values())
+        return self._records
+
+    @property
+    def search_index(self):
+        """Inverted index (search_index.RestaurantIndex) over the store."""
+        if self._search_index is None:
+            store = self.store
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = RestaurantIndex(store.values())
+        return self._search_index
+
+    @property
+    def ranker(self):
+        """Relevance scoring over the store (ranking.RestaurantRanker)."""
+        if self._ranker is None:
+            store = self.store
+            with self._lock:
+                if self._ranker is None:
+                    self._ranker = RestaurantRanker(store.values())
+        return self._ranker
+
+
+def file_version(path):
+    """Identifies one version of a file; a replaced file gets a new inode even within the same mtime tick."""
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def open_catalog_file(path):
+    """Opens a columnar catalog file (see catalog_loader.py); its rows are read on first use."""
+    import catalog_loader  # keeps pyarrow out of the import unless a catalog file is used
+    version = file_version(path)
+    table = catalog_loader.open_catalog(path)
+    return Catalog(lambda: catalog_loader.read_restaurants(table), source=path, version=version)
+
+
+_catalog_path = os.environ.get(CATALOG_ENV) or None
+_catalog = None
+_catalog_lock = threading.Lock()
+_next_check = 0.0
+
+
+def reload_catalog(path=None):
+    """
+    Loads the catalog again and swaps it in, from path if given, else from the current
+    source (FOODIESPOT_CATALOG, or the built-in list when it is unset). Sessions keep
+    running; the next search or booking sees the new catalog. On failure the current
+    catalog stays in place.
+    """
+    global _catalog, _catalog_path
+    with _catalog_lock:
+        path = path or _catalog_path
+        if not path:
+            _catalog = Catalog(lambda: _CATALOG_DATA)
+            return {"success": True, "source": "built-in"}
+        try:
+            catalog = open_catalog_file(path)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: could not load the catalog from {path}: {e}")
+            return {"success": False, "reason": str(e)}
+        _catalog, _catalog_path = catalog, path
+        return {"success": True, "source": path}
+
+
+def _serve_built_in(path):
+    """A broken catalog file at startup: serve the built-in list, but keep watching the file."""
+    global _catalog
+    try:
+        version = file_version(path)
+    except OSError:
+        version = None
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog(lambda: _CATALOG_DATA, source=path, version=version)
+
+
+def get_catalog():
+    """
+    Returns the current Catalog, loading it on first use. A catalog file is checked for
+    changes at most every CATALOG_CHECK_SECONDS and reloaded when it was replaced, so
+    editing the file updates a running app without a restart.
+    """
+    global _next_check
+    catalog = _catalog
+    if catalog is not None and (catalog.source is None or time.monotonic() < _next_check):
+        return catalog
+    _next_check = time.monotonic() + CATALOG_CHECK_SECONDS
+    if catalog is None:
+        if not reload_catalog()["success"]:
+            _serve_built_in(_catalog_path)
+        return _catalog
+    try:
+        version = file_version(catalog.source)
+    except OSError:
+        return catalog  # the file is being replaced; keep serving the loaded version
+    if version != catalog.version and not reload_catalog(catalog.source)["success"]:
+        catalog.version = version  # do not retry a broken file until it changes again
+    return _catalog
+
+
+class CurrentStore(Mapping):
+    """
+    ID-keyed mapping of Restaurant records that always reads the current catalog, so
+    modules importing RESTAURANT_STORE see a reloaded catalog too.
+    """
+
+    def __getitem__(self, restaurant_id):
+        return get_catalog().store[restaurant_id]
+
+    def __iter__(self):
+        return iter(get_catalog().store)
+
+    def __len__(self):
+        return len(get_catalog().store)
+
+    def __contains__(self, restaurant_id):
+        return restaurant_id in get_catalog().store
+
+    def get(self, restaurant_id, default=None):
+        return get_catalog().store.get(restaurant_id, default)
+
+    def values(self):
+        return get_catalog().store.values()
+
+    def items(self):
+        return get_catalog().store.items()
+
+
+RESTAURANT_STORE = CurrentStore()
+
+RESTAURANTS = RestaurantListView(lambda: get_catalog().records)
+
+
+def get_restaurant(restaurant_id):
+    """Returns the Restaurant record for an ID in constant time, or None."""
+    return get_catalog().store.get(restaurant_id)
+
+
 def get_restaurant_by_id(restaurant_id):
-    for r in RESTAURANTS:
-        if r['id'] == restaurant_id:
-            return r
-    return None
\ No newline at end of file
+    """Returns the restaurant as a dict (compatibility API), or None."""
+    restaurant = get_catalog().store.get(restaurant_id)
+    return restaurant.as_dict() if restaurant else None
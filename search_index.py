@@ -0,0 +1,75 @@
+from collections import defaultdict
+
+INDEXED_FIELDS = ("cuisine", "location_area", "price_range", "ambiance")
+
+
+def as_terms(value):
+    """Normalizes a field value (string or list of strings) into lowercase terms."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value.strip().lower()]
+    return [v.strip().lower() for v in value if isinstance(v, str)]
+
+
+class RestaurantIndex:
+    """
+    Prebuilt inverted index over Restaurant records.
+    Each indexed field maps a lowercase term to the set of restaurant IDs carrying it,
+    so a search becomes a set intersection instead of a scan over every restaurant.
+    """
+
+    def __init__(self, restaurants):
+        self.restaurants = {}
+        self.positions = {}
+        self.ids = []
+        self.postings = {field: defaultdict(set) for field in INDEXED_FIELDS}
+
+        for position, r in enumerate(restaurants):
+            restaurant_id = r.id
+            self.restaurants[restaurant_id] = r
+            self.positions[restaurant_id] = position
+            self.ids.append(restaurant_id)
+            for field in INDEXED_FIELDS:
+                for term in as_terms(getattr(r, field)):
+                    self.postings[field][term].add(restaurant_id)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def lookup(self, field, value):
+        """Returns the IDs matching any of the given terms for one field."""
+        postings = self.postings[field]
+        terms = as_terms(value)
+        if len(terms) == 1:
+            return postings.get(terms[0], set())
+        matched = set()
+        for term in terms:
+            matched |= postings.get(term, set())
+        return matched
+
+    def query(self, cuisine=None, location_area=None, price_range=None, ambiance=None):
+        """
+        Returns the set of restaurant IDs matching every given criterion,
+        or None when no criterion was given (i.e. the whole catalog matches).
+        """
+        criteria = {"cuisine": cuisine, "location_area": location_area,
+                    "price_range": price_range, "ambiance": ambiance}
+        posting_sets = [self.lookup(field, value) for field, value in criteria.items() if value]
+        if not posting_sets:
+            return None
+
+        # Intersect smallest-first so the working set shrinks as fast as possible.
+        posting_sets.sort(key=len)
+        result = set(posting_sets[0])
+        for ids in posting_sets[1:]:
+            if not result:
+                break
+            result &= ids
+        return result
+
+    def ordered(self, candidate_ids):
+        """Iterates candidate IDs in catalog order."""
+        if candidate_ids is None:
+            return iter(self.ids)
+        return iter(sorted(candidate_ids, key=self.positions.__getitem__))
@@ -0,0 +1,174 @@
+import itertools
+import threading
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SLOT_MINUTES = 15
+DINING_DURATION_MINUTES = 90
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+# Occupancy changes remembered per date for changed_since(); older views are rebuilt.
+CHANGE_LOG_SIZE = 4096
+
+
+def time_to_minutes(time_str):
+    """Parses 'HH:MM' (24-hour) into minutes after midnight. Raises ValueError on bad input."""
+    hours, sep, minutes = time_str.partition(":")
+    if not sep or len(minutes) != 2 or not hours.isdigit() or not minutes.isdigit():
+        raise ValueError(f"Invalid time '{time_str}', expected HH:MM.")
+    hours, minutes = int(hours), int(minutes)
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"Invalid time '{time_str}', expected HH:MM.")
+    return hours * 60 + minutes
+
+
+def slot_to_time(slot, slot_minutes=SLOT_MINUTES):
+    """Formats a bucket index as 'HH:MM'."""
+    minutes = (slot * slot_minutes) % (24 * 60)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class SlotEngine:
+    """
+    Seat occupancy per restaurant and day, stored as an array of fixed-width time buckets.
+    A party occupies every bucket its dining interval touches, so booking is a range add
+    and availability is a range max over the same interval.
+    """
+
+    def __init__(self, slot_minutes=SLOT_MINUTES, dining_minutes=DINING_DURATION_MINUTES):
+        self.slot_minutes = slot_minutes
+        self.dining_minutes = dining_minutes
+        self.slots_per_day = 24 * 60 // slot_minutes
+        self.dining_slots = -(-dining_minutes // slot_minutes)
+        # Extra tail buckets hold parties seated late in the evening whose meal runs past midnight.
+        self.day_buckets = self.slots_per_day + self.dining_slots
+        self.days = {}
+        # Changes on every occupancy update, so derived views (see peaks_at) can be cached;
+        # _changes[date] logs which restaurants changed at which version, so such a view can
+        # be brought up to date instead of rebuilt (see changed_since).
+        self._versions = itertools.count(1)
+        self.version = 0
+        self._changes = {}
+        self._changes_floor = {}
+        self._reset_version = 0
+        self._version_lock = threading.Lock()
+
+    def touch(self, restaurant_id=None, date_str=None):
+        """
+        Marks occupancy as changed; call after editing a day array directly, with the
+        restaurant and date edited (without them, every derived view is invalidated).
+        """
+        with self._version_lock:
+            version = next(self._versions)
+            if restaurant_id is None or date_str is None:
+                self._reset_version = version
+            else:
+                log = self._changes.get(date_str)
+                if log is None:
+                    log = self._changes[date_str] = deque(maxlen=CHANGE_LOG_SIZE)
+                elif len(log) == CHANGE_LOG_SIZE:
+                    self._changes_floor[date_str] = log[0][0]
+                log.append((version, restaurant_id))
+            self.version = version
+
+    def changed_since(self, date_str, version):
+        """
+        Returns (current version, restaurant IDs whose occupancy on date_str changed after
+        version). The IDs are None when that can no longer be told, and the view must be rebuilt.
+        """
+        with self._version_lock:
+            if version < self._reset_version or version < self._changes_floor.get(date_str, 0):
+                return self.version, None
+            changed = set()
+            for logged, restaurant_id in reversed(self._changes.get(date_str, ())):
+                if logged <= version:
+                    break
+                changed.add(restaurant_id)
+            return self.version, changed
+
+    def clear(self):
+        self.days.clear()
+        with self._version_lock:
+            self._changes.clear()
+            self._changes_floor.clear()
+        self.touch()
+
+    def interval(self, time_str):
+        """Returns the [start, end) bucket range a party seated at time_str occupies."""
+        start_minutes = time_to_minutes(time_str)
+        start = start_minutes // self.slot_minutes
+        end = -(-(start_minutes + self.dining_minutes) // self.slot_minutes)
+        return start, end
+
+    def day(self, restaurant_id, date_str, create=False):
+        """Returns the occupancy array for one restaurant and date (None if nothing is booked)."""
+        restaurant_days = self.days.get(restaurant_id)
+        occupancy = restaurant_days.get(date_str) if restaurant_days else None
+        if occupancy is None and create:
+            occupancy = np.zeros(self.day_buckets, dtype=np.int32)
+            self.days.setdefault(restaurant_id, {})[date_str] = occupancy
+        return occupancy
+
+    def peak(self, restaurant_id, date_str, time_str):
+        """Returns the highest number of seats taken at any point of a party's dining interval."""
+        occupancy = self.day(restaurant_id, date_str)
+        if occupancy is None:
+            return 0
+        start, end = self.interval(time_str)
+        return int(occupancy[start:end].max())
+
+    def reserve(self, restaurant_id, date_str, time_str, party_size):
+        start, end = self.interval(time_str)
+        self.day(restaurant_id, date_str, create=True)[start:end] += party_size
+        self.touch(restaurant_id, date_str)
+
+    def release(self, restaurant_id, date_str, time_str, party_size):
+        occupancy = self.day(restaurant_id, date_str)
+        if occupancy is None:
+            return
+        start, end = self.interval(time_str)
+        occupancy[start:end] -= party_size
+        self.touch(restaurant_id, date_str)
+
+    def bookings_by_time(self, restaurant_id, date_str):
+        """Returns {'HH:MM': seats taken} for every occupied bucket of the day."""
+        occupancy = self.day(restaurant_id, date_str)
+        if occupancy is None:
+            return {}
+        return {slot_to_time(slot, self.slot_minutes): int(occupancy[slot])
+                for slot in np.flatnonzero(occupancy[:self.slots_per_day])}
+
+    def peaks_at(self, date_str, time_str):
+        """
+        Returns (restaurant_ids, peaks) for every restaurant with bookings on the date: the
+        peak seats taken during a party's dining interval from time_str, as an int array.
+        Restaurants not listed have nothing booked that day.
+        """
+        start, end = self.interval(time_str)
+        restaurant_ids, days = [], []
+        for restaurant_id, restaurant_days in list(self.days.items()):
+            occupancy = restaurant_days.get(date_str)
+            if occupancy is not None:
+                restaurant_ids.append(restaurant_id)
+                days.append(occupancy[start:end])
+        if not days:
+            return restaurant_ids, np.zeros(0, dtype=np.int32)
+        return restaurant_ids, np.stack(days).max(axis=1)
+
+    def peak_matrix(self, restaurant_ids, date_strs):
+        """
+        Returns an int array of shape (restaurants, dates, slots_per_day) holding, for every
+        seating slot, the peak seats already taken during a party's dining interval from it.
+        """
+        occupancy = np.zeros((len(restaurant_ids), len(date_strs), self.day_buckets), dtype=np.int32)
+        for i, restaurant_id in enumerate(restaurant_ids):
+            restaurant_days = self.days.get(restaurant_id)
+            if not restaurant_days:
+                continue
+            for j, date_str in enumerate(date_strs):
+                day = restaurant_days.get(date_str)
+                if day is not None:
+                    occupancy[i, j] = day
+        windows = sliding_window_view(occupancy, self.dining_slots, axis=2)
+        return windows.max(axis=3)[:, :, :self.slots_per_day]
@@ -0,0 +1,168 @@
+import re
+
+_TOOL_NAME = re.compile(r'"tool_name"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_RESPONSE_START = re.compile(r'"response"\s*:\s*"')
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class StreamingReplyDetector:
+    """
+    Classifies a streamed LLM reply while it arrives and extracts user-visible text early.
+
+    kind is None while undecided, then one of:
+      "direct" - a {"tool_name": "none", "response": ...} reply; the response string is
+                 decoded incrementally and returned from feed() as it arrives
+      "tool"   - a tool call; complete turns True as soon as the JSON object closes
+      "text"   - not JSON at all; the raw text is returned from feed() as it arrives, up to
+                 any brace or fence (which may start a tool call after some prose)
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.kind = None
+        self.complete = False
+        self.response_complete = False
+        self._json_start = None
+        self._json_end = None
+        self._scan_pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._response_pos = None
+        self._text_emitted = 0
+        self._held = False
+
+    @property
+    def json_text(self):
+        """The balanced JSON object once complete, otherwise None."""
+        if not self.complete:
+            return None
+        return self.buffer[self._json_start:self._json_end]
+
+    def feed(self, delta):
+        """Adds a streamed chunk and returns any newly available user-visible text."""
+        self.buffer += delta
+        if self.kind is None and self._json_start is None:
+            self._locate_json()
+        if self.kind == "text":
+            return self._emit_text()
+        if self._json_start is None:
+            return ""
+
+        if not self.complete:
+            self._scan_braces()
+        if self.kind is None:
+            match = _TOOL_NAME.search(self.buffer, self._json_start)
+            if match:
+                self.kind = "direct" if match.group(1) == "none" else "tool"
+        if self.kind == "direct" and not self.response_complete:
+            return self._decode_response()
+        return ""
+
+    def _locate_json(self):
+        stripped = self.buffer.lstrip()
+        if not stripped:
+            return
+        if stripped.startswith("```") or "```".startswith(stripped):
+            # A fenced block: the object starts at the first brace after the fence line.
+            fence_line_end = stripped.find("\n")
+            if fence_line_end == -1:
+                return
+            body = stripped[fence_line_end:].lstrip()
+            if not body:
+                return
+            if body[0] != "{":
+                self.kind = "text"
+                return
+            self._json_start = self.buffer.index("{", len(self.buffer) - len(stripped) + fence_line_end)
+        elif stripped[0] == "{":
+            self._json_start = len(self.buffer) - len(stripped)
+        else:
+            self.kind = "text"
+        if self._json_start is not None:
+            self._scan_pos = self._json_start
+
+    def _emit_text(self):
+        start = self._text_emitted or len(self.buffer) - len(self.buffer.lstrip())
+        if self._held:
+            return ""
+        # Prose may lead into a tool call ("Sure! {...}"): hold everything from the first
+        # brace or fence back, so raw JSON is never shown and the caller can parse it at the end.
+        end = len(self.buffer)
+        for marker in ("{", "```"):
+            found = self.buffer.find(marker, start)
+            if found != -1 and found < end:
+                end = found
+                self._held = True
+        self._text_emitted = end
+        return self.buffer[start:end]
+
+    def _scan_braces(self):
+        buffer = self.buffer
+        for pos in range(self._scan_pos, len(buffer)):
+            c = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c == "{":
+                self._depth += 1
+            elif c == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+                    self._json_end = pos + 1
+                    break
+        self._scan_pos = len(buffer)
+
+    def _decode_response(self):
+        if self._response_pos is None:
+            match = _RESPONSE_START.search(self.buffer, self._json_start)
+            if not match:
+                return ""
+            self._response_pos = match.end()
+
+        buffer = self.buffer
+        pos = self._response_pos
+        out = []
+        while pos < len(buffer):
+            c = buffer[pos]
+            if c == '"':
+                self.response_complete = True
+                pos += 1
+                break
+            if c != "\\":
+                out.append(c)
+                pos += 1
+                continue
+            if pos + 1 >= len(buffer):
+                break
+            code = buffer[pos + 1]
+            if code != "u":
+                out.append(_ESCAPES.get(code, code))
+                pos += 2
+                continue
+            if pos + 6 > len(buffer):
+                break
+            try:
+                value = int(buffer[pos + 2:pos + 6], 16)
+                if 0xD800 <= value < 0xDC00:
+                    # High surrogate: wait for the low half so the pair decodes to one character.
+                    if pos + 12 > len(buffer):
+                        break
+                    low = int(buffer[pos + 8:pos + 12], 16)
+                    out.append(chr(0x10000 + ((value - 0xD800) << 10) + (low - 0xDC00)))
+                    pos += 12
+                else:
+                    out.append(chr(value))
+                    pos += 6
+            except ValueError:
+                out.append(buffer[pos + 1])
+                pos += 2
+        self._response_pos = pos
+        return "".join(out)
@@ -0,0 +1,20 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The repo's modules, and benchmarks/ for the fake Groq client.
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+os.environ.pop("FOODIESPOT_BOOKINGS_DB", None)
+os.environ.pop("FOODIESPOT_SHARED_BOOKINGS_DB", None)
+os.environ.pop("FOODIESPOT_CATALOG", None)
+
+import pytest  # noqa: E402
+
+import bookings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_bookings():
+    bookings.reset_bookings()
+    yield
+    bookings.reset_bookings()
@@ -0,0 +1,55 @@
+import threading
+
+import bookings
+from booking_persistence import BookingLogError, SQLiteBookingLog
+
+
+def booking(booking_id, restaurant_id="FS03"):
+    return {"booking_id": booking_id, "restaurant_id": restaurant_id, "restaurant_name": "Test",
+            "date": "2026-11-20", "time": "19:00", "party_size": 4, "customer_name": "Priya",
+            "customer_contact": "", "status": "Confirmed", "timestamp": "2026-10-18T12:00:00"}
+
+
+def flush_within(log, seconds=5):
+    """Runs log.flush() and returns the error it raised; fails the test if it hangs."""
+    outcome = []
+
+    def flush():
+        try:
+            log.flush()
+            outcome.append(None)
+        except BookingLogError as e:
+            outcome.append(e)
+    thread = threading.Thread(target=flush, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert outcome, "flush() did not return"
+    return outcome[0]
+
+
+def test_failed_commit_is_raised_and_the_writer_keeps_going(tmp_path):
+    log = SQLiteBookingLog(str(tmp_path / "bookings.db"))
+    log.record(booking("BK101", restaurant_id=None))  # violates NOT NULL: the batch cannot commit
+    assert isinstance(flush_within(log), BookingLogError)
+
+    log.record(booking("BK102"))
+    assert flush_within(log) is None
+    assert [row["booking_id"] for row in log.load()] == ["BK102"]
+    log.close()
+
+
+def test_booking_after_a_failed_commit_is_made_and_reported_by_flush(tmp_path, monkeypatch):
+    log = SQLiteBookingLog(str(tmp_path / "bookings.db"))
+    monkeypatch.setattr(bookings, "_journal", log)
+    log.record(booking("BK100", restaurant_id=None))
+    log._queue.join()  # the bad batch has failed
+
+    result = bookings.add_booking("FS03", "2026-11-20", "19:00", 4, "Priya", "priya@example.com")
+    assert result["success"]
+    assert bookings.BOOKING_DETAILS[result["booking_id"]] == result["details"]
+    assert bookings.SLOT_ENGINE.peak("FS03", "2026-11-20", "19:00") == 4
+    assert log.failed_rows == 1
+
+    assert isinstance(flush_within(log), BookingLogError)
+    assert [row["booking_id"] for row in log.load()] == [result["booking_id"]]
+    log.close()
@@ -0,0 +1,164 @@
+import multiprocessing
+import random
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import bookings
+from restaurants import RESTAURANT_STORE
+from slot_engine import SlotEngine
+from tools import make_reservation
+
+DATE = "2026-11-20"
+RACE_DATES = ["2026-11-20", "2026-11-21"]
+RACE_TIMES = ["18:30", "19:00", "19:15", "19:30"]
+
+
+@pytest.mark.parametrize("party_size", [0, -5, "4", 2.5, True])
+def test_add_booking_rejects_bad_party_sizes(party_size):
+    result = bookings.add_booking("FS03", DATE, "19:00", party_size, "Priya", "priya@example.com")
+    assert result == {"success": False, "reason": "Party size must be a positive whole number."}
+    assert bookings.get_current_bookings("FS03", DATE) == {}
+    assert not bookings.BOOKING_DETAILS
+
+
+@pytest.mark.parametrize("party_size", [0, -5, "4"])
+def test_availability_rejects_bad_party_sizes(party_size):
+    result = bookings.check_restaurant_availability("FS03", DATE, "19:00", party_size)
+    assert result == {"available": False, "reason": "Party size must be a positive whole number."}
+
+
+def test_negative_party_cannot_free_seats():
+    capacity = bookings.get_restaurant_capacity("FS03")
+    assert bookings.add_booking("FS03", DATE, "19:00", capacity, "Priya", "priya@example.com")["success"]
+    assert not bookings.add_booking("FS03", DATE, "19:00", -5, "Bob", "bob@example.com")["success"]
+    assert not bookings.check_restaurant_availability("FS03", DATE, "19:00", 1)["available"]
+
+
+def test_make_reservation_reads_whole_numbers_given_as_text():
+    result = make_reservation("FS03", DATE, "19:00", " 4 ", "Priya")
+    assert result["success"]
+    assert result["details"]["party_size"] == 4
+    assert not make_reservation("FS03", DATE, "19:00", "four", "Priya")["success"]
+    assert not make_reservation("FS03", DATE, "19:00", "-5", "Priya")["success"]
+
+
+def test_modify_fails_cleanly_once_the_restaurant_is_gone(monkeypatch):
+    booking_id = bookings.add_booking("FS03", DATE, "19:00", 4, "Priya", "priya@example.com")["booking_id"]
+    monkeypatch.setattr(bookings, "get_restaurant", lambda restaurant_id: None)  # as after a catalog reload
+    result = bookings.modify_reservation(booking_id, new_time_str="20:00")
+    assert not result["success"]
+    assert "no longer listed" in result["reason"]
+    assert bookings.BOOKING_DETAILS[booking_id]["time"] == "19:00"
+    assert bookings.cancel_reservation(booking_id)["success"]
+
+
+def race(seed, restaurant_ids, attempts):
+    """Random bookings, cancellations and changes; returns the IDs of the bookings made."""
+    rng = random.Random(seed)
+    made = []
+    for _ in range(attempts):
+        roll = rng.random()
+        if made and roll < 0.1:
+            bookings.cancel_reservation(rng.choice(made))
+        elif made and roll < 0.3:
+            bookings.modify_reservation(rng.choice(made), new_date_str=rng.choice(RACE_DATES),
+                                        new_time_str=rng.choice(RACE_TIMES), new_party_size=rng.randint(1, 8))
+        else:
+            result = bookings.add_booking(rng.choice(restaurant_ids), rng.choice(RACE_DATES), rng.choice(RACE_TIMES),
+                                          rng.randint(1, 8), f"Guest {seed}", "race@example.com")
+            if result["success"]:
+                made.append(result["booking_id"])
+    return made
+
+
+def occupancy(engine, restaurant_ids):
+    """{(restaurant_id, date): occupancy list} for every day with seats taken."""
+    days = {}
+    for restaurant_id in restaurant_ids:
+        for date_str in RACE_DATES:
+            day = engine.day(restaurant_id, date_str)
+            if day is not None and day.any():
+                days[restaurant_id, date_str] = day.tolist()
+    return days
+
+
+def replay(rows):
+    """A SlotEngine holding the seats of (restaurant_id, date, time, party_size, status) rows."""
+    engine = SlotEngine()
+    for restaurant_id, date_str, time_str, party_size, status in rows:
+        if status != "Cancelled":
+            engine.reserve(restaurant_id, date_str, time_str, party_size)
+    return engine
+
+
+def assert_within_capacity(days):
+    for (restaurant_id, date_str), day in days.items():
+        assert max(day) <= RESTAURANT_STORE[restaurant_id].capacity, f"overbooked {restaurant_id} {date_str}"
+
+
+def test_racing_threads_never_overbook_or_reuse_ids(monkeypatch):
+    peak = bookings.SLOT_ENGINE.peak
+
+    def slow_peak(*args):
+        seats = peak(*args)
+        time.sleep(0.0002)  # let other threads run between the capacity check and the reservation
+        return seats
+    monkeypatch.setattr(bookings.SLOT_ENGINE, "peak", slow_peak)
+    restaurant_ids = ["FS08", "FS04"]
+    made = [None] * 16
+    ready = threading.Barrier(len(made))
+
+    def worker(seed):
+        ready.wait()
+        made[seed] = race(seed, restaurant_ids, 100)
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(len(made))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [booking_id for ids in made for booking_id in ids]
+    assert len(ids) == len(set(ids)) == len(bookings.BOOKING_DETAILS)
+    expected = occupancy(replay((b["restaurant_id"], b["date"], b["time"], b["party_size"], b["status"])
+                                for b in bookings.BOOKING_DETAILS.values()), restaurant_ids)
+    assert occupancy(bookings.SLOT_ENGINE, restaurant_ids) == expected
+    assert_within_capacity(expected)
+
+
+def shared_worker(seed, path, attempts, start, finished, results):
+    bookings.use_shared_backend(path)
+    start.wait()
+    made = race(seed, ["FS08", "FS04"], attempts)
+    results.put(made)
+    finished.wait()  # sync only once every process has stopped writing
+    bookings.sync_bookings()
+    results.put(occupancy(bookings.SLOT_ENGINE, ["FS08", "FS04"]))
+
+
+def test_processes_sharing_bookings_never_overbook_and_replicas_match(tmp_path):
+    path = str(tmp_path / "shared.db")
+    context = multiprocessing.get_context("spawn")
+    start, finished, results = context.Event(), context.Event(), context.Queue()
+    workers = [context.Process(target=shared_worker, args=(seed, path, 150, start, finished, results))
+               for seed in range(3)]
+    for worker in workers:
+        worker.start()
+    start.set()
+    ids = [booking_id for _ in workers for booking_id in results.get(timeout=60)]
+    finished.set()
+    replicas = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    assert ids and len(ids) == len(set(ids))
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT restaurant_id, date, time, party_size, status FROM shared_bookings").fetchall()
+    conn.close()
+    assert len(rows) == len(ids)
+    expected = occupancy(replay(rows), ["FS08", "FS04"])
+    assert_within_capacity(expected)
+    assert all(replica == expected for replica in replicas)
@@ -0,0 +1,58 @@
+import datetime
+
+import pytest
+
+from intent_parser import parse_intent
+
+TODAY = datetime.date(2026, 10, 18)
+
+
+def parse(message, known_facts=None):
+    return parse_intent(message, known_facts, today=TODAY)
+
+
+def test_booking_with_name_and_contact():
+    assert parse("book FS03 2026-10-20 19:00 for 4 as Priya") == (
+        "make_reservation", {"restaurant_id": "FS03", "date": "2026-10-20", "time": "19:00",
+                             "party_size": 4, "customer_name": "Priya"})
+    tool, arguments = parse("please reserve fs03 tomorrow at 7:30pm for 2 under the name sam lee, email sam@example.com")
+    assert tool == "make_reservation"
+    assert arguments == {"restaurant_id": "FS03", "date": "2026-10-19", "time": "19:30", "party_size": 2,
+                         "customer_name": "sam lee", "customer_contact": "sam@example.com"}
+    assert parse("book FS03 2026-10-20 19:00 for 4 as Priya Sharma please")[1]["customer_name"] == "Priya Sharma"
+
+
+@pytest.mark.parametrize("message", [
+    "book FS03 for 4 on 2026-10-20 at 19:00 as soon as possible",
+    "book FS03 for 4 on 2026-10-20 at 19:00 as my wife",
+    "book FS03 for 4 on 2026-10-20 at 19:00 as usual",
+    "book FS03 for 4 on 2026-10-20 at 19:00 under my name",
+    "book FS03 for 4 on 2026-10-20 at 19:00 as priya",  # a bare "as" needs a capitalized name
+    "book FS03 for 4 on 2026-10-20 at 19:00",
+])
+def test_booking_without_a_plausible_name_goes_to_the_llm(message):
+    assert parse(message) is None
+
+
+def test_cancel():
+    assert parse("cancel BK105") == ("cancel_reservation", {"booking_id": "BK105"})
+    assert parse("Please cancel my booking #bk105.") == ("cancel_reservation", {"booking_id": "BK105"})
+    assert parse("cancel BK105 and BK106") is None
+
+
+def test_availability_check():
+    assert parse("is FS01 available tomorrow at 8pm for 6 people?") == (
+        "check_availability", {"restaurant_id": "FS01", "date_str": "2026-10-19", "time_str": "20:00", "party_size": 6})
+    assert parse("check FS01 and FS05 tomorrow at 8pm for 6") is None
+
+
+def test_bare_restaurant_id_uses_known_facts():
+    facts = {"date": "2026-10-20", "time": "19:00", "party_size": 4}
+    assert parse("FS07", facts) == (
+        "check_availability", {"restaurant_id": "FS07", "date_str": "2026-10-20", "time_str": "19:00", "party_size": 4})
+    assert parse("FS07", {"date": "2026-10-20"}) is None
+
+
+def test_missing_details_go_to_the_llm():
+    assert parse("book FS03 tomorrow for 4 as Priya") is None  # no time
+    assert parse("book a table tomorrow at 19:00 for 4 as Priya") is None  # no restaurant
@@ -0,0 +1,72 @@
+import numpy as np
+
+from ranking import RestaurantRanker
+from restaurants import Restaurant
+from slot_engine import SlotEngine
+from tools import search_restaurants
+
+DATE = "2026-11-04"
+
+
+def restaurant(restaurant_id, cuisine, area, price, ambiance="Casual", capacity=20):
+    return Restaurant.from_dict({"id": restaurant_id, "name": restaurant_id, "cuisine": [cuisine],
+                                 "location_area": area, "price_range": price, "ambiance": [ambiance],
+                                 "capacity": capacity, "opening_hours": {"mon-sun": "10:00-23:00"}})
+
+
+RESTAURANTS = [
+    restaurant("R1", "Italian", "Downtown", "$$"),
+    restaurant("R2", "Italian", "Uptown", "$$$", "Romantic"),
+    restaurant("R3", "Thai", "Uptown", "$$"),
+    restaurant("R4", "Italian", "Downtown", "$$$$", "Romantic"),
+    restaurant("R5", "Mexican", "Downtown", "$$"),
+]
+
+
+def test_cuisine_and_location_are_filters():
+    ranker = RestaurantRanker(RESTAURANTS)
+    page, total = ranker.rank(cuisine="Thai", location_area="Downtown")
+    assert (page, total) == ([], 0)
+
+    page, total = ranker.rank(cuisine="Italian", location_area="Downtown", limit=10)
+    assert total == 2
+    assert {item["id"] for item in page} == {"R1", "R4"}
+
+
+def test_price_and_ambiance_only_rank_and_flag_partial_matches():
+    ranker = RestaurantRanker(RESTAURANTS)
+    page, total = ranker.rank(cuisine="Italian", price_range="$$", ambiance="Romantic", limit=10)
+    assert total == 3
+    assert [item["id"] for item in page] == ["R2", "R4", "R1"]
+    unmatched = {item["id"]: item["unmatched"] for item in page}
+    assert unmatched == {"R1": ["ambiance"], "R2": ["price_range"], "R4": ["price_range"]}
+
+    page, total = ranker.rank(price_range="$$", limit=10)
+    assert total == len(RESTAURANTS)
+    assert [item["id"] for item in page][:3] == ["R1", "R3", "R5"]
+
+
+def test_seats_taken_follows_bookings_on_its_date():
+    ranker = RestaurantRanker(RESTAURANTS)
+    engine = SlotEngine()
+    engine.reserve("R2", DATE, "19:00", 5)
+    assert ranker.seats_taken(engine, DATE, "19:00").tolist() == [0, 5, 0, 0, 0]
+
+    engine.reserve("R4", DATE, "18:30", 3)
+    engine.reserve("R1", "2026-11-05", "19:00", 8)  # another date: nothing to recompute
+    engine.release("R2", DATE, "19:00", 5)
+    taken = ranker.seats_taken(engine, DATE, "19:00")
+    assert taken.tolist() == [0, 0, 0, 3, 0]
+
+    engine.clear()
+    assert not np.any(ranker.seats_taken(engine, DATE, "19:00"))
+
+
+def test_search_counts_only_matching_restaurants():
+    italian = search_restaurants(cuisine="Italian")
+    result = search_restaurants(cuisine="Italian", price_range="$$")
+    assert result["success"] and result["restaurants"]
+    assert all("Italian" in found["cuisine"] for found in result["restaurants"])
+    assert result["total_matches"] == italian["total_matches"]
+    for found in result["restaurants"]:
+        assert found["unmatched"] == ([] if found["price_range"] == "$$" else ["price_range"])
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+import agent_logic
+import bookings
+from conversation import ConversationHistory
+from fake_llm import FakeGroqClient
+
+GREETING = "Hello! How can I help you with your FoodieSpot reservation today?"
+MESSAGE = "Book a table at the Trattoria"
+
+
+def booking_reply(name):
+    return json.dumps({"tool_name": "make_reservation", "arguments": {
+        "restaurant_id": "FS03", "date": "2026-11-20", "time": "19:00", "party_size": 2, "customer_name": name}})
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    monkeypatch.setattr(agent_logic, "client", None)
+    agent_logic.RESPONSE_CACHE.clear()
+    agent_logic.LLM_CALLER.breaker.record_success()
+    yield
+    agent_logic.RESPONSE_CACHE.clear()
+    agent_logic.LLM_CALLER.breaker.record_success()
+
+
+def use_replies(monkeypatch, *replies):
+    client = FakeGroqClient(list(replies), first_token_latency=0, token_latency=0)
+    monkeypatch.setattr(agent_logic, "client", client)
+    return client
+
+
+def booked_names():
+    return {b["booking_id"]: b["customer_name"] for b in bookings.BOOKING_DETAILS.values()}
+
+
+def test_booking_decision_is_not_replayed_for_another_session(llm, monkeypatch):
+    client = use_replies(monkeypatch, booking_reply("Priya"), booking_reply("Bob"))
+    agent_logic.process_user_message(MESSAGE, ConversationHistory(greeting=GREETING))
+    agent_logic.process_user_message(MESSAGE, ConversationHistory(greeting=GREETING))
+    assert len(client.calls) == 2
+    assert sorted(booked_names().values()) == ["Bob", "Priya"]
+
+
+def test_booking_decision_is_not_replayed_while_the_llm_is_down(llm, monkeypatch):
+    use_replies(monkeypatch, booking_reply("Priya"))
+    agent_logic.process_user_message(MESSAGE, ConversationHistory(greeting=GREETING))
+    for _ in range(agent_logic.LLM_CALLER.breaker.failure_threshold):
+        agent_logic.LLM_CALLER.breaker.record_failure()
+    response, _ = agent_logic.process_user_message(MESSAGE, ConversationHistory(greeting=GREETING))
+    assert response == agent_logic.LLM_UNAVAILABLE_RESPONSE
+    assert list(booked_names().values()) == ["Priya"]
+
+
+def test_search_decision_is_reused(llm, monkeypatch):
+    search = json.dumps({"tool_name": "search_restaurants", "arguments": {"cuisine": "Italian"}})
+    client = use_replies(monkeypatch, search)
+    for _ in range(2):
+        agent_logic.process_user_message("Italian food please", ConversationHistory(greeting=GREETING))
+    assert len(client.calls) == 1
+
+
+def test_mixed_multi_call_is_not_cached():
+    calls = [{"tool_name": "search_restaurants", "arguments": {}},
+             {"tool_name": "make_reservation", "arguments": {}}]
+    assert not agent_logic.is_cacheable_tool_call(agent_logic.MULTI_TOOL_CALL, calls)
+    assert agent_logic.is_cacheable_tool_call(agent_logic.MULTI_TOOL_CALL, calls[:1])
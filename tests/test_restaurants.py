@@ -0,0 +1,38 @@
+import pytest
+
+import restaurants
+from restaurants import Catalog, _CATALOG_DATA, build_store
+from tools import make_reservation, search_restaurants
+
+
+def catalog_with_bad_hours():
+    bad = dict(_CATALOG_DATA[0], id="FS99", opening_hours={"mon-sun": "11-22"})
+    return list(_CATALOG_DATA) + [bad]
+
+
+def test_restaurants_with_unparsable_hours_are_left_out():
+    store = build_store(catalog_with_bad_hours())
+    assert "FS99" not in store
+    assert list(store) == [r["id"] for r in _CATALOG_DATA]
+
+
+def test_bookings_and_search_work_with_a_bad_catalog_row(monkeypatch):
+    monkeypatch.setattr(restaurants, "_catalog", Catalog(catalog_with_bad_hours))
+    assert make_reservation("FS99", "2026-11-20", "19:00", 4, "Priya") == {"success": False, "reason": "Invalid restaurant ID."}
+    assert make_reservation("FS03", "2026-11-20", "19:00", 4, "Priya")["success"]
+    assert search_restaurants(date="2026-11-20", time="19:00")["success"]
+
+
+def test_list_view_indexes_the_current_catalog(monkeypatch):
+    view = restaurants.RESTAURANTS
+    assert len(view) == len(_CATALOG_DATA)
+    assert view[0]["id"] == _CATALOG_DATA[0]["id"]
+    assert view[-1]["id"] == _CATALOG_DATA[-1]["id"]
+    assert [r["id"] for r in view[1:3]] == [r["id"] for r in _CATALOG_DATA[1:3]]
+    assert [r["id"] for r in view] == [r["id"] for r in _CATALOG_DATA]
+
+    monkeypatch.setattr(restaurants, "_catalog", Catalog(lambda: _CATALOG_DATA[:2]))  # as after a reload
+    assert len(view) == 2
+    assert view[-1]["id"] == _CATALOG_DATA[1]["id"]
+    with pytest.raises(IndexError):
+        view[2]
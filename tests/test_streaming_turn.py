@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+import agent_logic
+from conversation import ConversationHistory
+from fake_llm import FakeGroqClient
+
+SEARCH_CALL = json.dumps({"tool_name": "search_restaurants", "arguments": {"cuisine": "Italian"}})
+
+
+@pytest.fixture
+def stream_reply(monkeypatch):
+    """Runs one streamed turn against a scripted reply; returns (text shown, turn)."""
+    monkeypatch.setattr(agent_logic, "client", None)
+    agent_logic.RESPONSE_CACHE.clear()
+
+    def run(reply, message="any Italian places?"):
+        client = FakeGroqClient([reply], first_token_latency=0, token_latency=0)
+        monkeypatch.setattr(agent_logic, "client", client)
+        turn = agent_logic.process_user_message_stream(message, ConversationHistory())
+        return "".join(turn), turn
+    yield run
+    agent_logic.RESPONSE_CACHE.clear()
+
+
+def test_prose_before_a_tool_call_is_kept_in_the_reply_and_history(stream_reply):
+    shown, turn = stream_reply("Let me look that up for you. " + SEARCH_CALL)
+    assert shown.startswith("Let me look that up for you.")
+    assert "I found these options:" in shown
+    assert turn.response == shown
+    assert turn.updated_history.last_assistant_message() == shown
+
+
+def test_tool_call_alone_shows_only_the_tool_reply(stream_reply):
+    shown, turn = stream_reply(SEARCH_CALL)
+    assert shown.startswith("I found these options:")
+    assert turn.response == shown
@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from tool_call_parser import repair_json
+
+
+@pytest.mark.parametrize("reply, expected", [
+    ('{"tool_name": "make_reservation", "arguments": {"restaurant_id": "FS03", "party_size": 1',
+     {"tool_name": "make_reservation", "arguments": {"restaurant_id": "FS03"}}),
+    ('{"arguments": {"party_size": 12, "all_or_nothing": tru', {"arguments": {"party_size": 12}}),
+    ('{"arguments": {"party_size": 4, "customer_contact": nu', {"arguments": {"party_size": 4}}),
+    ('{"arguments": {"new_party_size": -', {"arguments": {}}),
+    ('{"arguments": {"customer_name": "Pri', {"arguments": {}}),
+])
+def test_cut_off_values_are_dropped(reply, expected):
+    assert json.loads(repair_json(reply)) == expected
+
+
+def test_complete_values_are_kept():
+    reply = "{'tool_name': 'make_reservation', arguments: {party_size: 12, all_or_nothing: True,}}"
+    assert json.loads(repair_json(reply)) == {"tool_name": "make_reservation",
+                                             "arguments": {"party_size": 12, "all_or_nothing": True}}
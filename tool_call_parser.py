@@ -0,0 +1,301 @@
+import inspect
+import json
+import re
+import string
+import threading
+
+from instrumentation import TRACER
+
+# Single-character fixes applied by the repair pass (curly quotes models copy from prose).
+_QUOTE_FIXES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_BARE_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# Characters of a bare number or true/false/null, which a cut-off reply may end partway through.
+_SCALAR_CHARS = string.ascii_letters + string.digits + "_+-."
+_LEADING_INT = re.compile(r"\s*(\d+)")
+# Argument names models confuse across tools (check_availability takes date_str/time_str,
+# modify_reservation new_date_str/new_time_str/new_party_size).
+ARGUMENT_ALIASES = {
+    "date": ("date_str", "new_date_str"),
+    "date_str": ("date", "new_date_str"),
+    "time": ("time_str", "new_time_str"),
+    "time_str": ("time", "new_time_str"),
+    "party_size": ("new_party_size",),
+    "new_date": ("new_date_str",),
+    "new_time": ("new_time_str",),
+}
+
+
+def find_json_object(text, start=0):
+    """
+    Returns (start, end) of the first balanced {...} at or after start, in one pass that
+    skips braces inside strings. end is None when an object opens but the text ends first
+    (e.g. a truncated reply); (None, None) when there is no object at all.
+    """
+    begin = text.find("{", start)
+    if begin == -1:
+        return None, None
+    depth = 0
+    in_string = False
+    quote = None
+    escape = False
+    for pos in range(begin, len(text)):
+        c = text[pos]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == quote:
+                in_string = False
+        elif c == '"' or c == "'":
+            in_string = True
+            quote = c
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return begin, pos + 1
+    return begin, None
+
+
+def repair_json(text):
+    """
+    One linear pass fixing the usual near-JSON slips: curly quotes, single-quoted strings,
+    unquoted keys, Python True/False/None, trailing commas, and a reply cut off mid-object
+    (a half-written value is dropped, open brackets and braces are closed). Returns the
+    rewritten text.
+    """
+    # A bare value running up to the end may be cut short ("party_size": 1 of 12), like a
+    # string with no closing quote; a complete object ends in a bracket or brace instead.
+    text = text.translate(_QUOTE_FIXES).rstrip(_SCALAR_CHARS)
+    out = []
+    closers = []
+    quote = None
+    string_start = last_string_start = 0
+    pos = 0
+    while pos < len(text):
+        c = text[pos]
+        if quote:
+            if c == "\\" and pos + 1 < len(text):
+                out.append(text[pos:pos + 2])
+                pos += 2
+                continue
+            if c == quote:
+                quote = None
+                last_string_start = string_start
+                out.append('"')
+            elif c == '"':
+                out.append('\\"')  # a double quote inside a single-quoted string
+            else:
+                out.append(c)
+        elif c in "\"'":
+            quote = c
+            string_start = len(out)
+            out.append('"')
+        elif c in "{[":
+            closers.append("}" if c == "{" else "]")
+            out.append(c)
+        elif c in "}]":
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if closers:
+                closers.pop()
+            out.append(c)
+        else:
+            word = _BARE_WORD.match(text, pos)
+            if word:
+                if text[word.end():].lstrip().startswith(":"):
+                    out.append(f'"{word.group()}"')  # an unquoted key
+                else:
+                    out.append(_PYTHON_LITERALS.get(word.group(), word.group()))
+                pos = word.end()
+                continue
+            out.append(c)
+        pos += 1
+    # A cut-off value (e.g. a half-written name) must not be used: drop it and its key.
+    if quote:
+        del out[string_start:]
+    while out and (out[-1].isspace() or out[-1] == ","):
+        out.pop()
+    if out and out[-1] == ":":
+        del out[last_string_start:]
+        while out and (out[-1].isspace() or out[-1] == ","):
+            out.pop()
+    out.extend(reversed(closers))
+    return "".join(out)
+
+
+class ToolCallParser:
+    """
+    Pulls the tool call (or direct reply) object out of raw LLM output and checks it against
+    the registered tools' signatures.
+
+    extract() finds the first JSON object anywhere in the text - after a fence, after a line
+    of prose, or cut off at the end - and tries a cheap local repair when it does not decode,
+    instead of demoting the whole reply to plain text. check_call() fixes the tool name and
+    arguments where the intent is unambiguous (case, aliases, numbers or booleans sent as
+    text, unknown keys)
+    and reports what is still missing. stats() counts how often each of these saved a turn.
+    """
+
+    def __init__(self, tools, parameter_specs):
+        self._schemas = {}
+        self._tool_names = {}
+        for name, function in tools.items():
+            parameters = [p for p in inspect.signature(function).parameters.values()
+                          if p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)]
+            self._schemas[name] = {
+                "required": [p.name for p in parameters if p.default is p.empty],
+                "types": {p.name: parameter_specs.get(p.name, ("string", ""))[0] for p in parameters},
+            }
+            self._tool_names[name.lower()] = name
+            self._tool_names[function.__name__.lower()] = name
+        self._lock = threading.Lock()
+        self.outcomes = {"clean": 0, "extracted": 0, "repaired": 0, "text": 0, "failed": 0}
+        self.call_fixes = {"tool_name": 0, "alias": 0, "coerced": 0, "dropped": 0}
+        self.calls_fixed = 0
+        self.invalid_calls = 0
+
+    def _count(self, counters, key):
+        with self._lock:
+            counters[key] += 1
+        if counters is self.outcomes:
+            TRACER.count("tool_call_parse", outcome=key)
+        else:
+            TRACER.count("tool_call_fix", fix=key)
+
+    def extract(self, raw):
+        """
+        Returns (value, outcome): the decoded JSON object, or None if the output holds no
+        usable object. outcome is "clean" (the whole reply, fenced or not, is the object),
+        "extracted" (found inside other text), "repaired", "text" or "failed".
+        """
+        text = raw.strip()
+        try:
+            value = json.loads(text)
+            if isinstance(value, dict):
+                self._count(self.outcomes, "clean")
+                return value, "clean"
+        except json.JSONDecodeError:
+            pass
+
+        start, end = find_json_object(text)
+        if start is None:
+            self._count(self.outcomes, "text")
+            return None, "text"
+        while end is not None:
+            candidate = text[start:end]
+            try:
+                value = json.loads(candidate)
+            except json.JSONDecodeError:
+                value = None
+            if isinstance(value, dict):
+                # A fenced object with nothing else around it was already handled by the old parser.
+                outside = (text[:start] + text[end:]).replace("```json", "").replace("```", "").strip()
+                outcome = "extracted" if outside else "clean"
+                self._count(self.outcomes, outcome)
+                return value, outcome
+            repaired = self._decode_repaired(candidate)
+            if repaired is not None:
+                self._count(self.outcomes, "repaired")
+                return repaired, "repaired"
+            start, end = find_json_object(text, end)
+            if start is None:
+                self._count(self.outcomes, "failed")
+                return None, "failed"
+        # The last object never closes: the reply was cut off (e.g. by max_tokens).
+        repaired = self._decode_repaired(text[start:].rstrip("`").rstrip())
+        if repaired is not None:
+            self._count(self.outcomes, "repaired")
+            return repaired, "repaired"
+        self._count(self.outcomes, "failed")
+        return None, "failed"
+
+    def _decode_repaired(self, candidate):
+        try:
+            value = json.loads(repair_json(candidate))
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
+
+    def check_call(self, tool_name, arguments):
+        """
+        Returns (tool_name, arguments, missing): the call with its name matched to a registered
+        tool and its arguments fitted to the signature, plus required parameters still missing.
+        Unknown tools are returned unchanged (with missing empty) for the caller to reject.
+        """
+        fixes = []
+        if isinstance(tool_name, str) and tool_name not in self._schemas:
+            fixed = self._tool_names.get(tool_name.strip().lower().replace(" ", "_").replace("-", "_"))
+            if fixed:
+                fixes.append("tool_name")
+                tool_name = fixed
+        schema = self._schemas.get(tool_name)
+        if schema is None:
+            return tool_name, arguments, []
+
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments)
+            except json.JSONDecodeError:
+                arguments = None
+        arguments = dict(arguments) if isinstance(arguments, dict) else {}
+
+        types = schema["types"]
+        for key in list(arguments):
+            if key in types:
+                continue
+            alias = next((name for name in ARGUMENT_ALIASES.get(key, ()) if name in types), None)
+            value = arguments.pop(key)
+            if alias and alias not in arguments:
+                arguments[alias] = value
+                fixes.append("alias")
+            else:
+                fixes.append("dropped")
+
+        for key, value in arguments.items():
+            if types[key] == "integer" and not isinstance(value, int):
+                number = _LEADING_INT.match(value) if isinstance(value, str) else None
+                if number:
+                    arguments[key] = int(number.group(1))
+                    fixes.append("coerced")
+                elif isinstance(value, float) and value.is_integer():
+                    arguments[key] = int(value)
+                    fixes.append("coerced")
+            elif types[key] == "boolean" and isinstance(value, str) and value.strip().lower() in ("true", "false"):
+                arguments[key] = value.strip().lower() == "true"
+                fixes.append("coerced")
+
+        for fix in fixes:
+            self._count(self.call_fixes, fix)
+        missing = [name for name in schema["required"] if arguments.get(name) in (None, "")]
+        with self._lock:
+            if missing:
+                self.invalid_calls += 1
+            elif fixes:
+                self.calls_fixed += 1
+        return tool_name, arguments, missing
+
+    def stats(self):
+        with self._lock:
+            outcomes = dict(self.outcomes)
+            call_fixes = dict(self.call_fixes)
+            calls_fixed = self.calls_fixed
+            invalid_calls = self.invalid_calls
+        parsed = sum(outcomes.values())
+        # Each of these replies used to reach the user as raw text, or to fail in the tool on a
+        # TypeError, costing a re-prompt and another LLM round-trip.
+        saved = outcomes["extracted"] + outcomes["repaired"] + calls_fixed
+        return {
+            "replies": parsed,
+            **outcomes,
+            "call_fixes": call_fixes,
+            "calls_fixed": calls_fixed,
+            "invalid_calls": invalid_calls,
+            "turns_saved": saved,
+            "saved_rate": saved / parsed if parsed else 0.0,
+        }
@@ -1,76 +1,136 @@
-
 import datetime
-from restaurants import RESTAURANTS, get_restaurant_by_id
-from bookings import check_restaurant_availability, add_booking
-
-def search_restaurants(cuisine=None, location_area=None, price_range=None, ambiance=None, party_size=None, date=None, time=None):
+import numpy as np
+from restaurants import get_catalog, get_restaurant
+from bookings import (SLOT_ENGINE, check_restaurant_availability, add_booking, add_bookings, cancel_reservation,
+                      modify_reservation, find_bookings, get_daily_manifest, sync_bookings)
+from opening_hours import describe_hours, get_schedule, is_open
+from prompt_builder import render_tool_descriptions
+from slot_engine import slot_to_time, time_to_minutes
+
+MAX_SEARCH_RESULTS = 3
+MAX_SLOT_RESULTS = 10
+MAX_SLOT_SEARCH_DAYS = 14
+DEFAULT_SLOT_SEARCH_TIME = "19:00"
+
+def search_restaurants(cuisine=None, location_area=None, price_range=None, ambiance=None, party_size=None, date=None, time=None,
+                       page=1):
     """
-    Searches for restaurants based on criteria.
-    If date, time, and party_size are provided, it can optionally check availability.
+    Recommends restaurants serving the cuisine in the location area (when given), ranked by how
+    close they come to the price range and ambiance; results missing either list it under
+    'unmatched'. If date and time (and optionally party_size) are provided, restaurants that can seat the party
+    then are ranked first, the emptiest first. Returns a page of results; ask for the next page
+    (page=2, 3, ...) with the same criteria when the user wants to see more.
     """
-    results = []
-    for r in RESTAURANTS:
-        match = True
-        
-        if cuisine:
-            if isinstance(r['cuisine'], str):
-                if not any(c.lower() in r['cuisine'].lower() for c in cuisine):
-                    match = False
-            elif isinstance(r['cuisine'], list):
-                if not any(any(c.lower() in rc.lower() for rc in r['cuisine']) for c in cuisine):
-                    match = False
-            else:
-                match = False  
-
-        
-        if cuisine:
-             cuisine_lower = cuisine.lower()
-             if isinstance(r['cuisine'], list):
-                 if not any(c.lower() == cuisine_lower for c in r['cuisine']):
-                     match = False
-             elif isinstance(r['cuisine'], str):
-                 if cuisine_lower != r['cuisine'].lower():
-                     match = False
-             else: 
-                 match = False
-
-
-        if location_area and location_area.lower() != r['location_area'].lower():
-            match = False
-        if price_range and price_range != r['price_range']:
-            match = False
-        if ambiance:
-            ambiance_lower = ambiance.lower()
-            if not any(a.lower() == ambiance_lower for a in r['ambiance']):
-                 match = False
-
-
-        if match:
-            
-            restaurant_info = r.copy()
-
-            
-            if date and time and party_size:
-                 
-                 availability = check_restaurant_availability(r['id'], date, time, party_size)
-                 restaurant_info['availability_checked'] = True
-                 restaurant_info['is_available_at_request'] = availability.get('available', False)
-            else:
-                 restaurant_info['availability_checked'] = False
-
-
-            results.append(restaurant_info)
-
-    
-    results.sort(key=lambda x: x.get('is_available_at_request', False), reverse=True)
+    try:
+        page = max(1, int(page or 1))
+    except (TypeError, ValueError):
+        page = 1
+    check_availability = bool(date and time)
+    try:
+        party_size = int(party_size) if party_size else None
+        ranker = get_catalog().ranker
+        if check_availability:
+            sync_bookings()
+        taken = ranker.seats_taken(SLOT_ENGINE, date, time) if check_availability else None
+        ranked, total = ranker.rank(
+            cuisine=cuisine, location_area=location_area, price_range=price_range, ambiance=ambiance,
+            party_size=party_size, date=date, time=time, taken=taken,
+            offset=(page - 1) * MAX_SEARCH_RESULTS, limit=MAX_SEARCH_RESULTS)
+    except (TypeError, ValueError):
+        return {"success": False, "reason": "Invalid party size, date or time (use YYYY-MM-DD and HH:MM)."}
 
-    
-    max_results = 3
-    return results[:max_results]
+    results = []
+    for item in ranked:
+        restaurant = get_restaurant(item["id"])
+        if restaurant is None:
+            continue  # dropped by a catalog reload since the ranking was built
+        restaurant_info = restaurant.as_dict()
+        restaurant_info['score'] = item['score']
+        restaurant_info['unmatched'] = item['unmatched']
+        restaurant_info['availability_checked'] = check_availability
+        if check_availability:
+            restaurant_info['is_available_at_request'] = item['available']
+            restaurant_info['free_seats'] = item['free_seats']
+        results.append(restaurant_info)
+    return {"success": True, "restaurants": results, "page": page, "total_matches": total,
+            "has_more": page * MAX_SEARCH_RESULTS < total}
+
+
+def find_available_slots(party_size, date=None, time=None, restaurant_id=None, cuisine=None, location_area=None,
+                         days=3, max_results=5):
+    """
+    Finds the nearest open tables for a party size around a desired date and time, across
+    restaurants and the next few days. Use it when a requested time is unavailable or the
+    user is flexible, instead of guessing times one by one.
+    """
+    # All candidate (restaurant, day, slot) cells are evaluated in one vectorized pass.
+    try:
+        party_size = int(party_size)
+        days = max(1, min(int(days), MAX_SLOT_SEARCH_DAYS))
+        max_results = max(1, min(int(max_results), MAX_SLOT_RESULTS))
+        now = datetime.datetime.now()
+        start_date = datetime.datetime.strptime(date, '%Y-%m-%d').date() if date else now.date()
+        if time:
+            requested_minute = time_to_minutes(time)
+        elif start_date == now.date():
+            requested_minute = now.hour * 60 + now.minute
+        else:
+            requested_minute = time_to_minutes(DEFAULT_SLOT_SEARCH_TIME)
+    except (TypeError, ValueError):
+        return {"success": False, "reason": "Invalid party size, date or time (use YYYY-MM-DD and HH:MM)."}
+    if party_size <= 0:
+        return {"success": False, "reason": "Party size must be at least 1."}
+
+    index = get_catalog().search_index
+    if restaurant_id:
+        restaurant_ids = [restaurant_id] if restaurant_id in index.restaurants else []
+    else:
+        restaurant_ids = list(index.ordered(index.query(cuisine=cuisine, location_area=location_area)))
+    if not restaurant_ids:
+        return {"success": False, "reason": "No restaurants match the request."}
+
+    restaurants = [index.restaurants[rid] for rid in restaurant_ids]
+    sync_bookings()
+    dates = [start_date + datetime.timedelta(days=offset) for offset in range(days)]
+    date_strs = [d.isoformat() for d in dates]
+    slot_minutes = SLOT_ENGINE.slot_minutes
+
+    # (restaurants, days, slots) masks: enough free seats for the whole dining interval, and open.
+    capacity = np.array([r.capacity for r in restaurants], dtype=np.int32)
+    free_seats = capacity[:, None, None] - SLOT_ENGINE.peak_matrix(restaurant_ids, date_strs)
+    schedules = np.stack([get_schedule(r) for r in restaurants])
+    feasible = (free_seats >= party_size) & schedules[:, [d.weekday() for d in dates], :]
+    if start_date <= now.date() < start_date + datetime.timedelta(days=days):
+        today = (now.date() - start_date).days
+        feasible[:, today, :-(-(now.hour * 60 + now.minute) // slot_minutes)] = False
+    if start_date < now.date():
+        feasible[:, :(now.date() - start_date).days, :] = False
+
+    restaurant_idx, day_idx, slot_idx = np.nonzero(feasible)
+    if restaurant_idx.size == 0:
+        return {"success": True, "slots": []}
+    distance = np.abs(day_idx * 24 * 60 + slot_idx * slot_minutes - requested_minute)
+    if distance.size > max_results:
+        nearest = np.argpartition(distance, max_results - 1)[:max_results]
+    else:
+        nearest = np.arange(distance.size)
+    nearest = nearest[np.lexsort((restaurant_idx[nearest], distance[nearest]))]
+
+    slots = []
+    for i in nearest:
+        r, d, s = restaurant_idx[i], day_idx[i], slot_idx[i]
+        slots.append({
+            "restaurant_id": restaurant_ids[r],
+            "restaurant_name": restaurants[r].name,
+            "date": date_strs[d],
+            "time": slot_to_time(s, slot_minutes),
+            "seats_available": int(free_seats[r, d, s]),
+        })
+    return {"success": True, "slots": slots}
 
 
 def make_reservation(restaurant_id, date, time, party_size, customer_name, customer_contact="Not Provided"):
-    """Makes a reservation using the booking system."""
+    """Books a table at a specific restaurant for a given date, time, and party size."""
     
     if not all([restaurant_id, date, time, party_size, customer_name]):
         return {"success": False, "reason": "Missing required information (restaurant, date, time, party size, name)."}
@@ -81,45 +141,74 @@ def make_reservation(restaurant_id, date, time, party_size, customer_name, custo
         datetime.datetime.strptime(time, '%H:%M')
     except ValueError:
         return {"success": False, "reason": "Invalid date or time format (use YYYY-MM-DD and HH:MM)."}
+    if isinstance(party_size, str) and party_size.strip().isdigit():
+        party_size = int(party_size)
+
+    restaurant = get_restaurant(restaurant_id)
+    if restaurant is None:
+        return {"success": False, "reason": "Invalid restaurant ID."}
+    if not is_open(restaurant, date, time):
+        return {"success": False, "reason": f"{restaurant.name} is closed at that time (hours: {describe_hours(restaurant)})."}
 
     result = add_booking(restaurant_id, date, time, party_size, customer_name, customer_contact)
     return result
 
 
+def make_group_reservation(reservations, customer_name=None, customer_contact="Not Provided", all_or_nothing=True):
+    """Books several tables at once for a group or event (across restaurants, dates or times). By default either all are booked or none."""
+    if not isinstance(reservations, list) or not reservations:
+        return {"success": False, "booked": 0, "results": [], "reason": "No reservations given."}
+    items = []
+    for reservation in reservations:
+        item = dict(reservation) if isinstance(reservation, dict) else {}
+        # Names and contacts given once for the whole group apply to every table.
+        item.setdefault("customer_name", customer_name)
+        item.setdefault("customer_contact", customer_contact)
+        if isinstance(item.get("party_size"), str) and item["party_size"].strip().isdigit():
+            item["party_size"] = int(item["party_size"])
+        items.append(item)
+    return add_bookings(items, all_or_nothing=all_or_nothing)
+
+
 AVAILABLE_TOOLS = {
     "search_restaurants": search_restaurants,
     "check_availability": check_restaurant_availability, 
     "make_reservation": make_reservation,
+    "find_available_slots": find_available_slots,
+    "cancel_reservation": cancel_reservation,
+    "modify_reservation": modify_reservation,
+    "make_group_reservation": make_group_reservation,
+    "list_my_bookings": find_bookings,
+    "daily_manifest": get_daily_manifest,
+}
+
+
+# Types and descriptions of tool parameters, by name; parameter names and optionality come
+# from each tool's signature (see prompt_builder.tool_schema).
+TOOL_PARAMETERS = {
+    "cuisine": ("string", "Type of food (e.g., 'Italian', 'Mexican', 'Seafood')"),
+    "location_area": ("string", "General area of the city (e.g., 'Downtown', 'Seaside', 'North End')"),
+    "price_range": ("string", "Price category (e.g., '$$', '$$$', '$$$$')"),
+    "ambiance": ("string", "Atmosphere keywords (e.g., 'Romantic', 'Casual', 'Lively')"),
+    "party_size": ("integer", "Number of people"),
+    "date": ("string", "Date (YYYY-MM-DD)"),
+    "time": ("string", "Time (HH:MM, 24-hour format)"),
+    "date_str": ("string", "Date (YYYY-MM-DD)"),
+    "time_str": ("string", "Time (HH:MM, 24-hour format)"),
+    "restaurant_id": ("string", "The unique ID of the restaurant (e.g., 'FS01', 'FS03')"),
+    "customer_name": ("string", "Name for the reservation"),
+    "customer_contact": ("string", "Phone number or email"),
+    "booking_id": ("string", "The booking ID given when the reservation was made (e.g., 'BK101')"),
+    "new_date_str": ("string", "New date (YYYY-MM-DD), if the reservation moves to another day"),
+    "new_time_str": ("string", "New time (HH:MM, 24-hour format), if the reservation moves to another time"),
+    "new_party_size": ("integer", "New number of people, if the party size changes"),
+    "days": ("integer", "Number of days to search from the date, default 3"),
+    "max_results": ("integer", "Number of results to return, default 5"),
+    "reservations": ("array", "The tables to book, each an object with restaurant_id, date, time, party_size and optionally customer_name"),
+    "page": ("integer", "Page of results, 1 (default) for the best matches; 2, 3, ... to show more"),
+    "include_cancelled": ("boolean", "Also list cancelled reservations, default false"),
+    "all_or_nothing": ("boolean", "If true (default), book nothing unless every table can be booked"),
 }
 
 
-TOOL_DESCRIPTIONS = """
-Available Tools:
-[
-    {
-        "tool_name": "search_restaurants",
-        "description": "Searches for restaurants based on criteria like cuisine, location, price, or ambiance. Can also check availability for a specific date, time, and party size if provided.",
-        "parameters": [
-            {"name": "cuisine", "type": "string", "description": "Type of food (e.g., 'Italian', 'Mexican', 'Seafood')"},
-            {"name": "location_area", "type": "string", "description": "General area of the city (e.g., 'Downtown', 'Seaside', 'North End')"},
-            {"name": "price_range", "type": "string", "description": "Price category (e.g., '$$', '$$$', '$$$$')"},
-            {"name": "ambiance", "type": "string", "description": "Atmosphere keywords (e.g., 'Romantic', 'Casual', 'Lively')"},
-            {"name": "party_size", "type": "integer", "description": "Number of people"},
-            {"name": "date", "type": "string", "description": "Desired date (YYYY-MM-DD)"},
-            {"name": "time", "type": "string", "description": "Desired time (HH:MM, 24-hour format)"}
-        ]
-    },
-    {
-        "tool_name": "make_reservation",
-        "description": "Books a table at a specific restaurant for a given date, time, and party size.",
-        "parameters": [
-            {"name": "restaurant_id", "type": "string", "description": "The unique ID of the restaurant (e.g., 'FS01', 'FS03')."},
-            {"name": "date", "type": "string", "description": "Date of booking (YYYY-MM-DD)"},
-            {"name": "time", "type": "string", "description": "Time of booking (HH:MM, 24-hour format)"},
-            {"name": "party_size", "type": "integer", "description": "Number of people for the booking"},
-            {"name": "customer_name", "type": "string", "description": "Name for the reservation"},
-            {"name": "customer_contact", "type": "string", "description": "(Optional) Phone number or email"}
-        ]
-    }
-]
-"""
\ No newline at end of file
+TOOL_DESCRIPTIONS = render_tool_descriptions(AVAILABLE_TOOLS, TOOL_PARAMETERS)